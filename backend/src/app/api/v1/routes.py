@@ -5,6 +5,7 @@ from app.routes import (
     course,
     file,
     google_drive,
+    metrics,
     tutor_session,
     user,
     video_generation,
@@ -20,3 +21,4 @@ api_router.include_router(tutor_session.api_router)
 api_router.include_router(chat_message.api_router)
 api_router.include_router(google_drive.api_router)
 api_router.include_router(video_generation.api_router)
+api_router.include_router(metrics.api_router)
@@ -1,20 +1,50 @@
+import hashlib
+import hmac
+import secrets
+import time
 from datetime import UTC, datetime, timedelta
 
 import jwt
 from fastapi.security import OAuth2PasswordBearer
 from jwt import PyJWTError
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 
+from app.core.cache import TTLCache
+from app.core.metrics import metrics
 from app.core.settings import settings
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
-password_hash = PasswordHash.recommended()
+password_hash = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.argon2_time_cost,
+            memory_cost=settings.argon2_memory_kib,
+            parallelism=settings.argon2_parallelism,
+        ),
+    ),
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/user/login")
 
+# Claims of verified access tokens, keyed by the token's SHA-256. A session
+# sends the same token with every request; a hit skips the HMAC check and
+# claim parsing. Entries never outlive the token's "exp", which is also
+# rechecked on every hit. Revocation is checked separately, per request.
+verified_tokens: TTLCache[bytes, dict] = TTLCache(
+    "verified_token",
+    ttl=0.0,
+    max_entries=settings.verified_token_cache_size,
+)
+verified_token_hit_ratio = metrics.gauge(
+    "verified_token_cache_hit_ratio",
+    "Share of access token checks served from the verified token cache",
+)
+verified_token_hit_ratio.set_function(verified_tokens.hit_ratio)
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
@@ -36,6 +66,32 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def create_refresh_token() -> str:
+    """
+    Create an opaque refresh token.
+
+    Returns:
+        str: 256 random bits, URL-safe encoded
+    """
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Derive the value a refresh token is stored and looked up by.
+
+    A keyed hash is enough here: the token is random, so unlike a password
+    it needs no slow hashing, and the table is useless without the key.
+
+    Args:
+        token: The refresh token
+
+    Returns:
+        str: Hex HMAC-SHA256 of the token
+    """
+    return hmac.new(SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a plaintext password.
@@ -63,9 +119,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return password_hash.verify(plain_password, hashed_password)
 
 
-def verify_token(token: str) -> dict | None:
+def decode_token(token: str) -> dict | None:
     """
-    Verify and decode a JWT token.
+    Verify and decode a JWT token, without the cache.
 
     Args:
         token: The JWT token to verify
@@ -83,3 +139,33 @@ def verify_token(token: str) -> dict | None:
         return None
     else:
         return payload
+
+
+def verify_token(token: str) -> dict | None:
+    """
+    Verify and decode a JWT token, from the verified token cache if possible.
+
+    Args:
+        token: The JWT token to verify
+
+    Returns:
+        dict | None: The decoded payload if valid, None otherwise
+    """
+    if not verified_tokens.max_entries:
+        return decode_token(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    payload = verified_tokens.get(key)
+    if payload is not None:
+        # Expired exactly when PyJWT would start rejecting it
+        if time.time() < int(payload["exp"]):
+            return dict(payload)
+        verified_tokens.pop(key)
+        return None
+
+    payload = decode_token(token)
+    # Tokens without an expiry are never cached
+    if payload is not None and isinstance(payload.get("exp"), int | float):
+        ttl = int(payload["exp"]) - time.time()
+        verified_tokens.set(key, dict(payload), ttl=ttl)
+    return payload
@@ -0,0 +1,173 @@
+"""
+Small in-process caching helpers.
+
+``TTLCache`` is a bounded, thread-safe key/value store whose entries expire
+after a fixed time-to-live. ``SingleFlight`` coalesces identical concurrent
+async calls so only one of them does the work.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.core.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+cache_hits = metrics.counter("cache_hits_total", "Cache hits by cache name")
+cache_misses = metrics.counter("cache_misses_total", "Cache misses by cache name")
+cache_evictions = metrics.counter(
+    "cache_evictions_total",
+    "Entries dropped for size, expiry or invalidation, by cache name",
+)
+coalesced_calls = metrics.counter(
+    "singleflight_coalesced_total",
+    "Calls that joined an identical in-flight call, by name",
+)
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Besides ``max_entries``, a cache of values of very different sizes can be
+    bounded by ``max_bytes``, as measured by ``sizeof``; least recently used
+    entries are dropped until both bounds hold.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        ttl: float,
+        max_entries: int,
+        on_evict: Callable[[K, V], None] | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._sizes: dict[K, int] = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key: K) -> None:
+        _, value = self._data.pop(key)
+        self.nbytes -= self._sizes.pop(key, 0)
+        cache_evictions.inc(cache=self.name)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                cache_misses.inc(cache=self.name)
+                return default
+            expires_at, value = entry  # pyright: ignore[reportGeneralTypeIssues]
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                cache_misses.inc(cache=self.name)
+                return default
+            self._data.move_to_end(key)
+            cache_hits.inc(cache=self.name)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (expires_at, value)
+            if self.sizeof is not None:
+                self._sizes[key] = self.sizeof(value)
+                self.nbytes += self._sizes[key]
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._data)))
+
+    def pop(self, key: K) -> None:
+        """Invalidate a single key."""
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def pop_matching(self, predicate: Callable[[K], bool]) -> None:
+        """Invalidate every key for which ``predicate`` is true."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                self._drop(key)
+
+    def purge_expired(self) -> None:
+        """Drop every expired entry, not only those looked up again."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (until, _) in self._data.items() if until <= now]
+            for key in expired:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._data):
+                self._drop(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def hit_ratio(self) -> float:
+        """Share of lookups served from this cache since start-up."""
+        hits = cache_hits.value(cache=self.name)
+        total = hits + cache_misses.value(cache=self.name)
+        return hits / total if total else 0.0
+
+
+class SingleFlight(Generic[K, V]):
+    """Share the result of one in-flight coroutine among identical callers."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[K, asyncio.Future[V]] = {}
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """
+        Run ``func`` unless a call for ``key`` is already running.
+
+        The work runs in a task owned by this object that every caller,
+        including the one that started it, awaits through ``shield``: a
+        cancelled caller stops waiting without cancelling the work for the
+        others.
+
+        Args:
+            key: Identity of the call; equal keys share one execution
+            func: Zero-argument coroutine factory doing the actual work
+
+        Returns:
+            V: The result of the (possibly shared) call
+        """
+        call = self._calls.get(key)
+        if call is not None and call.get_loop() is asyncio.get_running_loop():
+            coalesced_calls.inc(name=self.name)
+        else:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(call)
+
+    def _finish(self, key: K, call: asyncio.Future[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller stopped waiting
+        if not call.cancelled():
+            call.exception()
@@ -0,0 +1,106 @@
+"""
+Splitting course file text into chunks for the persisted chunk store.
+
+Chunk boundaries are content-defined: text is only cut at paragraph breaks,
+and whether a break ends a chunk depends on the paragraph before it rather
+than on its position in the file. An edit therefore changes the chunks around
+it while the rest keep their text and hash, so re-ingesting a new revision
+only rewrites what actually changed.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from itertools import pairwise
+
+PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+# Rough average for English prose; no tokenizer is needed for budgeting
+CHARS_PER_TOKEN = 4
+# Once a chunk is big enough, about one paragraph break in this many ends it
+BOUNDARY_ODDS = 4
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """A slice ``text[start:end]`` of the source text."""
+
+    start: int
+    end: int
+    text: str
+    content_hash: str
+    token_count: int
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of model tokens in ``text``."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest identifying a chunk's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _split_long(text: str, start: int, end: int, max_chars: int) -> list[int]:
+    """Cut points splitting ``text[start:end]`` into pieces of ``max_chars``."""
+    cuts = []
+    while end - start > max_chars:
+        window = text[start : start + max_chars]
+        cut = max(window.rfind("\n"), window.rfind(" "))
+        start += cut + 1 if cut > 0 else max_chars
+        cuts.append(start)
+    return cuts
+
+
+def _segments(text: str, max_chars: int) -> list[tuple[int, int]]:
+    """Paragraph spans of ``text``, with oversized paragraphs split up."""
+    spans = []
+    start = 0
+    for match in [*PARAGRAPH_BREAK.finditer(text), None]:
+        end = match.start() if match else len(text)
+        if text[start:end].strip():
+            points = [start, *_split_long(text, start, end, max_chars), end]
+            spans.extend(pairwise(points))
+        if match:
+            start = match.end()
+    return spans
+
+
+def _ends_chunk(segment: str) -> bool:
+    return int(content_hash(segment)[:8], 16) % BOUNDARY_ODDS == 0
+
+
+def chunk_text(text: str, min_tokens: int, max_tokens: int) -> list[TextChunk]:
+    """
+    Split ``text`` into chunks of roughly ``min_tokens`` to ``max_tokens``.
+
+    Chunks start and end on paragraph boundaries; a paragraph longer than
+    ``max_tokens`` is split at a line break or space.
+    """
+    min_chars = min_tokens * CHARS_PER_TOKEN
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    bounds = []
+    chunk_start = chunk_end = None
+    for start, end in _segments(text, max_chars):
+        if chunk_start is not None and end - chunk_start > max_chars:
+            bounds.append((chunk_start, chunk_end))
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start = start
+        chunk_end = end
+        if end - chunk_start >= min_chars and _ends_chunk(text[start:end]):
+            bounds.append((chunk_start, chunk_end))
+            chunk_start = None
+    if chunk_start is not None:
+        bounds.append((chunk_start, chunk_end))
+
+    return [
+        TextChunk(
+            start=start,
+            end=end,
+            text=text[start:end],
+            content_hash=content_hash(text[start:end]),
+            token_count=estimate_tokens(text[start:end]),
+        )
+        for start, end in bounds
+    ]
@@ -0,0 +1,26 @@
+"""
+Compression for large MCP tool payloads.
+
+File content above ``settings.mcp_compress_min_bytes`` can be sent gzipped
+and base64-encoded inside the structured tool result when the caller asks
+for it. Level 1 is used: text still shrinks about 3x after base64, at a fraction
+of the CPU of the default level (see ``benchmarks/tool_output.py``).
+"""
+
+import base64
+import gzip
+
+IDENTITY = "identity"
+GZIP_BASE64 = "gzip+base64"
+
+
+def compress_text(content: str | bytes) -> str:
+    """Gzip ``content`` and return it base64-encoded for JSON transport."""
+    raw = content.encode() if isinstance(content, str) else content
+    return base64.b64encode(gzip.compress(raw, compresslevel=1)).decode("ascii")
+
+
+def decompress_text(data: str) -> str:
+    """Reverse ``compress_text``."""
+    raw = gzip.decompress(base64.b64decode(data))
+    return raw.decode("utf-8", errors="ignore")
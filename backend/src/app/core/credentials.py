@@ -0,0 +1,126 @@
+"""
+Cache of decrypted OAuth credentials.
+
+Fernet-decrypting a user's Google tokens on every request and MCP tool call
+costs more than the rest of the lookup. Decrypted tokens are cached here per
+user and token version, a digest of the stored ciphertext, so a refreshed or
+replaced token never matches a stale entry. The plaintext the cache owns is
+kept in bytearrays that are overwritten with zeros when an entry is evicted,
+expires or is invalidated. Strings handed to callers are copies that Python
+cannot wipe; the cache only bounds how long its own plaintext lives.
+"""
+
+import hashlib
+import threading
+import time
+
+from app.core.cache import TTLCache
+from app.core.settings import settings
+
+
+class SecretPair:
+    """An access and refresh token held in wipeable buffers."""
+
+    __slots__ = ("_access", "_refresh")
+
+    def __init__(self, access_token: str, refresh_token: str) -> None:
+        self._access = bytearray(access_token.encode())
+        self._refresh = bytearray(refresh_token.encode())
+
+    def reveal(self) -> tuple[str, str]:
+        return self._access.decode(), self._refresh.decode()
+
+    def wipe(self) -> None:
+        """Overwrite both tokens in place."""
+        for buffer in (self._access, self._refresh):
+            buffer[:] = bytes(len(buffer))
+
+
+def token_version(*ciphertexts: str | None) -> str:
+    """Identify a stored token by its ciphertext, which changes on every write."""
+    digest = hashlib.sha256()
+    for ciphertext in ciphertexts:
+        digest.update((ciphertext or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CredentialCache:
+    """Bounded TTL cache of decrypted token pairs, wiped when dropped."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self._entries: TTLCache[tuple[int, str | None], SecretPair] = TTLCache(
+            name,
+            ttl=ttl,
+            max_entries=max_entries,
+            on_evict=lambda _key, pair: pair.wipe(),
+        )
+        # Entries are only wiped under this lock, never while being revealed
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def _purge(self) -> None:
+        # Expired entries nobody asks for again would otherwise stay readable
+        now = time.monotonic()
+        if now >= self._next_purge:
+            self._entries.purge_expired()
+            self._next_purge = now + self.ttl
+
+    def get(self, user_id: int, version: str | None = None) -> tuple[str, str] | None:
+        """
+        Return a user's cached (access_token, refresh_token).
+
+        Args:
+            user_id: Owner of the tokens
+            version: ``token_version`` of the stored tokens, or None for
+                entries cached without one
+
+        Returns:
+            tuple[str, str] | None: The tokens, or None on a miss
+        """
+        with self._lock:
+            self._purge()
+            pair = self._entries.get((user_id, version))
+            return None if pair is None else pair.reveal()
+
+    def put(
+        self,
+        user_id: int,
+        access_token: str,
+        refresh_token: str,
+        version: str | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Cache a user's decrypted tokens, replacing (and wiping) older ones."""
+        with self._lock:
+            self._purge()
+            self._entries.pop_matching(lambda key: key[0] == user_id)
+            self._entries.set(
+                (user_id, version),
+                SecretPair(access_token, refresh_token),
+                ttl=ttl,
+            )
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop and wipe a user's cached tokens after they change or are deleted."""
+        with self._lock:
+            self._entries.pop_matching(lambda key: key[0] == user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_ratio(self) -> float:
+        return self._entries.hit_ratio()
+
+
+# Decrypted tokens served by AuthTokenService.get_auth_token
+credential_cache = CredentialCache(
+    "oauth_credentials",
+    ttl=settings.credential_cache_ttl_seconds,
+    max_entries=settings.credential_cache_size,
+)
@@ -1,8 +1,12 @@
-from collections.abc import Generator
+import time
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event, inspect, text
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.schema import CreateColumn
 
+from app.core.metrics import metrics
 from app.core.settings import settings
 
 # Create DB engine
@@ -18,6 +22,41 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+pool_checkouts = metrics.counter(
+    "db_pool_checkouts_total",
+    "Connections handed out by the database pool",
+)
+pool_hold = metrics.histogram(
+    "db_pool_connection_hold_seconds",
+    "How long a connection stayed checked out before returning to the pool",
+)
+pool_checked_out = metrics.gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out; steady growth means a leak",
+)
+pool_overflow = metrics.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (negative while the pool is filling)",
+)
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(_dbapi_conn: object, record: object, _proxy: object) -> None:
+    pool_checkouts.inc()
+    record.info["checked_out_at"] = time.perf_counter()  # pyright: ignore[reportAttributeAccessIssue]
+
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(_dbapi_conn: object, record: object) -> None:
+    started = record.info.pop("checked_out_at", None)  # pyright: ignore[reportAttributeAccessIssue]
+    if started is not None:
+        pool_hold.observe(time.perf_counter() - started)
+
+
+# Not every pool class (e.g. SQLite's in-memory pools) tracks these
+pool_checked_out.set_function(lambda: getattr(engine.pool, "checkedout", int)())
+pool_overflow.set_function(lambda: getattr(engine.pool, "overflow", int)())
+
 
 def get_db() -> Generator[Session]:
     db = SessionLocal()
@@ -25,3 +64,53 @@ def get_db() -> Generator[Session]:
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Open a session for a unit of work outside a request.
+
+    The session is rolled back if the block raises and is always closed, so
+    its connection goes back to the pool as soon as the block ends.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def add_missing_columns(bind: Engine = engine) -> list[str]:
+    """
+    Add model columns that existing tables do not have yet.
+
+    ``create_all`` only creates missing tables, so a column added to a model
+    after its table exists would otherwise fail every query with "no such
+    column". Each one is added with ``ALTER TABLE``; NOT NULL columns declare
+    a ``server_default`` so existing rows get a value.
+
+    Args:
+        bind: Engine of the database to upgrade
+
+    Returns:
+        list[str]: ``table.column`` for every column added
+    """
+    inspector = inspect(bind)
+    added = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                name = bind.dialect.identifier_preparer.format_table(table)
+                ddl = CreateColumn(column).compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {name} ADD COLUMN {ddl}"))
+                added.append(f"{table.name}.{column.name}")
+    return added
@@ -11,6 +11,75 @@ from app.services.auth_token import AuthTokenService
 from app.services.user import UserService
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _verify_claims(token: str, db: Session) -> dict:
+    """
+    Decode a JWT and reject it if it was revoked.
+
+    Tokens issued before the ``uid``/``ver`` claims existed only carry the
+    subject and are accepted until they expire.
+
+    Args:
+        token: JWT access token
+        db: Database session
+
+    Returns:
+        dict: The token's claims
+
+    Raises:
+        HTTPException: If the token is invalid, revoked or has no subject
+    """
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        raise _credentials_exception()
+
+    user_id = payload.get("uid")
+    if user_id is not None:
+        version = UserService.get_token_version(db, user_id)
+        if version is None or version != payload.get("ver"):
+            raise _credentials_exception()
+    return payload
+
+
+def get_current_user_id(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[Session, Depends(get_db)],
+) -> int:
+    """
+    Get the current user's ID from the JWT token.
+
+    For tokens carrying ``uid`` and ``ver`` this only checks the (cached)
+    token version, so routes that need nothing but the ID skip the user
+    lookup.
+
+    Args:
+        token: JWT access token
+        db: Database session
+
+    Returns:
+        int: Current user's ID
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    payload = _verify_claims(token, db)
+    user_id = payload.get("uid")
+    if user_id is not None:
+        return user_id
+
+    user = UserService.get_principal(db, email=payload["sub"])
+    if user is None:
+        raise _credentials_exception()
+    return user.id  # pyright: ignore[reportReturnType]
+
+
 def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[Session, Depends(get_db)],
@@ -28,64 +97,61 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    payload = verify_token(token)
-    if payload is None:
-        raise credentials_exception
-
-    email: str | None = payload.get("sub")
-    if email is None:
-        raise credentials_exception
+    payload = _verify_claims(token, db)
 
-    user = UserService.get_user_by_email(db, email=email)
+    user = UserService.get_principal(db, email=payload["sub"])
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     return user
 
 
-def get_current_user_oauth_token(
+def get_current_user_with_token(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[Session, Depends(get_db)],
-) -> AuthToken:
+) -> tuple[User, AuthToken]:
     """
-    Get the Oauth Token using user from JWT token.
+    Get the current user and their decrypted Google OAuth tokens.
+
+    FastAPI caches a dependency's result for the duration of a request, so
+    every dependency and route parameter built on this one shares a single
+    lookup of the user and tokens.
 
     Args:
         token: JWT access token
         db: Database session
 
     Returns:
-        AuthToken: Current authenticated user
+        tuple[User, AuthToken]: Current user and their OAuth tokens
 
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid, or the user or their tokens are
+            not found
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    payload = _verify_claims(token, db)
+    user_id = payload.get("uid")
+    if user_id is None:
+        user = UserService.get_principal(db, email=payload["sub"])
+        if user is None:
+            raise _credentials_exception()
+        user_id = user.id
 
-    payload = verify_token(token)
-    if payload is None:
-        raise credentials_exception
+    return AuthTokenService.get_user_with_token(db, user_id=user_id)
 
-    email: str | None = payload.get("sub")
-    if email is None:
-        raise credentials_exception
 
-    user = UserService.get_user_by_email(db, email=email)
-    if user is None:
-        raise credentials_exception
-    auth_token = AuthTokenService.get_auth_token(db, user_id=user.id)  # pyright: ignore[reportArgumentType]
-    if auth_token is None:
-        raise credentials_exception
-    user.auth_token = auth_token
+def get_current_user_oauth_token(
+    user_with_token: Annotated[
+        tuple[User, AuthToken],
+        Depends(get_current_user_with_token),
+    ],
+) -> AuthToken:
+    """
+    Get the Oauth Token of the user from JWT token.
 
-    return auth_token
+    Args:
+        user_with_token: Current user and their OAuth tokens
+
+    Returns:
+        AuthToken: Current user's OAuth tokens
+    """
+    return user_with_token[1]
@@ -2,28 +2,23 @@
 Gemini AI integration with MCP tools for AI tutor responses.
 """
 
-import json
-
-from fastmcp import Client
 from google import genai
 
+from app.core.mcp_client import accepted_encoding, mcp_pool, tool_data
+from app.core.retrieval import render_slides, select_slides
 from app.core.settings import settings
+from app.schemas.mcp import SlideChunk
 
 # --- 1️⃣ Create Gemini Client (initialized once per process)
 # Uses the Gemini API key from your environment or settings module.
 gemini_client = genai.Client(api_key=settings.gemini_key)
 
 
-# --- 2️⃣ Helper to get a configured MCP Client
-def get_mcp_client() -> Client:
-    """Return a configured FastMCP client instance."""
-    return Client(settings.mcp_server)
-
-
 # --- Helper function to read files and build file content dict
 async def read_course_files(
     file_ids: list,
     user_id: int,
+    query: str | None = None,
 ) -> dict:
     """
     Read all files for a course and return a dict of file_id: content.
@@ -31,24 +26,38 @@ async def read_course_files(
     Args:
         file_ids: List of Google Drive file IDs
         user_id: User ID for authentication
+        query: The student's message; presentations are cut down to the
+            slides most relevant to it
 
     Returns:
         dict: Dictionary mapping file_id to file content
     """
-    client = get_mcp_client()
     files_content = {}
 
-    async with client:
+    async with mcp_pool.session() as client:
         for file_id in file_ids:
             try:
                 result = await client.call_tool(
                     "gdrive_read_file",
-                    {"file_id": file_id, "user_id": user_id},
+                    {
+                        "file_id": file_id,
+                        "user_id": user_id,
+                        "accept_encoding": accepted_encoding(),
+                        # Large sheets and decks would crowd out everything else
+                        "sheet_digest": True,
+                        "slide_chunks": True,
+                    },
                 )
 
-                raw_text = result.content[0].text  # pyright: ignore[reportAttributeAccessIssue]
-                parsed = json.loads(raw_text)
+                parsed = tool_data(result)
                 files_content[file_id] = parsed.get("content", "")
+                if parsed.get("slides") and query:
+                    slides = [SlideChunk(**slide) for slide in parsed["slides"]]
+                    selected = select_slides(slides, query, settings.chat_max_slides)
+                    files_content[file_id] = (
+                        f"Presentation ({len(selected)} of {len(slides)} slides "
+                        f"relevant to the question):\n{render_slides(selected)}"
+                    )
 
             except Exception as e:  # noqa: BLE001
                 files_content[file_id] = f"Error reading file: {e!s}"
@@ -56,26 +65,24 @@ async def read_course_files(
     return files_content
 
 
-# --- 3️⃣ Function that generates AI Tutor responses via Gemini + MCP
+# --- 2️⃣ Function that generates AI Tutor responses via Gemini + MCP
 async def generate_ai_response_with_mcp(
     message: str,
     chat_history: dict,
     file_list: list,
     user_id: int,
+    files_content: dict | None = None,
 ) -> str:
     """
     Uses Gemini and MCP tools to generate AI Tutor responses.
 
-    This function reads all course files and includes their content in the prompt.
+    This function includes the course files' content in the prompt. Material
+    already taken from the chunk store is passed as ``files_content``;
+    otherwise all course files are read through MCP.
     """
     # Read all course files
-    files_content = await read_course_files(file_list, user_id)
-    file_content_str = "\n\n".join(
-        [
-            f"File ID: {fid}\nContent:\n{content}"
-            for fid, content in files_content.items()
-        ],
-    )
+    if files_content is None:
+        files_content = await read_course_files(file_list, user_id, query=message)
     system_prompt = (
         "You are a smart, knowledgeable AI tutor assistant. You have access to course materials "
         "that have been provided to you. Use these materials when appropriate to enhance your responses "
@@ -85,10 +92,7 @@ async def generate_ai_response_with_mcp(
 
     # Build the message for Gemini with file content
     file_content_str = "\n\n".join(
-        [
-            f"File ID: {fid}\nContent:\n{content}"
-            for fid, content in files_content.items()
-        ],
+        f"File ID: {fid}\nContent:\n{content}" for fid, content in files_content.items()
     )
 
     user_message = f"""
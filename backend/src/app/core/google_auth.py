@@ -1,7 +1,20 @@
-import requests
+"""
+Google OAuth helpers.
+
+Token exchange, refresh and userinfo calls go through HTTP clients shared by
+the whole process, so they reuse pooled keep-alive connections (HTTP/2 when
+the optional ``h2`` package is installed) instead of opening a new TLS
+connection per call. Route handlers await the async client; token refreshes,
+which run on worker threads, use the sync one.
+"""
+
+import asyncio
+import importlib.util
+import threading
+from datetime import UTC, datetime, timedelta
+
+import httpx
 from dotenv import load_dotenv
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 
 from app.core.settings import settings
@@ -14,6 +27,85 @@ SCOPES = [
     "openid",
 ]
 
+USERINFO_URL = "https://www.googleapis.com/oauth2/v1/userinfo"
+
+# Installed with httpx[http2]; plain HTTP/1.1 keep-alive otherwise
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class RefreshRevokedError(Exception):
+    """Raised when Google no longer accepts a refresh token (``invalid_grant``)."""
+
+
+class GoogleHttp:
+    """Lazily created HTTP clients for Google OAuth endpoints."""
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._sync_client: httpx.Client | None = None
+        self._sync_lock = threading.Lock()
+
+    @staticmethod
+    def _options() -> dict:
+        return {
+            "http2": HTTP2,
+            "timeout": settings.google_http_timeout_seconds,
+            "limits": httpx.Limits(
+                max_connections=settings.google_http_max_connections,
+                max_keepalive_connections=settings.google_http_max_connections,
+                keepalive_expiry=settings.google_http_keepalive_seconds,
+            ),
+        }
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        Return the async client.
+
+        Connections belong to the event loop that opened them, so the client
+        is replaced if it is asked for from a different loop (e.g. in tests).
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(**self._options())
+            self._client_loop = loop
+        return self._client
+
+    def sync_client(self) -> httpx.Client:
+        """Return the blocking client, for callers on worker threads."""
+        with self._sync_lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(**self._options())
+            return self._sync_client
+
+    async def close(self) -> None:
+        """Close both clients and their pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = self._client_loop = None
+        with self._sync_lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+
+google_http = GoogleHttp()
+
+
+def _token_expiry(token: dict) -> str | None:
+    """Expiry of a token response, in the naive UTC ISO format stored so far."""
+    if "expires_in" not in token:
+        return None
+    expiry = datetime.now(UTC) + timedelta(seconds=int(token["expires_in"]))
+    return expiry.replace(tzinfo=None).isoformat()
+
+
+def _oauth_error(response: httpx.Response) -> str | None:
+    try:
+        return response.json().get("error")
+    except ValueError:
+        return None
+
 
 def generateOAuth2Client() -> Flow:  # noqa: N802
     """
@@ -50,63 +142,74 @@ def get_auth_url() -> tuple[str, str]:
     return auth_url, state
 
 
-def handle_oauth_callback(auth_code: str) -> dict:
+async def handle_oauth_callback(auth_code: str) -> dict:
     """
     Exchange the 'code' parameter from Google's redirect for access/refresh tokens.
     """
-    flow = generateOAuth2Client()
-    flow.redirect_uri = settings.redirect_uri
-
-    # Exchange the code for tokens
-    flow.fetch_token(code=auth_code)
-
-    credentials = flow.credentials
+    response = await google_http.client().post(
+        settings.token_uri,
+        data={
+            "grant_type": "authorization_code",
+            "code": auth_code,
+            "client_id": settings.client_id,
+            "client_secret": settings.client_secret,
+            "redirect_uri": settings.redirect_uri,
+        },
+    )
+    response.raise_for_status()
+    token = response.json()
     return {
-        "access_token": credentials.token,
-        "refresh_token": credentials.refresh_token,
-        "token_uri": getattr(
-            credentials,
-            "token_uri",
-            "https://oauth2.googleapis.com/token",
-        ),
-        "client_id": credentials.client_id,
-        "client_secret": credentials.client_secret,
-        "scopes": credentials.scopes,
-        "expiry": credentials.expiry.isoformat() if credentials.expiry else None,
+        "access_token": token["access_token"],
+        "refresh_token": token.get("refresh_token"),
+        "token_uri": settings.token_uri,
+        "client_id": settings.client_id,
+        "client_secret": settings.client_secret,
+        "scopes": token.get("scope", " ".join(SCOPES)).split(),
+        "expiry": _token_expiry(token),
     }
 
 
 def refresh_credentials(refresh_token: str) -> dict:
     """
     Refresh expired access tokens using a stored refresh token.
+
+    Raises:
+        RefreshRevokedError: If the refresh token was revoked or has expired;
+            retrying cannot succeed until the user signs in with Google again
     """
-    creds = Credentials(
-        None,
-        refresh_token=refresh_token,
-        token_uri=settings.token_uri,
-        client_id=settings.client_id,
-        client_secret=settings.client_secret,
-        scopes=SCOPES,
+    response = google_http.sync_client().post(
+        settings.token_uri,
+        data={
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": settings.client_id,
+            "client_secret": settings.client_secret,
+        },
     )
-
-    # Refresh the access token
-    creds.refresh(Request())
+    if (
+        response.status_code == httpx.codes.BAD_REQUEST
+        and _oauth_error(response) == "invalid_grant"
+    ):
+        raise RefreshRevokedError
+    response.raise_for_status()
+    token = response.json()
     return {
-        "access_token": creds.token,
-        "refresh_token": creds.refresh_token,
-        "expiry": creds.expiry.isoformat() if creds.expiry else None,
+        "access_token": token["access_token"],
+        # Google only sends a new refresh token when it rotates the old one
+        "refresh_token": token.get("refresh_token", refresh_token),
+        "expiry": _token_expiry(token),
     }
 
 
-def get_google_email(access_token: str) -> str:
+async def get_google_email(access_token: str) -> str | None:
     try:
-        r = requests.get(
-            "https://www.googleapis.com/oauth2/v1/userinfo?alt=json",
+        r = await google_http.client().get(
+            USERINFO_URL,
+            params={"alt": "json"},
             headers={"Authorization": f"Bearer {access_token}"},
-            timeout=5,
         )
-    except requests.Timeout:
-        return "Google API request timed out"
+    except httpx.TimeoutException:
+        return None
     r.raise_for_status()
     data = r.json()
     return data.get("email")
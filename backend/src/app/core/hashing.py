@@ -0,0 +1,146 @@
+"""
+Bounded worker pool for password hashing.
+
+Argon2 is deliberately slow and memory-hungry. Hashing inline in request
+handlers lets a burst of logins occupy every threadpool worker and starve
+unrelated routes. Here hashing runs on its own small pool (argon2-cffi
+releases the GIL, so threads hash in parallel), and once ``workers + queue``
+calls are pending new ones are refused with ``HashingBusyError`` instead of
+piling up.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from app.core.auth import get_password_hash, verify_password
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+T = TypeVar("T")
+
+hash_seconds = metrics.histogram(
+    "password_hash_seconds",
+    "Time spent computing Argon2 password hashes, by operation",
+)
+hash_wait = metrics.histogram(
+    "password_hash_queue_wait_seconds",
+    "Time password hashes waited for a worker, by operation",
+)
+hash_rejected = metrics.counter(
+    "password_hash_rejected_total",
+    "Password hashes refused because the queue was full, by operation",
+)
+hash_pending = metrics.gauge(
+    "password_hash_pending",
+    "Password hashes running or waiting for a worker",
+)
+
+
+class HashingBusyError(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class HashingPool:
+    """Run password hashing on a sized thread pool with a bounded queue."""
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.pending = 0
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+        )
+        self._lock = threading.Lock()
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, operation: str, func: Callable[..., T], *args: object) -> T:
+        """
+        Run ``func`` on the pool.
+
+        Args:
+            operation: Operation name used to label metrics
+            func: Blocking callable to run
+            *args: Arguments for ``func``
+
+        Raises:
+            HashingBusyError: If the pool and its queue are full
+
+        Returns:
+            T: Whatever ``func`` returns
+        """
+        with self._lock:
+            if self.pending >= self.capacity:
+                hash_rejected.inc(operation=operation)
+                raise HashingBusyError
+            self.pending += 1
+        enqueued = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            hash_wait.observe(started - enqueued, operation=operation)
+            try:
+                return func(*args)
+            finally:
+                hash_seconds.observe(time.perf_counter() - started, operation=operation)
+
+        # Released when the hash finishes, even if the caller stopped waiting
+        future = self._pool.submit(call)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(
+    max_workers=settings.password_hash_workers or os.cpu_count() or 1,
+    max_queue=settings.password_hash_queue,
+)
+hash_pending.set_function(lambda: hashing_pool.pending)
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a plaintext password on the hashing pool.
+
+    Args:
+        password: The plaintext password to hash
+
+    Raises:
+        HashingBusyError: If too many hashes are pending
+
+    Returns:
+        str: The hashed password
+    """
+    return await hashing_pool.run("hash", get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plaintext password on the hashing pool.
+
+    Args:
+        plain_password: The plaintext password to verify
+        hashed_password: The hashed password to compare against
+
+    Raises:
+        HashingBusyError: If too many hashes are pending
+
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    return await hashing_pool.run(
+        "verify",
+        verify_password,
+        plain_password,
+        hashed_password,
+    )
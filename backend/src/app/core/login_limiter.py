@@ -0,0 +1,247 @@
+"""
+Login throttling.
+
+Every password check costs a full Argon2 verification, so unlimited login
+attempts let one client burn the backend's CPU. Failed attempts are counted
+per account and per client IP over a sliding window; once either limit is
+reached, further attempts are refused before the user lookup or any hashing
+until the oldest failure leaves the window. Attempts still being verified
+count against the limit too: ``check`` reserves a slot atomically and
+``record`` (or ``release``) settles it, so parallel attempts cannot all slip
+past the limit before the first failure is counted. A successful login
+clears the account's failures. Counts are kept in memory, per API process.
+
+Behind a reverse proxy the peer address is the proxy's, so ``client_ip``
+takes the client from ``X-Forwarded-For`` when the peer is a trusted proxy.
+"""
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict, deque
+
+from starlette.requests import Request
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+login_attempts = metrics.counter(
+    "login_attempts_total",
+    "Login attempts that were verified, by outcome (success or failure)",
+)
+login_rejected = metrics.counter(
+    "login_rejected_total",
+    "Login attempts refused before verification, by limit (account or ip)",
+)
+
+# Seconds to wait when the limit is taken by attempts still being verified
+IN_FLIGHT_RETRY_SECONDS = 1.0
+
+_trusted_proxies = [
+    ipaddress.ip_network(proxy, strict=False) for proxy in settings.trusted_proxies
+]
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def client_ip(request: Request) -> str | None:
+    """
+    Address of the client a request came from.
+
+    When the peer is one of ``trusted_proxies``, ``X-Forwarded-For`` is read
+    from the right, skipping the trusted hops, so a client cannot pick its
+    own address by sending the header itself.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        str | None: Client address, if known
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or not _is_trusted(peer):
+        return peer
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for hop in reversed([h.strip() for h in forwarded.split(",") if h.strip()]):
+        if not _is_trusted(hop):
+            return hop
+    return peer
+
+
+class SlidingWindow:
+    """Thread-safe count of events per key over the last ``window`` seconds."""
+
+    def __init__(self, limit: int, window: float, max_keys: int) -> None:
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        # Only the newest ``limit`` events of a key can decide a check
+        self._events: OrderedDict[str, deque[float]] = OrderedDict()
+        # Reserved attempts whose outcome is not known yet
+        self._pending: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _recent(self, key: str, now: float) -> deque[float] | None:
+        events = self._events.get(key)
+        if events is None:
+            return None
+        while events and events[0] <= now - self.window:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    def retry_after(self, key: str) -> float:
+        """
+        Check whether ``key`` has reached its limit.
+
+        Args:
+            key: Key to check
+
+        Returns:
+            float: Seconds until the key is allowed again, 0 if it is allowed
+        """
+        with self._lock:
+            now = time.monotonic()
+            events = self._recent(key, now)
+            if events is None or len(events) < self.limit:
+                return 0.0
+            return events[0] + self.window - now
+
+    def reserve(self, key: str) -> float:
+        """
+        Take a slot for an attempt on ``key`` unless the limit is reached.
+
+        Reserved slots count like events until ``settle`` is called, so the
+        check and the reservation are one step for concurrent callers.
+
+        Args:
+            key: Key to reserve for
+
+        Returns:
+            float: 0 if a slot was reserved, else seconds until one may free up
+        """
+        with self._lock:
+            now = time.monotonic()
+            events = self._recent(key, now)
+            used = len(events) if events is not None else 0
+            pending = self._pending.get(key, 0)
+            if used + pending < self.limit:
+                self._pending[key] = pending + 1
+                return 0.0
+            if events is not None and used >= self.limit:
+                return events[0] + self.window - now
+            return IN_FLIGHT_RETRY_SECONDS
+
+    def settle(self, key: str, *, hit: bool) -> None:
+        """Release a slot taken by ``reserve``, recording an event if ``hit``."""
+        with self._lock:
+            pending = self._pending.pop(key, 0) - 1
+            if pending > 0:
+                self._pending[key] = pending
+            if hit:
+                self._hit(key)
+
+    def hit(self, key: str) -> None:
+        """Record an event for ``key``, forgetting the least recent keys if full."""
+        with self._lock:
+            self._hit(key)
+
+    def _hit(self, key: str) -> None:
+        now = time.monotonic()
+        events = self._recent(key, now)
+        if events is None:
+            events = self._events[key] = deque(maxlen=self.limit)
+        self._events.move_to_end(key)
+        events.append(now)
+        while len(self._events) > self.max_keys:
+            self._events.popitem(last=False)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._events.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._pending.clear()
+
+
+class LoginLimiter:
+    """Failed-login limits per account and per client IP."""
+
+    def __init__(
+        self,
+        window: float,
+        max_per_account: int,
+        max_per_ip: int,
+        max_keys: int,
+    ) -> None:
+        self.accounts = SlidingWindow(max_per_account, window, max_keys)
+        self.ips = SlidingWindow(max_per_ip, window, max_keys)
+
+    def check(self, email: str, client_ip: str | None) -> float:
+        """
+        Decide whether a login attempt may be verified, reserving it if so.
+
+        An allowed attempt must be settled with ``record`` or ``release``.
+
+        Args:
+            email: Account the attempt is for
+            client_ip: Address the attempt came from, if known
+
+        Returns:
+            float: Seconds the client should wait, 0 if the attempt may go on
+        """
+        wait = self.accounts.reserve(email.lower())
+        if wait:
+            login_rejected.inc(limit="account")
+            return wait
+        if client_ip is not None:
+            wait = self.ips.reserve(client_ip)
+            if wait:
+                self.accounts.settle(email.lower(), hit=False)
+                login_rejected.inc(limit="ip")
+                return wait
+        return 0.0
+
+    def record(self, email: str, client_ip: str | None, *, success: bool) -> None:
+        """
+        Settle a reserved attempt with its verified outcome.
+
+        Args:
+            email: Account the attempt was for
+            client_ip: Address the attempt came from, if known
+            success: Whether the credentials were valid
+        """
+        login_attempts.inc(outcome="success" if success else "failure")
+        self.accounts.settle(email.lower(), hit=not success)
+        if success:
+            self.accounts.reset(email.lower())
+        if client_ip is not None:
+            self.ips.settle(client_ip, hit=not success)
+
+    def release(self, email: str, client_ip: str | None) -> None:
+        """Settle a reserved attempt that ended before it could be verified."""
+        self.accounts.settle(email.lower(), hit=False)
+        if client_ip is not None:
+            self.ips.settle(client_ip, hit=False)
+
+    def clear(self) -> None:
+        self.accounts.clear()
+        self.ips.clear()
+
+
+login_limiter = LoginLimiter(
+    window=settings.login_window_seconds,
+    max_per_account=settings.login_max_failures_per_account,
+    max_per_ip=settings.login_max_failures_per_ip,
+    max_keys=settings.login_limiter_max_keys,
+)
@@ -0,0 +1,245 @@
+"""
+MCP client factory, session pool and result decoding shared by the API
+process.
+
+With ``MCP_TRANSPORT=http`` (the default) clients talk to the standalone MCP
+server at ``settings.mcp_server``. With ``MCP_TRANSPORT=memory`` the FastMCP
+instance from ``app.mcp.server.main`` is mounted in this process and tool
+calls go over in-memory streams, skipping the HTTP round trip.
+
+``mcp_pool`` keeps a few initialized sessions open so requests borrow one
+instead of paying the connect/initialize handshake every time.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+import anyio
+import httpx
+from fastmcp import Client
+from fastmcp.client.client import CallToolResult
+
+from app.core.compression import GZIP_BASE64, IDENTITY, decompress_text
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+pool_size = metrics.gauge("mcp_pool_size", "Open MCP client sessions in the pool")
+pool_idle = metrics.gauge("mcp_pool_idle", "MCP client sessions waiting to be borrowed")
+pool_in_use = metrics.gauge("mcp_pool_in_use", "MCP client sessions currently borrowed")
+pool_borrows = metrics.counter("mcp_pool_borrows_total", "MCP session borrows")
+pool_recycles = metrics.counter(
+    "mcp_pool_recycles_total",
+    "MCP sessions closed and replaced, by reason",
+)
+pool_wait = metrics.histogram(
+    "mcp_pool_wait_seconds",
+    "Time spent waiting to borrow an MCP session",
+)
+
+# Errors after which a session cannot be trusted with another request
+TRANSPORT_ERRORS = (
+    OSError,
+    httpx.TransportError,
+    anyio.BrokenResourceError,
+    anyio.ClosedResourceError,
+    anyio.EndOfStream,
+)
+
+
+def get_mcp_client() -> Client:
+    """Return a configured FastMCP client instance."""
+    if settings.mcp_transport == "memory":
+        # Imported lazily so split deployments never load the Drive stack here
+        from app.mcp.server.main import mcp  # noqa: PLC0415
+
+        return Client(mcp)
+    return Client(settings.mcp_server)
+
+
+def accepted_encoding() -> str | None:
+    """
+    Content encoding to request for file reads.
+
+    Gzip costs CPU on both ends and only pays off when the payload crosses a
+    slow link, so it is opt-in and never used with the in-process transport.
+    """
+    if settings.mcp_compress_content and settings.mcp_transport == "http":
+        return "gzip"
+    return None
+
+
+def tool_data(result: CallToolResult) -> dict:
+    """
+    Extract a Drive tool's payload from its structured content.
+
+    Compressed file content is decoded in place. Servers that predate
+    structured outputs only send JSON text, which is parsed instead.
+    """
+    data = result.structured_content
+    if data is None:
+        data = json.loads(result.content[0].text)  # pyright: ignore[reportAttributeAccessIssue]
+    if data.get("encoding") == GZIP_BASE64:
+        data["content"] = decompress_text(data["content"])
+        data["encoding"] = IDENTITY
+    return data
+
+
+class MCPClientPool:
+    """Bounded pool of connected, initialized MCP client sessions."""
+
+    def __init__(
+        self,
+        size: int,
+        health_check_interval: float,
+        factory: Callable[[], Client] = get_mcp_client,
+    ) -> None:
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.factory = factory
+        # Idle sessions with the time they were returned, most recent last
+        self._idle: list[tuple[Client, float]] = []
+        self._open = 0
+        # Notified whenever a session is returned or a slot frees up
+        self._available: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _bind_loop(self) -> asyncio.Condition:
+        """
+        Attach the pool to the running event loop.
+
+        Sessions run background tasks on the loop that opened them, so a pool
+        used from a new loop (tests, scripts) starts over with fresh sessions.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._available is not None:
+            return self._available
+        self._loop = loop
+        self._idle = []
+        self._available = asyncio.Condition()
+        self._open = 0
+        self._update_gauges()
+        return self._available
+
+    def _update_gauges(self) -> None:
+        pool_size.set(self._open)
+        pool_idle.set(len(self._idle))
+        pool_in_use.set(self._open - len(self._idle))
+
+    async def _connect(self) -> Client:
+        client = self.factory()
+        await client.__aenter__()
+        return client
+
+    async def _discard(self, client: Client, reason: str) -> None:
+        available = self._bind_loop()
+        async with available:
+            self._open -= 1
+            pool_recycles.inc(reason=reason)
+            self._update_gauges()
+            # A waiter may now open a replacement
+            available.notify()
+        try:
+            await client.close()
+        except Exception:  # noqa: BLE001
+            logger.debug("Error while closing MCP session", exc_info=True)
+
+    async def start(self) -> None:
+        """Open ``size`` sessions up front; failures are retried lazily."""
+        available = self._bind_loop()
+        for _ in range(self.size - self._open):
+            try:
+                client = await self._connect()
+            except Exception:  # noqa: BLE001
+                logger.warning("MCP server unavailable, pool will fill on demand")
+                break
+            async with available:
+                self._open += 1
+                self._idle.append((client, time.monotonic()))
+                available.notify()
+        self._update_gauges()
+
+    async def close(self) -> None:
+        """Close every idle session."""
+        if self._available is None:
+            return
+        while self._idle:
+            client, _ = self._idle.pop()
+            await self._discard(client, "shutdown")
+
+    async def _borrow(self) -> Client:
+        available = self._bind_loop()
+        while True:
+            async with available:
+                while not self._idle and self._open >= self.size:
+                    await available.wait()
+                if self._idle:
+                    client, last_used = self._idle.pop()
+                    self._update_gauges()
+                else:
+                    self._open += 1
+                    client = None
+            if client is None:
+                try:
+                    return await self._connect()
+                except BaseException:
+                    async with available:
+                        self._open -= 1
+                        available.notify()
+                    raise
+            if time.monotonic() - last_used < self.health_check_interval:
+                return client
+            try:
+                await asyncio.wait_for(client.ping(), timeout=5)
+            except Exception:  # noqa: BLE001
+                await self._discard(client, "health_check")
+                continue
+            return client
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Client]:
+        """
+        Borrow a connected client for the duration of the block.
+
+        Sessions are returned to the pool afterwards, or closed and replaced
+        if the block failed with a transport or connection error. A session
+        that is no longer connected is never returned to the pool.
+        """
+        start = time.perf_counter()
+        client = await self._borrow()
+        pool_wait.observe(time.perf_counter() - start)
+        pool_borrows.inc()
+        self._update_gauges()
+        try:
+            yield client
+        except TRANSPORT_ERRORS:
+            await self._discard(client, "error")
+            raise
+        except BaseException:
+            # Tool errors, cancellations and caller bugs leave the session usable
+            await self._release(client)
+            raise
+        else:
+            await self._release(client)
+
+    async def _release(self, client: Client) -> None:
+        available = self._bind_loop()
+        async with available:
+            if client.is_connected():
+                self._idle.append((client, time.monotonic()))
+            else:
+                self._open -= 1
+                pool_recycles.inc(reason="disconnected")
+            self._update_gauges()
+            available.notify()
+
+
+mcp_pool = MCPClientPool(
+    size=settings.mcp_pool_size,
+    health_check_interval=settings.mcp_pool_health_check_seconds,
+)
@@ -0,0 +1,87 @@
+"""
+Picking the parts of course files that matter for a chat message.
+
+Presentations arrive as slide chunks. Rather than pasting whole decks into
+the tutor prompt, slides are ranked by how many of the message's terms they
+contain and only the best few are included.
+"""
+
+import re
+
+from app.schemas.mcp import SlideChunk
+
+WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "can",
+    "do",
+    "does",
+    "for",
+    "how",
+    "i",
+    "in",
+    "is",
+    "it",
+    "me",
+    "of",
+    "on",
+    "or",
+    "the",
+    "this",
+    "to",
+    "what",
+    "why",
+    "with",
+    "you",
+}
+
+
+def terms(text: str) -> set[str]:
+    """Lowercase content words of ``text``."""
+    return {w for w in WORD.findall(text.lower()) if w not in STOPWORDS}
+
+
+def select_slides(
+    slides: list[SlideChunk],
+    query: str,
+    limit: int,
+) -> list[SlideChunk]:
+    """
+    Choose up to ``limit`` slides relevant to ``query``, in deck order.
+
+    Slides are scored by the number of distinct query terms in their title,
+    text and speaker notes; title matches count double. Without any match
+    the opening slides are returned, which usually outline the deck.
+    """
+    wanted = terms(query)
+    scored = []
+    for slide in slides:
+        score = len(wanted & terms(f"{slide.text} {slide.notes}"))
+        score += 2 * len(wanted & terms(slide.title))
+        if score:
+            scored.append((score, slide))
+    if not scored:
+        return slides[:limit]
+    best = sorted(scored, key=lambda item: (-item[0], item[1].index))[:limit]
+    return sorted((slide for _, slide in best), key=lambda slide: slide.index)
+
+
+def render_slide(slide: SlideChunk) -> str:
+    """Render one slide as prompt text."""
+    heading = f"Slide {slide.index}"
+    if slide.title:
+        heading += f": {slide.title}"
+    lines = [heading]
+    if slide.text:
+        lines.append(slide.text)
+    if slide.notes:
+        lines.append(f"Speaker notes: {slide.notes}")
+    return "\n".join(lines)
+
+
+def render_slides(slides: list[SlideChunk]) -> str:
+    """Render slides as prompt text, one block per slide."""
+    return "\n\n".join(render_slide(slide) for slide in slides)
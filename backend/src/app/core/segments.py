@@ -0,0 +1,237 @@
+"""
+Append-only, memory-mapped segment store for extracted course material.
+
+Chunk text is appended once to a data file and found through an index of
+fixed-size records (content hash, offset, length, write time). Readers map
+the data file with ``mmap``, so concurrent chat turns and every worker
+process share the operating system's page cache instead of each holding a
+private copy. Appends from several processes are serialized by a file lock.
+
+Text of old revisions stays in the data file until ``compact`` copies the
+live records into a new generation and points ``CURRENT`` at it.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are serialized
+    fcntl = None
+
+# sha256 digest, offset, length, unix time written
+RECORD = struct.Struct("<32sQId")
+
+bytes_appended = metrics.counter(
+    "chunk_store_bytes_appended_total",
+    "Bytes of chunk text appended to the segment store",
+)
+compactions = metrics.counter(
+    "chunk_store_compactions_total",
+    "Segment store compactions",
+)
+
+
+class SegmentStore:
+    """Content-addressed text store keyed by SHA-256 hex digests."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.RLock()
+        self._generation: int | None = None
+        self._index: dict[bytes, tuple[int, int, float]] = {}
+        self._index_read = 0
+        self._data: mmap.mmap | None = None
+
+    def _path(self, generation: int, suffix: str) -> Path:
+        return self.directory / f"segment-{generation:06d}.{suffix}"
+
+    def _current(self) -> int:
+        try:
+            return int((self.directory / "CURRENT").read_text())
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the store's lock across threads and processes."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with (self.directory / "LOCK").open("a+b") as lock:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Pick up a new generation and index records appended since last read."""
+        generation = self._current()
+        if generation != self._generation:
+            # Views handed out earlier keep the old map alive until released
+            self._generation = generation
+            self._index = {}
+            self._index_read = 0
+            self._data = None
+        try:
+            with self._path(generation, "idx").open("rb") as index:
+                index.seek(self._index_read)
+                new = index.read()
+        except FileNotFoundError:
+            return
+        # A record torn by a crashed writer is ignored
+        usable = len(new) - len(new) % RECORD.size
+        for digest, offset, length, written in RECORD.iter_unpack(new[:usable]):
+            self._index[digest] = (offset, length, written)
+        self._index_read += usable
+
+    def _mapped(self, end: int) -> mmap.mmap:
+        """Map the data file, remapping if it has grown past ``end``."""
+        if self._data is None or len(self._data) < end:
+            with self._path(self._generation or 0, "dat").open("rb") as data:
+                self._data = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data
+
+    def _append(self, generation: int, items: list[tuple[bytes, bytes, float]]) -> None:
+        """Append payloads to a generation, data first so the index never leads."""
+        records = []
+        with self._path(generation, "dat").open("ab") as data:
+            offset = data.seek(0, os.SEEK_END)
+            for digest, payload, written in items:
+                data.write(payload)
+                records.append(RECORD.pack(digest, offset, len(payload), written))
+                offset += len(payload)
+        with self._path(generation, "idx").open("ab") as index:
+            end = index.seek(0, os.SEEK_END)
+            if end % RECORD.size:
+                index.truncate(end - end % RECORD.size)
+                index.seek(0, os.SEEK_END)
+            index.write(b"".join(records))
+
+    def put_many(self, texts: dict[str, str]) -> None:
+        """Store texts keyed by the hex SHA-256 of each; known keys are skipped."""
+        with self._lock:
+            missing = {
+                k: t for k, t in texts.items() if bytes.fromhex(k) not in self._index
+            }
+            if not missing:
+                return
+            with self._exclusive():
+                self._refresh()
+                now = time.time()
+                items = [
+                    (digest, text.encode("utf-8"), now)
+                    for key, text in missing.items()
+                    if (digest := bytes.fromhex(key)) not in self._index
+                ]
+                if items:
+                    self._append(self._generation or 0, items)
+                    bytes_appended.inc(sum(len(payload) for _, payload, _ in items))
+                    self._refresh()
+
+    def view(self, key: str) -> memoryview | None:
+        """Zero-copy view of a stored text's UTF-8 bytes, or None if absent."""
+        digest = bytes.fromhex(key)
+        with self._lock:
+            if digest not in self._index:
+                self._refresh()
+            try:
+                return self._view(digest)
+            except FileNotFoundError:
+                # Compacted away by another process since the index was read
+                self._refresh()
+                return self._view(digest)
+
+    def _view(self, digest: bytes) -> memoryview | None:
+        entry = self._index.get(digest)
+        if entry is None:
+            return None
+        offset, length, _ = entry
+        return memoryview(self._mapped(offset + length))[offset : offset + length]
+
+    def get(self, key: str) -> str | None:
+        """Decode a stored text, or None if absent."""
+        view = self.view(key)
+        return None if view is None else str(view, "utf-8")
+
+    def usage(self, live: set[str]) -> tuple[int, int]:
+        """
+        Measure how much of the store is still referenced.
+
+        Returns:
+            tuple[int, int]: Bytes of live texts and bytes of all stored texts
+        """
+        with self._lock:
+            self._refresh()
+            total = sum(length for _, length, _ in self._index.values())
+            used = sum(
+                length
+                for digest, (_, length, _) in self._index.items()
+                if digest.hex() in live
+            )
+        return used, total
+
+    def compact(self, live: set[str], grace_seconds: float) -> dict[str, int]:
+        """
+        Rewrite the store keeping only live texts.
+
+        Texts written within ``grace_seconds`` are kept even if not live, so
+        an ingest whose database rows are not committed yet loses nothing.
+
+        Args:
+            live: Keys still referenced
+            grace_seconds: Age below which unreferenced texts are kept
+
+        Returns:
+            dict[str, int]: Texts ``kept`` and ``dropped`` and bytes
+                ``reclaimed``
+        """
+        with self._exclusive():
+            self._refresh()
+            old = self._generation or 0
+            cutoff = time.time() - grace_seconds
+            keep = [
+                (digest, entry)
+                for digest, entry in self._index.items()
+                if entry[2] >= cutoff or digest.hex() in live
+            ]
+            end = max((o + n for o, n, _ in self._index.values()), default=0)
+            data = self._mapped(end) if end else b""
+            new = old + 1
+            self._append(
+                new,
+                [
+                    (digest, data[o : o + n], written)
+                    for digest, (o, n, written) in keep
+                ],
+            )
+            pointer = self.directory / "CURRENT.tmp"
+            pointer.write_text(str(new))
+            pointer.replace(self.directory / "CURRENT")
+            # Other processes' existing maps stay valid after the unlink
+            for suffix in ("dat", "idx"):
+                self._path(old, suffix).unlink(missing_ok=True)
+
+            kept_bytes = sum(n for _, (_, n, _) in keep)
+            result = {
+                "kept": len(keep),
+                "dropped": len(self._index) - len(keep),
+                "reclaimed": end - kept_bytes,
+            }
+            self._refresh()
+        compactions.inc()
+        return result
+
+
+chunk_store = SegmentStore(settings.chunk_store_dir)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,6 +25,10 @@ class Settings(BaseSettings):
         default=30,
         description="Token expiration (minutes)",
     )
+    refresh_token_expire_days: int = Field(
+        default=30,
+        description="How long an unused refresh token stays valid (days)",
+    )
 
     # --- Database ---
     database_url: str = Field(
@@ -69,6 +75,270 @@ class Settings(BaseSettings):
         default="http://127.0.0.1:8000/mcp",
         description="FastMCP server URL",
     )
+    mcp_transport: Literal["http", "memory"] = Field(
+        default="http",
+        description="'http' to call mcp_server, 'memory' to run the MCP server in-process",
+    )
+    mcp_pool_size: int = Field(
+        default=4,
+        description="Initialized MCP client sessions kept open by the API",
+    )
+    mcp_pool_health_check_seconds: float = Field(
+        default=30.0,
+        description="Ping pooled MCP sessions idle for longer than this",
+    )
+    mcp_tool_workers: int = Field(
+        default=16,
+        description="Worker threads the MCP server uses for blocking Drive tools",
+    )
+    mcp_user_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent MCP tool calls per user",
+    )
+    mcp_compress_content: bool = Field(
+        default=False,
+        description="Ask the MCP server to gzip large file content (worth it on slow links)",
+    )
+    mcp_compress_min_bytes: int = Field(
+        default=64 * 1024,
+        description="Gzip file content at least this large when the MCP client accepts it",
+    )
+    mcp_credentials_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="How long the MCP server reuses a user's decrypted OAuth tokens",
+    )
+    mcp_credentials_cache_size: int = Field(
+        default=1024,
+        description="Maximum users whose OAuth tokens the MCP server keeps cached",
+    )
+    mcp_api_client_cache_size: int = Field(
+        default=16,
+        description="Built Google API clients each MCP worker thread keeps (about 0.5 MB each)",
+    )
+    mcp_metrics_max_users: int = Field(
+        default=200,
+        description="Users broken out individually in MCP metrics; the rest count as 'other'",
+    )
+    metrics_token: str | None = Field(
+        default=None,
+        description="Bearer token Prometheus sends to scrape /api/v1/metrics (disabled when unset)",
+    )
+    mcp_trace_log: str | None = Field(
+        default=None,
+        description="Append one JSON line per MCP tool call to this file (disabled when unset)",
+    )
+    drive_http_mode: Literal["live", "record", "replay"] = Field(
+        default="live",
+        description="'record' saves Drive responses to drive_fixtures, 'replay' serves them offline",
+    )
+    drive_fixtures: str = Field(
+        default="./drive_fixtures.jsonl",
+        description="JSON Lines file of recorded Drive responses",
+    )
+    drive_replay_latency_ms: float = Field(
+        default=0.0,
+        description="Latency added to every replayed Drive response",
+    )
+    drive_replay_jitter: float = Field(
+        default=0.0,
+        description="Replayed latency varies by up to this fraction either way",
+    )
+    drive_replay_error_rate: float = Field(
+        default=0.0,
+        description="Share of replayed Drive requests that fail",
+    )
+    drive_replay_error_status: int = Field(
+        default=403,
+        description="Status of injected failures (403 is sent as a Drive rate limit)",
+    )
+    drive_search_cache_ttl_seconds: float = Field(
+        default=30.0,
+        description="How long Drive search results are reused per user",
+    )
+    drive_search_cache_size: int = Field(
+        default=1024,
+        description="Maximum cached Drive search pages across all users",
+    )
+    drive_mirror_page_size: int = Field(
+        default=1000,
+        description="Files per Drive listing page when crawling the metadata mirror",
+    )
+    drive_mirror_refresh_seconds: float = Field(
+        default=300.0,
+        description="Sync the Drive metadata mirror when it is older than this",
+    )
+    drive_project_qps: float = Field(
+        default=150.0,
+        description="Drive requests per second the MCP server sends across all users",
+    )
+    drive_user_qps: float = Field(
+        default=10.0,
+        description="Drive requests per second the MCP server sends for one user",
+    )
+    drive_max_retries: int = Field(
+        default=5,
+        description="Retries for rate-limited or failed Drive requests",
+    )
+    drive_backoff_base_seconds: float = Field(
+        default=0.5,
+        description="First Drive retry waits up to this long, doubling each attempt",
+    )
+    drive_backoff_max_seconds: float = Field(
+        default=32.0,
+        description="Upper bound on a single Drive retry delay",
+    )
+    sheet_digest_min_rows: int = Field(
+        default=50,
+        description="Spreadsheets with more data rows than this are digested for prompts",
+    )
+    sheet_digest_sample_rows: int = Field(
+        default=12,
+        description="Rows sampled into a spreadsheet digest",
+    )
+    sheet_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        description="How long parsed spreadsheets stay cached per revision",
+    )
+    sheet_cache_size: int = Field(
+        default=32,
+        description="Maximum parsed spreadsheets cached by the MCP server",
+    )
+    sheet_cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        description="Approximate memory parsed spreadsheets may hold in the MCP server cache",
+    )
+    slide_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        description="How long slide chunks stay cached per presentation revision",
+    )
+    slide_cache_size: int = Field(
+        default=64,
+        description="Maximum presentations whose slide chunks the MCP server caches",
+    )
+    chat_max_slides: int = Field(
+        default=5,
+        description="Slides per presentation included in a tutor prompt",
+    )
+    chunk_min_tokens: int = Field(
+        default=200,
+        description="Smallest chunk course files are split into before it may end",
+    )
+    chunk_max_tokens: int = Field(
+        default=800,
+        description="Largest chunk course files are split into",
+    )
+    chunk_store_dir: str = Field(
+        default="./chunk_store",
+        description="Directory of the memory-mapped segment store holding chunk text",
+    )
+    chunk_store_compact_ratio: float = Field(
+        default=0.5,
+        description="Compact the chunk store at startup once this share of it is unreferenced",
+    )
+    chunk_store_compact_grace_seconds: float = Field(
+        default=3600.0,
+        description="Unreferenced chunk text younger than this survives compaction",
+    )
+    chat_context_tokens: int = Field(
+        default=6000,
+        description="Estimated tokens of stored course material included in a tutor prompt",
+    )
+    file_recheck_seconds: float = Field(
+        default=60.0,
+        description="How often tutor turns re-check a course file's Drive revision",
+    )
+    file_recheck_cache_size: int = Field(
+        default=10000,
+        description="Maximum course files whose last revision check is remembered",
+    )
+    argon2_time_cost: int = Field(
+        default=3,
+        description="Argon2 passes per password hash (see benchmarks.password_hash)",
+    )
+    argon2_memory_kib: int = Field(
+        default=65536,
+        description="Argon2 memory per password hash, in KiB",
+    )
+    argon2_parallelism: int = Field(
+        default=4,
+        description="Argon2 lanes per password hash",
+    )
+    password_hash_workers: int | None = Field(
+        default=None,
+        description="Threads hashing and verifying passwords (defaults to the CPU count)",
+    )
+    password_hash_queue: int = Field(
+        default=64,
+        description="Password hashes allowed to wait for a worker before logins get 503",
+    )
+    login_window_seconds: float = Field(
+        default=300.0,
+        description="Window over which failed logins are counted",
+    )
+    login_max_failures_per_account: int = Field(
+        default=5,
+        description="Failed logins per account within the window before refusing",
+    )
+    login_max_failures_per_ip: int = Field(
+        default=50,
+        description="Failed logins per client IP within the window before refusing",
+    )
+    login_limiter_max_keys: int = Field(
+        default=100000,
+        description="Accounts and IPs whose failed logins are remembered",
+    )
+    trusted_proxies: list[str] = Field(
+        default=["127.0.0.1", "::1"],
+        description="Proxy addresses or networks whose X-Forwarded-For names the client",
+    )
+    oauth_refresh_interval_seconds: float = Field(
+        default=60.0,
+        description="How often the API refreshes Google tokens nearing expiry (0 disables)",
+    )
+    oauth_refresh_ahead_seconds: float = Field(
+        default=600.0,
+        description="Refresh Google access tokens this long before they expire",
+    )
+    oauth_refresh_grace_seconds: float = Field(
+        default=86400.0,
+        description="Background refreshes skip Google tokens expired longer than this",
+    )
+    google_http_timeout_seconds: float = Field(
+        default=10.0,
+        description="Timeout for Google OAuth token and userinfo requests",
+    )
+    google_http_max_connections: int = Field(
+        default=20,
+        description="Connections the shared Google OAuth HTTP clients may open",
+    )
+    google_http_keepalive_seconds: float = Field(
+        default=30.0,
+        description="How long idle connections to Google are kept open for reuse",
+    )
+    credential_cache_ttl_seconds: float = Field(
+        default=120.0,
+        description="How long the API keeps a user's decrypted Google tokens",
+    )
+    credential_cache_size: int = Field(
+        default=1024,
+        description="Maximum users whose decrypted Google tokens the API keeps",
+    )
+    principal_cache_ttl_seconds: float = Field(
+        default=15.0,
+        description="How long an authenticated user is reused per token subject without a query",
+    )
+    principal_cache_size: int = Field(
+        default=10000,
+        description="Maximum authenticated users cached by the API",
+    )
+    verified_token_cache_size: int = Field(
+        default=10000,
+        description="Verified access tokens the API remembers (0 disables)",
+    )
+    token_version_cache_ttl_seconds: float = Field(
+        default=15.0,
+        description="How long a revocation may take to reach other API processes",
+    )
     fernet_key: str = Field(
         default="feret_secret_key",
         description="Secret key used to encrypt and decrypt google oauth2 tokens",
@@ -1,3 +1,7 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -5,17 +9,47 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.routes import api_router
-from app.core.database import Base, engine
+from app.core.database import Base, add_missing_columns, engine
+from app.core.google_auth import google_http
+from app.core.hashing import hashing_pool
+from app.core.mcp_client import mcp_pool
 from app.core.settings import settings
+from app.services.auth_token import AuthTokenService
+from app.services.file_chunk import compact_chunk_store
 
 # Create database tables
 # If the tables do not exist, create them
 Base.metadata.create_all(bind=engine)
+# Tables created by an older version miss columns added since
+add_missing_columns(engine)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Open the MCP session pool once instead of handshaking on every request
+    await mcp_pool.start()
+    # Reclaim chunk text of old file revisions before serving
+    await asyncio.to_thread(compact_chunk_store)
+    # Refresh Google tokens before they expire instead of on the request path
+    refresher = None
+    if settings.oauth_refresh_interval_seconds > 0:
+        refresher = asyncio.create_task(AuthTokenService.run_refresher())
+    yield
+    if refresher is not None:
+        refresher.cancel()
+        # Let the refresher unwind before the pools it uses are closed
+        with contextlib.suppress(asyncio.CancelledError):
+            await refresher
+    await mcp_pool.close()
+    await google_http.close()
+    hashing_pool.shutdown()
+
 
 app = FastAPI(
     title=settings.app_name,
     description="An API for the Ai Tutor Project.",
     version=settings.app_version,
+    lifespan=lifespan,
 )
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Page-Token"],
 )
 # Mount static assets
 static_dir = Path(__file__).resolve().parent.parent.parent / "assets"
@@ -0,0 +1,71 @@
+"""
+Per-thread cache of built Google API clients for the MCP server.
+
+``googleapiclient.discovery.build`` parses the discovery document on every
+call, which costs tens of milliseconds of CPU per tool call. The httplib2
+transport a client holds is not thread-safe, so clients are cached per
+worker thread rather than shared. A client is rebuilt when the user's access
+token changes, and each thread keeps its most recently used clients only.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from googleapiclient.discovery import Resource
+
+from app.core.cache import cache_hits, cache_misses
+
+# (API name, API version, user ID)
+ClientKey = tuple[str, str, int]
+
+
+class ApiClientCache:
+    """Built API clients per thread, keyed by API and user."""
+
+    def __init__(self, name: str, max_entries: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _clients(self) -> OrderedDict[ClientKey, tuple[str | None, Resource]]:
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = OrderedDict()
+        return clients
+
+    def get(
+        self,
+        key: ClientKey,
+        token: str | None,
+        build: Callable[[], Resource],
+    ) -> Resource:
+        """
+        Get this thread's client for ``key``, building it when missing.
+
+        Args:
+            key: API name, API version and user ID
+            token: Access token the client must be authorized with
+            build: Builds a new client
+
+        Returns:
+            Resource: A client no other thread uses
+        """
+        clients = self._clients()
+        cached = clients.get(key)
+        if cached is not None and cached[0] == token:
+            clients.move_to_end(key)
+            cache_hits.inc(cache=self.name)
+            return cached[1]
+
+        cache_misses.inc(cache=self.name)
+        client = build()
+        clients[key] = (token, client)
+        clients.move_to_end(key)
+        while len(clients) > self.max_entries:
+            clients.popitem(last=False)
+        return client
+
+    def clear(self) -> None:
+        """Drop every thread's clients."""
+        self._local = threading.local()
@@ -0,0 +1,153 @@
+"""
+Thread pool executor for MCP tools.
+
+Drive tools do blocking googleapiclient/httplib2 I/O and sync SQLAlchemy
+access. Running them here keeps the FastMCP event loop free, caps how many
+calls a single user can have running at once, and records in-flight, queue
+and latency statistics. Each call also gets a ``ToolTrace`` that the Drive
+client fills in while it runs.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from app.core.metrics import metrics
+from app.mcp.server.telemetry import ToolTrace, current_trace, error_class, finish
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+tool_in_flight = metrics.gauge(
+    "mcp_tool_in_flight",
+    "MCP tool calls currently running in the worker pool",
+)
+tool_queued = metrics.gauge(
+    "mcp_tool_queued",
+    "MCP tool calls waiting for a per-user slot or a pool worker",
+)
+tool_latency = metrics.histogram(
+    "mcp_tool_latency_seconds",
+    "End-to-end MCP tool latency, including queueing",
+)
+tool_queue_wait = metrics.histogram(
+    "mcp_tool_queue_wait_seconds",
+    "Time MCP tool calls spent waiting before a worker picked them up",
+)
+tool_calls = metrics.counter(
+    "mcp_tool_calls_total",
+    "MCP tool calls by tool and outcome (ok, tool_error or error)",
+)
+
+
+class ToolExecutor:
+    """Run blocking tool bodies on a sized thread pool with per-user caps."""
+
+    def __init__(self, max_workers: int, per_user_limit: int) -> None:
+        self.max_workers = max_workers
+        self.per_user_limit = per_user_limit
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="mcp-tool",
+        )
+        self._user_slots: dict[int, asyncio.Semaphore] = {}
+        self._user_waiters: dict[int, int] = {}
+
+    def _acquire_slot(self, user_id: int) -> asyncio.Semaphore:
+        slot = self._user_slots.get(user_id)
+        if slot is None:
+            slot = asyncio.Semaphore(self.per_user_limit)
+            self._user_slots[user_id] = slot
+        self._user_waiters[user_id] = self._user_waiters.get(user_id, 0) + 1
+        return slot
+
+    def _release_slot(self, user_id: int) -> None:
+        remaining = self._user_waiters[user_id] - 1
+        if remaining:
+            self._user_waiters[user_id] = remaining
+        else:
+            # Drop idle users so the map does not grow with every user ever seen
+            del self._user_waiters[user_id]
+            del self._user_slots[user_id]
+
+    def user_in_flight(self, user_id: int) -> int:
+        """Number of calls a user currently holds or is waiting on."""
+        return self._user_waiters.get(user_id, 0)
+
+    async def run(
+        self,
+        tool: str,
+        user_id: int,
+        func: Callable[P, T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """
+        Run ``func`` in the worker pool on behalf of ``user_id``.
+
+        Args:
+            tool: Tool name used to label metrics
+            user_id: User the call is made for; used for the concurrency cap
+            func: Blocking callable to run
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            T: Whatever ``func`` returns
+        """
+        enqueued = time.perf_counter()
+        tool_queued.inc()
+        state_lock = threading.Lock()
+        state = {"started": False, "abandoned": False}
+        trace = ToolTrace(tool=tool, user_id=user_id)
+
+        def call() -> T:
+            with state_lock:
+                if state["abandoned"]:
+                    # The caller was cancelled before a worker got to it
+                    raise asyncio.CancelledError
+                state["started"] = True
+            tool_queued.dec()
+            trace.queue_seconds = time.perf_counter() - enqueued
+            tool_queue_wait.observe(trace.queue_seconds, tool=tool)
+            tool_in_flight.inc()
+            token = current_trace.set(trace)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current_trace.reset(token)
+                tool_in_flight.dec()
+
+        slot = self._acquire_slot(user_id)
+        outcome = "error"
+        try:
+            async with slot:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool, call)
+        except Exception as e:
+            trace.error_class = error_class(e)
+            raise
+        else:
+            # Drive tools report failures as an error payload, not by raising
+            outcome = (
+                "tool_error" if isinstance(result, dict) and "error" in result else "ok"
+            )
+            return result
+        finally:
+            with state_lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    tool_queued.dec()
+            self._release_slot(user_id)
+            trace.seconds = time.perf_counter() - enqueued
+            trace.outcome = outcome
+            tool_calls.inc(tool=tool, outcome=outcome)
+            tool_latency.observe(trace.seconds, tool=tool)
+            finish(trace)
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        """Cancel queued tools; with ``wait``, join workers once running ones end."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -4,25 +4,109 @@ OAuth tokens are stored in the UserToken table .
 """
 
 import io
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import TypeVar
 
 from fastmcp import FastMCP
+from fastmcp.tools.tool import ToolResult
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import Resource, build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
+from mcp.types import TextContent
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from app.core.database import SessionLocal
+from app.core.compression import GZIP_BASE64, compress_text
+from app.core.credentials import CredentialCache
+from app.core.database import session_scope
+from app.core.metrics import metrics
+from app.core.retrieval import render_slides
 from app.core.settings import settings
+from app.mcp.server.clients import ApiClientCache
+from app.mcp.server.executor import ToolExecutor
+from app.mcp.server.quota import drive_quota
+from app.mcp.server.replay import google_http
+from app.mcp.server.sheets import SheetTable, render_digest, sheet_tables
+from app.mcp.server.slides import PRESENTATION_FIELDS, extract_slides, slide_decks
+from app.mcp.server.telemetry import record_download, stage
 from app.models.auth_token import AuthToken  # noqa: F401
 from app.models.chat_message import ChatMessage  # noqa: F401
 from app.models.course import Course  # noqa: F401
+from app.models.drive_file import DriveFile  # noqa: F401
+from app.models.drive_sync_state import DriveSyncState  # noqa: F401
 from app.models.file import File  # noqa: F401
+from app.models.file_chunk import FileChunk  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
 from app.models.tutor_session import TutorSession  # noqa: F401
 from app.models.user import User  # noqa: F401
-from app.schemas.mcp import FileContent, FileResult, SearchResult
+from app.schemas.mcp import (
+    ChangesPage,
+    DriveChange,
+    DriveFileMetadata,
+    FileContent,
+    FileListPage,
+    FileNotModified,
+    FileResult,
+    SearchResult,
+    SheetRows,
+    SlideChunk,
+    SlideDeck,
+)
 from app.services.auth_token import AuthTokenService
 
+T = TypeVar("T")
+
 mcp = FastMCP()
 
+# Metadata needed to both serve a file and tell whether it changed
+FILE_METADATA_FIELDS = (
+    "id, name, mimeType, webViewLink, modifiedTime, version, md5Checksum"
+)
+REVISION_FIELDS = ("md5Checksum", "version", "modifiedTime")
+SPREADSHEET_MIME = "application/vnd.google-apps.spreadsheet"
+PRESENTATION_MIME = "application/vnd.google-apps.presentation"
+# Google Docs/Sheets/Slides are exported; anything else exports as text
+EXPORT_MIME_TYPES = {
+    "application/vnd.google-apps.document": "text/plain",
+    SPREADSHEET_MIME: "text/csv",
+    PRESENTATION_MIME: "text/plain",
+}
+
+# Fields stored in the API's local Drive mirror
+MIRROR_FIELDS = "id, name, mimeType, modifiedTime, size, parents, webViewLink"
+# Statuses Drive answers a changes page token it no longer accepts with
+STALE_TOKEN_STATUSES = (400, 404, 410)
+
+conditional_reads = metrics.counter(
+    "mcp_drive_conditional_reads_total",
+    "Conditional Drive reads by result (not_modified or changed)",
+)
+tool_executor = ToolExecutor(
+    max_workers=settings.mcp_tool_workers,
+    per_user_limit=settings.mcp_user_concurrency,
+)
+
+# Decrypted (access_token, refresh_token) per user, wiped when dropped.
+# Entries never outlive the access token, so the cache is only ever read
+# from; refreshes go to the DB.
+credentials_cache = CredentialCache(
+    "mcp_credentials",
+    ttl=settings.mcp_credentials_cache_ttl_seconds,
+    max_entries=settings.mcp_credentials_cache_size,
+)
+
+# Stop serving cached tokens this long before they expire
+CREDENTIALS_EXPIRY_MARGIN_SECONDS = 60
+
+# Built Drive/Slides clients, reused by the same worker thread
+api_clients = ApiClientCache(
+    "mcp_api_clients",
+    max_entries=settings.mcp_api_client_cache_size,
+)
+
 
 class GoogleDriveClient:
     """
@@ -31,44 +115,95 @@ class GoogleDriveClient:
 
     def __init__(self, user_id: int) -> None:
         self.user_id = user_id
-        self.db = SessionLocal()
         self.SCOPES = ["https://www.googleapis.com/auth/drive.readonly"]
+        self.slides: Resource | None = None
         self.service = self._get_service()
 
-    def _get_credentials(self) -> dict | None:
+    def _load_tokens(self) -> tuple[str, str]:
         """
-        Retrieve stored OAuth tokens for a user from the database given their ID
+        Read a user's decrypted OAuth tokens, refreshing them if expired.
 
-        Args:
-            user_id: User ID
+        The session only lives for the lookup, so no connection is held
+        while the tool talks to Drive.
         """
+        with session_scope() as db:
+            tokens = AuthTokenService.get_auth_token(db, self.user_id)
+        pair = (tokens.access_token, tokens.refresh_token)  # pyright: ignore[reportOptionalMemberAccess]
+        expiry = datetime.fromisoformat(tokens.expiry).replace(tzinfo=UTC)  # pyright: ignore[reportOptionalMemberAccess, reportArgumentType]
+        remaining = (expiry - datetime.now(UTC)).total_seconds()
+        ttl = min(credentials_cache.ttl, remaining - CREDENTIALS_EXPIRY_MARGIN_SECONDS)
+        if ttl > 0:
+            credentials_cache.put(self.user_id, *pair, ttl=ttl)  # pyright: ignore[reportArgumentType]
+        return pair  # pyright: ignore[reportReturnType]
 
-        tokens = AuthTokenService.get_auth_token(self.db, self.user_id)
+    def _get_credentials(self) -> Credentials:
+        """Build OAuth credentials for the user, from the cache when possible."""
+        access_token, refresh_token = (
+            credentials_cache.get(self.user_id) or self._load_tokens()
+        )
         return Credentials(
-            token=tokens.access_token,  # pyright: ignore[reportOptionalMemberAccess]
-            refresh_token=tokens.refresh_token,  # type: ignore  # noqa: PGH003
+            token=access_token,
+            refresh_token=refresh_token,
             token_uri=settings.token_uri,
             client_id=settings.client_id,
             client_secret=settings.client_secret,
             scopes=self.SCOPES,
         )
 
+    def _build(self, service: str, version: str) -> Resource:
+        """
+        Get a Google API client on the transport ``drive_http_mode`` selects.
+
+        Clients are reused by the same thread while the access token is
+        unchanged.
+        """
+
+        def new_client() -> Resource:
+            if settings.drive_http_mode == "live":
+                return build(service, version, credentials=self.credentials)
+            return build(service, version, http=google_http(self.credentials))
+
+        token = self.credentials.token if self.credentials else None
+        return api_clients.get((service, version, self.user_id), token, new_client)
+
     def _get_service(self) -> Resource:
-        creds = self._get_credentials()
-        return build("drive", "v3", credentials=creds)
+        with stage("credentials"):
+            # Replayed traffic needs no tokens, so no database either
+            self.credentials = (
+                None
+                if settings.drive_http_mode == "replay"
+                else self._get_credentials()
+            )
+        with stage("build_client"):
+            return self._build("drive", "v3")
+
+    def _slides_service(self) -> Resource:
+        """Build the Slides API client on first use; drive.readonly covers it."""
+        if self.slides is None:
+            self.slides = self._build("slides", "v1")
+        return self.slides
+
+    def _execute(self, method: str, send: Callable[[], T]) -> T:
+        """Send a Drive request through the quota governor."""
+        return drive_quota.execute(self.user_id, method, send)
 
-    def search_files(self, query: str, page_size: int = 10) -> SearchResult | dict:
-        """Search for files in Google Drive."""
+    def search_files(
+        self,
+        query: str,
+        page_size: int = 10,
+        page_token: str | None = None,
+    ) -> SearchResult | dict:
+        """Search for files in Google Drive, one page at a time."""
         try:
-            results = (
-                self.service.files()  # pyright: ignore[reportAttributeAccessIssue]
-                .list(
-                    q=f"name contains '{query}'",
-                    pageSize=page_size,
-                    fields="nextPageToken, files(id, name, mimeType, webViewLink)",
-                )
-                .execute()
+            # Escape the query so quotes cannot break out of the Drive filter
+            escaped = query.replace("\\", "\\\\").replace("'", "\\'")
+            request = self.service.files().list(  # pyright: ignore[reportAttributeAccessIssue]
+                q=f"name contains '{escaped}'",
+                pageSize=max(1, min(page_size, 1000)),
+                pageToken=page_token,
+                fields="nextPageToken, files(id, name, mimeType, webViewLink)",
             )
+            results = self._execute("files.list", request.execute)
 
             files = [
                 FileResult(
@@ -87,35 +222,87 @@ class GoogleDriveClient:
         except Exception as e:  # noqa: BLE001
             return {"error": str(e)}
 
-    def get_file(self, file_id: str) -> FileContent | dict:
+    @staticmethod
+    def revision_of(file_metadata: dict) -> str | None:
+        """
+        Pick the strongest revision fingerprint Drive returned for a file.
+
+        Binary files carry an md5Checksum; Google Docs/Sheets/Slides only have
+        a version and modifiedTime.
+        """
+        for field in REVISION_FIELDS:
+            if file_metadata.get(field):
+                return str(file_metadata[field])
+        return None
+
+    def get_file(
+        self,
+        file_id: str,
+        if_none_match: str | None = None,
+        *,
+        sheet_digest: bool = False,
+        slide_chunks: bool = False,
+    ) -> FileContent | FileNotModified | dict:
+        """
+        Read a file's metadata and content.
+
+        Args:
+            file_id: Google Drive file ID
+            if_none_match: Revision fingerprint (md5Checksum, version or
+                modifiedTime) the caller already holds. When it still matches,
+                only the metadata call is made and FileNotModified is returned.
+            sheet_digest: Return a column summary with sampled rows instead
+                of the full CSV for large spreadsheets.
+            slide_chunks: Read presentations slide by slide through the
+                Slides API and return the chunks alongside the text.
+        """
         try:
             # Get file metadata
-            file_metadata = (
-                self.service.files()  # pyright: ignore[reportAttributeAccessIssue]
-                .get(fileId=file_id, fields="id, name, mimeType, webViewLink")
-                .execute()
+            request = self.service.files().get(  # pyright: ignore[reportAttributeAccessIssue]
+                fileId=file_id,
+                fields=FILE_METADATA_FIELDS,
             )
+            file_metadata = self._execute("files.get", request.execute)
+            revision = self.revision_of(file_metadata)
+
+            if if_none_match is not None:
+                current = {
+                    str(file_metadata[f])
+                    for f in REVISION_FIELDS
+                    if file_metadata.get(f)
+                }
+                if if_none_match in current:
+                    conditional_reads.inc(result="not_modified")
+                    return FileNotModified(metadata=file_metadata, revision=revision)
+                conditional_reads.inc(result="changed")
 
             mime_type = file_metadata.get("mimeType")
 
+            if sheet_digest and mime_type == SPREADSHEET_MIME:
+                return self._sheet_content(file_id, file_metadata, revision)
+            if slide_chunks and mime_type == PRESENTATION_MIME:
+                slides = self._slide_chunks(file_id, revision)
+                return FileContent(
+                    metadata=file_metadata,
+                    content=render_slides(slides),
+                    revision=revision,
+                    slides=slides,
+                )
+
             # Handle Google Docs/Sheets/Slides with export
             if mime_type.startswith("application/vnd.google-apps"):
-                if mime_type == "application/vnd.google-apps.document":
-                    export_mime = "text/plain"
-                elif mime_type == "application/vnd.google-apps.spreadsheet":
-                    export_mime = "text/csv"
-                elif mime_type == "application/vnd.google-apps.presentation":
-                    export_mime = "text/plain"
-                else:
-                    export_mime = "text/plain"
-
-                exported = (
-                    self.service.files()  # pyright: ignore[reportAttributeAccessIssue]
-                    .export(fileId=file_id, mimeType=export_mime)
-                    .execute()
+                export_mime = EXPORT_MIME_TYPES.get(mime_type, "text/plain")
+                request = self.service.files().export(  # pyright: ignore[reportAttributeAccessIssue]
+                    fileId=file_id,
+                    mimeType=export_mime,
                 )
+                exported = self._execute("files.export", request.execute)
 
-                return FileContent(metadata=file_metadata, content=exported)
+                return FileContent(
+                    metadata=file_metadata,
+                    content=exported,
+                    revision=revision,
+                )
 
             # Otherwise, download file directly
             request = self.service.files().get_media(fileId=file_id)  # pyright: ignore[reportAttributeAccessIssue]
@@ -123,39 +310,498 @@ class GoogleDriveClient:
             downloader = MediaIoBaseDownload(fh, request)
             done = False
             while not done:
-                done = downloader.next_chunk()
+                _, done = self._execute("files.get_media", downloader.next_chunk)
+            record_download("files.get_media", fh.tell())
+
+            with stage("decode"):
+                content = fh.getvalue().decode("utf-8", errors="ignore")
+            return FileContent(
+                metadata=file_metadata,
+                content=content,
+                revision=revision,
+            )
 
+        except Exception as e:  # noqa: BLE001
+            return {"error": str(e)}
+
+    def _sheet_table(self, file_id: str, revision: str | None) -> SheetTable:
+        """Export and parse a spreadsheet, at most once per revision."""
+        key = (file_id, revision)
+        table = sheet_tables.get(key) if revision is not None else None
+        if table is None:
+            request = self.service.files().export(  # pyright: ignore[reportAttributeAccessIssue]
+                fileId=file_id,
+                mimeType="text/csv",
+            )
+            exported = self._execute("files.export", request.execute)
+            with stage("decode"):
+                if isinstance(exported, bytes):
+                    exported = exported.decode("utf-8", errors="ignore")
+                table = SheetTable(exported)
+            if revision is not None:
+                sheet_tables.set(key, table)
+        return table
+
+    def _sheet_content(
+        self,
+        file_id: str,
+        file_metadata: dict,
+        revision: str | None,
+    ) -> FileContent:
+        table = self._sheet_table(file_id, revision)
+        if table.row_count <= settings.sheet_digest_min_rows:
             return FileContent(
                 metadata=file_metadata,
-                content=fh.getvalue().decode("utf-8", errors="ignore"),
+                content=table.to_csv(),
+                revision=revision,
             )
+        with stage("digest"):
+            digest = table.digest(settings.sheet_digest_sample_rows)
+            content = render_digest(digest, table.header)
+        return FileContent(
+            metadata=file_metadata,
+            content=content,
+            revision=revision,
+            digest=digest,
+        )
+
+    def read_sheet_rows(
+        self,
+        file_id: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> SheetRows | dict:
+        """
+        Read a slice of a spreadsheet's data rows.
 
+        Args:
+            file_id: Google Drive file ID of a Google Sheet
+            offset: Index of the first data row (0 is the row after the header)
+            limit: Maximum rows to return, up to 1000
+        """
+        try:
+            request = self.service.files().get(  # pyright: ignore[reportAttributeAccessIssue]
+                fileId=file_id,
+                fields=FILE_METADATA_FIELDS,
+            )
+            file_metadata = self._execute("files.get", request.execute)
+            if file_metadata.get("mimeType") != SPREADSHEET_MIME:
+                return {"error": f"{file_id} is not a Google Sheet"}
+            revision = self.revision_of(file_metadata)
+            table = self._sheet_table(file_id, revision)
+            offset = max(offset, 0)
+            return SheetRows(
+                header=table.header,
+                rows=table.rows(offset, max(1, min(limit, 1000))),
+                offset=offset,
+                total_rows=table.row_count,
+                revision=revision,
+            )
         except Exception as e:  # noqa: BLE001
             return {"error": str(e)}
 
+    def _slide_chunks(self, file_id: str, revision: str | None) -> list[SlideChunk]:
+        """Fetch a presentation's slides, at most once per revision."""
+        key = (file_id, revision)
+        slides = slide_decks.get(key) if revision is not None else None
+        if slides is None:
+            request = (
+                self._slides_service()
+                .presentations()
+                .get(  # pyright: ignore[reportAttributeAccessIssue]
+                    presentationId=file_id,
+                    fields=PRESENTATION_FIELDS,
+                )
+            )
+            presentation = self._execute("slides.presentations.get", request.execute)
+            with stage("decode"):
+                slides = extract_slides(presentation)
+            if revision is not None:
+                slide_decks.set(key, slides)
+        return slides
+
+    def read_slides(
+        self,
+        file_id: str,
+        slide_ids: list[str] | None = None,
+    ) -> SlideDeck | dict:
+        """
+        Read a presentation's slide chunks.
+
+        Args:
+            file_id: Google Drive file ID of a Google Slides presentation
+            slide_ids: Object IDs of the slides to return; all when None
+        """
+        try:
+            request = self.service.files().get(  # pyright: ignore[reportAttributeAccessIssue]
+                fileId=file_id,
+                fields=FILE_METADATA_FIELDS,
+            )
+            file_metadata = self._execute("files.get", request.execute)
+            if file_metadata.get("mimeType") != PRESENTATION_MIME:
+                return {"error": f"{file_id} is not a Google Slides presentation"}
+            revision = self.revision_of(file_metadata)
+            slides = self._slide_chunks(file_id, revision)
+            selected = slides
+            if slide_ids is not None:
+                wanted = set(slide_ids)
+                selected = [slide for slide in slides if slide.id in wanted]
+            return SlideDeck(
+                file_id=file_id,
+                revision=revision,
+                total_slides=len(slides),
+                slides=selected,
+            )
+        except Exception as e:  # noqa: BLE001
+            return {"error": str(e)}
+
+    @staticmethod
+    def _mirror_metadata(f: dict) -> DriveFileMetadata:
+        return DriveFileMetadata(
+            id=f["id"],
+            name=f["name"],
+            mime_type=f["mimeType"],
+            modified_time=f.get("modifiedTime"),
+            size=int(f["size"]) if f.get("size") else None,
+            parents=f.get("parents", []),
+            web_view_link=f.get("webViewLink"),
+        )
+
+    def list_files(
+        self,
+        page_token: str | None = None,
+        page_size: int = 1000,
+    ) -> FileListPage | dict:
+        """List every non-trashed file in the user's Drive, one page at a time."""
+        try:
+            request = self.service.files().list(  # pyright: ignore[reportAttributeAccessIssue]
+                q="trashed = false",
+                pageSize=max(1, min(page_size, 1000)),
+                pageToken=page_token,
+                fields=f"nextPageToken, files({MIRROR_FIELDS})",
+            )
+            results = self._execute("files.list", request.execute)
+            return FileListPage(
+                files=[self._mirror_metadata(f) for f in results.get("files", [])],
+                next_page_token=results.get("nextPageToken"),
+            )
+        except Exception as e:  # noqa: BLE001
+            return {"error": str(e)}
+
+    def list_changes(self, page_token: str | None = None) -> ChangesPage | dict:
+        """
+        Read the Drive changes feed.
+
+        Without a page token this only returns the current start token, which
+        callers save before a full crawl and resume from afterwards.
+        """
+        try:
+            if page_token is None:
+                request = self.service.changes().getStartPageToken()  # pyright: ignore[reportAttributeAccessIssue]
+                start = self._execute("changes.getStartPageToken", request.execute)
+                return ChangesPage(new_start_page_token=start.get("startPageToken"))
+
+            request = self.service.changes().list(  # pyright: ignore[reportAttributeAccessIssue]
+                pageToken=page_token,
+                pageSize=1000,
+                fields=(
+                    "nextPageToken, newStartPageToken, changes(fileId, removed, "
+                    f"file({MIRROR_FIELDS}, trashed))"
+                ),
+            )
+            results = self._execute("changes.list", request.execute)
+            changes = []
+            for change in results.get("changes", []):
+                f = change.get("file")
+                removed = change.get("removed", False) or bool(f and f.get("trashed"))
+                changes.append(
+                    DriveChange(
+                        file_id=change["fileId"],
+                        removed=removed,
+                        file=None if removed or not f else self._mirror_metadata(f),
+                    ),
+                )
+            return ChangesPage(
+                changes=changes,
+                next_page_token=results.get("nextPageToken"),
+                new_start_page_token=results.get("newStartPageToken"),
+            )
+        except HttpError as e:
+            # A stored cursor Drive no longer accepts; the caller must recrawl
+            if page_token is not None and e.resp.status in STALE_TOKEN_STATUSES:
+                return {"error": str(e), "reason": "invalid_page_token"}
+            return {"error": str(e)}
+        except Exception as e:  # noqa: BLE001
+            return {"error": str(e)}
+
+
+def _search(
+    query: str,
+    user_id: int,
+    page_size: int,
+    page_token: str | None,
+) -> SearchResult | dict:
+    drive_client = GoogleDriveClient(user_id)
+    return drive_client.search_files(
+        query=query,
+        page_size=page_size,
+        page_token=page_token,
+    )
+
+
+def _read_file(  # noqa: PLR0913
+    file_id: str,
+    user_id: int,
+    if_none_match: str | None,
+    accept_encoding: str | None,
+    *,
+    sheet_digest: bool,
+    slide_chunks: bool,
+) -> FileContent | FileNotModified | dict:
+    drive_client = GoogleDriveClient(user_id)
+    result = drive_client.get_file(
+        file_id=file_id,
+        if_none_match=if_none_match,
+        sheet_digest=sheet_digest,
+        slide_chunks=slide_chunks,
+    )
+    if (
+        isinstance(result, FileContent)
+        and accept_encoding == "gzip"
+        and len(result.content) >= settings.mcp_compress_min_bytes
+    ):
+        with stage("compress"):
+            result.content = compress_text(result.content)
+        result.encoding = GZIP_BASE64
+    return result
+
+
+def _structured(result: BaseModel | dict) -> ToolResult:
+    """
+    Return a tool result as structured content only.
+
+    FastMCP would otherwise also serialize the whole result into a JSON text
+    block, doubling the payload for large files.
+    """
+    payload = (
+        result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+    )
+    if "error" in payload:
+        summary = f"Error: {payload['error']}"
+    else:
+        summary = f"{type(result).__name__} (see structured content)"
+    return ToolResult(
+        content=[TextContent(type="text", text=summary)],
+        structured_content=payload,
+    )
+
+
+def _read_sheet_rows(
+    file_id: str,
+    user_id: int,
+    offset: int,
+    limit: int,
+) -> SheetRows | dict:
+    drive_client = GoogleDriveClient(user_id)
+    return drive_client.read_sheet_rows(file_id=file_id, offset=offset, limit=limit)
+
+
+def _read_slides(
+    file_id: str,
+    user_id: int,
+    slide_ids: list[str] | None,
+) -> SlideDeck | dict:
+    drive_client = GoogleDriveClient(user_id)
+    return drive_client.read_slides(file_id=file_id, slide_ids=slide_ids)
+
+
+def _list_files(
+    user_id: int,
+    page_token: str | None,
+    page_size: int,
+) -> FileListPage | dict:
+    drive_client = GoogleDriveClient(user_id)
+    return drive_client.list_files(page_token=page_token, page_size=page_size)
+
+
+def _list_changes(user_id: int, page_token: str | None) -> ChangesPage | dict:
+    drive_client = GoogleDriveClient(user_id)
+    return drive_client.list_changes(page_token=page_token)
+
 
 # -------------------------------
 # MCP Tool Definitions
 # -------------------------------
+# Tool bodies block on Drive and the database, so they run on the tool
+# executor's thread pool instead of the server's event loop.
 @mcp.tool()
-def gdrive_search(query: str, user_id: int, page_size: int = 10) -> SearchResult | dict:
-    """Search for files in Google Drive."""
-    drive_client = GoogleDriveClient(int(user_id))
-    return drive_client.search_files(query=query, page_size=page_size)
+async def gdrive_search(
+    query: str,
+    user_id: int,
+    page_size: int = 10,
+    page_token: str | None = None,
+) -> ToolResult:
+    """
+    Search for files in Google Drive.
+
+    Returns a SearchResult as structured content. Pass ``next_page_token``
+    from a previous result as ``page_token`` to fetch the following page.
+    """
+    user_id = int(user_id)
+    result = await tool_executor.run(
+        "gdrive_search",
+        user_id,
+        _search,
+        query,
+        user_id,
+        page_size,
+        page_token,
+    )
+    return _structured(result)
 
 
 @mcp.tool()
-def gdrive_read_file(file_id: str, user_id: int) -> FileContent | dict:
-    """Read file content + metadata from Google Drive."""
-    drive_client = GoogleDriveClient(user_id)
-    return drive_client.get_file(file_id=file_id)
+async def gdrive_read_file(  # noqa: PLR0913
+    file_id: str,
+    user_id: int,
+    if_none_match: str | None = None,
+    accept_encoding: str | None = None,
+    sheet_digest: bool = False,  # noqa: FBT001, FBT002
+    slide_chunks: bool = False,  # noqa: FBT001, FBT002
+) -> ToolResult:
+    """
+    Read file content + metadata from Google Drive.
+
+    Returns a FileContent (or FileNotModified) as structured content. Pass
+    the revision from a previous read as ``if_none_match`` to get a
+    ``not_modified`` response without downloading the content again. With
+    ``accept_encoding="gzip"`` large content is sent gzipped and base64
+    encoded, flagged by ``encoding="gzip+base64"``. With ``sheet_digest``
+    large Google Sheets come back as a column summary with sampled rows;
+    use ``gdrive_read_sheet_rows`` for the full data. With ``slide_chunks``
+    presentations also carry per-slide chunks in ``slides``.
+    """
+    result = await tool_executor.run(
+        "gdrive_read_file",
+        user_id,
+        _read_file,
+        file_id,
+        user_id,
+        if_none_match,
+        accept_encoding,
+        sheet_digest=sheet_digest,
+        slide_chunks=slide_chunks,
+    )
+    return _structured(result)
+
+
+@mcp.tool()
+async def gdrive_read_slides(
+    file_id: str,
+    user_id: int,
+    slide_ids: list[str] | None = None,
+) -> ToolResult:
+    """
+    Read a Google Slides presentation as per-slide chunks.
+
+    Returns a SlideDeck as structured content. Each chunk has the slide's
+    object ID, position, title, text and speaker notes; pass ``slide_ids``
+    to fetch only those slides.
+    """
+    result = await tool_executor.run(
+        "gdrive_read_slides",
+        user_id,
+        _read_slides,
+        file_id,
+        user_id,
+        slide_ids,
+    )
+    return _structured(result)
+
+
+@mcp.tool()
+async def gdrive_read_sheet_rows(
+    file_id: str,
+    user_id: int,
+    offset: int = 0,
+    limit: int = 100,
+) -> ToolResult:
+    """
+    Read a Google Sheet's data rows, ``limit`` at a time from ``offset``.
+
+    Returns SheetRows as structured content, with ``total_rows`` for paging.
+    """
+    result = await tool_executor.run(
+        "gdrive_read_sheet_rows",
+        user_id,
+        _read_sheet_rows,
+        file_id,
+        user_id,
+        offset,
+        limit,
+    )
+    return _structured(result)
+
+
+@mcp.tool()
+async def gdrive_list_files(
+    user_id: int,
+    page_token: str | None = None,
+    page_size: int = 1000,
+) -> ToolResult:
+    """List all Drive file metadata page by page, for mirroring."""
+    result = await tool_executor.run(
+        "gdrive_list_files",
+        user_id,
+        _list_files,
+        user_id,
+        page_token,
+        page_size,
+    )
+    return _structured(result)
+
+
+@mcp.tool()
+async def gdrive_list_changes(
+    user_id: int,
+    page_token: str | None = None,
+) -> ToolResult:
+    """
+    Read Drive changes since ``page_token``.
+
+    Call without a token to get the current start token.
+    """
+    result = await tool_executor.run(
+        "gdrive_list_changes",
+        user_id,
+        _list_changes,
+        user_id,
+        page_token,
+    )
+    return _structured(result)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:  # noqa: ARG001
+    """
+    Expose MCP server metrics in Prometheus text format.
+
+    Covers the tool pool (in-flight, queue, latency), per-tool stage timings
+    and errors, Drive requests by method (latency, errors, bytes, quota) and
+    per-user breakdowns.
+    """
+    return PlainTextResponse(metrics.render())
 
 
 # -------------------------------
 # Main Entry Point
 # -------------------------------
 def main() -> None:
-    mcp.run(transport="http", port=8000)
+    try:
+        mcp.run(transport="http", port=8000)
+    finally:
+        # Let running tools finish and join the worker threads
+        tool_executor.shutdown(wait=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+"""
+Drive API quota governor for the MCP server.
+
+Every Drive request goes through ``drive_quota.execute``, which waits for a
+token from both the project-wide and the per-user token bucket before
+sending it, and retries rate-limit (403 ``userRateLimitExceeded`` /
+``rateLimitExceeded``, 429) and 5xx responses with capped exponential backoff
+and full jitter. Calls, retries, throttling and recent project usage are
+exported as metrics so operators can see how close we run to Drive limits.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import TypeVar
+
+from googleapiclient.errors import HttpError
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.mcp.server.telemetry import error_class, record_download, record_drive_call
+
+T = TypeVar("T")
+
+RATE_LIMIT_REASONS = {"userRateLimitExceeded", "rateLimitExceeded"}
+
+# Drive quotas are enforced per 60 second window
+USAGE_WINDOW_SECONDS = 60.0
+
+drive_calls = metrics.counter(
+    "drive_api_calls_total",
+    "Drive API requests by method and outcome",
+)
+drive_latency = metrics.histogram(
+    "drive_api_latency_seconds",
+    "Latency of single Drive API request attempts, by method",
+)
+drive_errors = metrics.counter(
+    "drive_api_errors_total",
+    "Failed Drive API request attempts by method and error class",
+)
+drive_retries = metrics.counter(
+    "drive_api_retries_total",
+    "Drive API requests retried after a transient failure, by reason",
+)
+quota_throttled = metrics.counter(
+    "drive_quota_throttled_total",
+    "Drive requests delayed by the local QPS limiter, by scope",
+)
+quota_wait = metrics.histogram(
+    "drive_quota_wait_seconds",
+    "Time Drive requests waited for a local quota token",
+)
+quota_tokens = metrics.gauge(
+    "drive_quota_project_tokens",
+    "Drive request tokens currently available to the whole project",
+)
+quota_utilization = metrics.gauge(
+    "drive_quota_project_utilization",
+    "Drive requests sent in the last minute as a share of the project limit",
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if none is left.
+
+        Returns:
+            float: Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(self._tokens, 0.0)
+
+    def is_full(self) -> bool:
+        return self.available() >= self.burst
+
+
+def _is_rate_limit(error: HttpError) -> bool:
+    try:
+        errors = json.loads(error.content.decode("utf-8"))["error"]["errors"]
+    except (ValueError, KeyError, TypeError):
+        return False
+    return any(e.get("reason") in RATE_LIMIT_REASONS for e in errors)
+
+
+def retry_reason(error: Exception) -> str | None:
+    """
+    Classify a failed Drive request.
+
+    Returns:
+        str | None: A metric label when the request is worth retrying,
+            otherwise None
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return "network"
+    if not isinstance(error, HttpError):
+        return None
+    status = error.resp.status
+    if status >= 500:
+        return "server_error"
+    if status == 429 or (status == 403 and _is_rate_limit(error)):
+        return "rate_limit"
+    return None
+
+
+def _retry_after(error: Exception) -> float:
+    if not isinstance(error, HttpError):
+        return 0.0
+    try:
+        return float(error.resp.get("retry-after", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class DriveQuota:
+    """Project and per-user QPS limits plus retries for Drive requests."""
+
+    # Idle user buckets are pruned once this many are tracked
+    MAX_USER_BUCKETS = 1024
+
+    def __init__(  # noqa: PLR0913
+        self,
+        project_qps: float,
+        user_qps: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.project_qps = project_qps
+        self.user_qps = user_qps
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self.project = TokenBucket(project_qps, project_qps)
+        self._users: dict[int, TokenBucket] = {}
+        self._sent: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _user_bucket(self, user_id: int) -> TokenBucket:
+        with self._lock:
+            bucket = self._users.get(user_id)
+            if bucket is None:
+                if len(self._users) >= self.MAX_USER_BUCKETS:
+                    for idle in [u for u, b in self._users.items() if b.is_full()]:
+                        del self._users[idle]
+                bucket = TokenBucket(self.user_qps, self.user_qps)
+                self._users[user_id] = bucket
+            return bucket
+
+    def acquire(self, user_id: int) -> None:
+        """Block until both the project and the user may send one request."""
+        project_wait = self.project.reserve()
+        user_wait = self._user_bucket(user_id).reserve()
+        wait = max(project_wait, user_wait)
+        if wait > 0:
+            quota_throttled.inc(
+                scope="project" if project_wait >= user_wait else "user",
+            )
+            self.sleep(wait)
+        quota_wait.observe(wait)
+        now = time.monotonic()
+        with self._lock:
+            self._sent.append(now)
+
+    def utilization(self) -> float:
+        """Requests sent in the last quota window relative to the project limit."""
+        cutoff = time.monotonic() - USAGE_WINDOW_SECONDS
+        with self._lock:
+            while self._sent and self._sent[0] < cutoff:
+                self._sent.popleft()
+            sent = len(self._sent)
+        return sent / (self.project_qps * USAGE_WINDOW_SECONDS)
+
+    def backoff(self, attempt: int, retry_after: float = 0.0) -> float:
+        """Full-jitter exponential delay, never shorter than ``retry_after``."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return max(retry_after, random.uniform(0, ceiling))  # nosec B311 - retry jitter
+
+    def execute(self, user_id: int, method: str, send: Callable[[], T]) -> T:
+        """
+        Send a Drive request within quota, retrying transient failures.
+
+        Args:
+            user_id: User the request is made for
+            method: Drive method name used to label metrics, e.g. "files.list"
+            send: Callable performing the request, e.g. ``request.execute``
+
+        Returns:
+            T: Whatever ``send`` returns
+        """
+        attempt = 0
+        while True:
+            self.acquire(user_id)
+            started = time.perf_counter()
+            try:
+                result = send()
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                drive_latency.observe(elapsed, method=method)
+                drive_errors.inc(method=method, error_class=error_class(e))
+                record_drive_call(method, elapsed, e)
+                reason = retry_reason(e)
+                if reason is None or attempt >= self.max_retries:
+                    drive_calls.inc(method=method, outcome="error")
+                    raise
+                drive_calls.inc(method=method, outcome="retried")
+                drive_retries.inc(reason=reason)
+                self.sleep(self.backoff(attempt, _retry_after(e)))
+                attempt += 1
+            else:
+                elapsed = time.perf_counter() - started
+                drive_latency.observe(elapsed, method=method)
+                record_drive_call(method, elapsed)
+                record_download(method, result)
+                drive_calls.inc(method=method, outcome="ok")
+                return result
+
+
+drive_quota = DriveQuota(
+    project_qps=settings.drive_project_qps,
+    user_qps=settings.drive_user_qps,
+    max_retries=settings.drive_max_retries,
+    backoff_base=settings.drive_backoff_base_seconds,
+    backoff_max=settings.drive_backoff_max_seconds,
+)
+quota_tokens.set_function(drive_quota.project.available)
+quota_utilization.set_function(drive_quota.utilization)
@@ -0,0 +1,205 @@
+"""
+Record and replay Google API HTTP traffic for the MCP server.
+
+``RecordingHttp`` wraps the real transport and appends every response
+(metadata, listings, exports, media) to a JSON Lines fixture file;
+``ReplayHttp`` serves those responses back with configurable latency and
+injected errors. Both are passed to ``googleapiclient.discovery.build`` as
+its ``http``, so the Drive client is exercised unchanged without a Google
+account. The mode is chosen with ``drive_http_mode``.
+
+Fixtures contain file content and metadata from the recorded Drive; treat
+them like the files themselves.
+"""
+
+import base64
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httplib2
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+
+from app.core.settings import settings
+
+# Drive's error body for injected rate limits, so retries classify it
+RATE_LIMIT_BODY = {
+    "error": {
+        "code": 403,
+        "message": "Rate limit exceeded (injected by replay)",
+        "errors": [{"reason": "userRateLimitExceeded"}],
+    },
+}
+
+
+def request_key(method: str, uri: str) -> str:
+    """Identify a request by method, path and query, ignoring parameter order."""
+    parts = urlsplit(uri)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method} {parts.path}?{query}"
+
+
+@dataclass
+class Exchange:
+    """One recorded response."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def response(self) -> tuple[httplib2.Response, bytes]:
+        return httplib2.Response({**self.headers, "status": self.status}), self.body
+
+
+class FixtureStore:
+    """Recorded responses keyed by ``request_key``, backed by a JSONL file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._exchanges: dict[str, Exchange] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as fixtures:
+                for line in fixtures:
+                    entry = json.loads(line)
+                    self._exchanges[entry["key"]] = Exchange(
+                        status=entry["status"],
+                        headers=entry["headers"],
+                        body=base64.b64decode(entry["body"]),
+                    )
+
+    def __len__(self) -> int:
+        return len(self._exchanges)
+
+    def get(self, method: str, uri: str) -> Exchange | None:
+        return self._exchanges.get(request_key(method, uri))
+
+    def add(self, method: str, uri: str, exchange: Exchange) -> None:
+        """Keep a response and append it to the fixture file."""
+        key = request_key(method, uri)
+        line = json.dumps(
+            {
+                "key": key,
+                "status": exchange.status,
+                "headers": exchange.headers,
+                "body": base64.b64encode(exchange.body).decode("ascii"),
+            },
+        )
+        with self._lock:
+            self._exchanges[key] = exchange
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fixtures:
+                fixtures.write(line + "\n")
+
+
+@cache
+def fixture_store(path: str) -> FixtureStore:
+    """Load a fixture file once per process."""
+    return FixtureStore(path)
+
+
+class RecordingHttp:
+    """httplib2-compatible transport that records what ``http`` returns."""
+
+    def __init__(self, http: object, store: FixtureStore) -> None:
+        self.http = http
+        self.store = store
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        *args: object,
+        **kwargs: object,
+    ) -> tuple[httplib2.Response, bytes]:
+        response, content = self.http.request(uri, method, *args, **kwargs)  # pyright: ignore[reportAttributeAccessIssue]
+        headers = {k: str(v) for k, v in response.items() if k != "status"}
+        self.store.add(method, uri, Exchange(response.status, headers, content))
+        return response, content
+
+
+class ReplayHttp:
+    """
+    httplib2-compatible transport serving recorded responses.
+
+    Each request sleeps ``latency`` seconds, varied by up to ``jitter`` of
+    that either way, and fails with ``error_status`` with probability
+    ``error_rate``. Unrecorded requests get a 404 like Drive's.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        store: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 403,
+        seed: int | None = None,
+    ) -> None:
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        # Seeded so injected latency and errors repeat between runs
+        self._random = random.Random(seed)  # nosec B311 - not used for security
+        self._lock = threading.Lock()
+
+    def _error(self, status: int, body: dict) -> tuple[httplib2.Response, bytes]:
+        headers = {"content-type": "application/json; charset=UTF-8"}
+        return Exchange(status, headers, json.dumps(body).encode()).response()
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        *_args: object,
+        **_kwargs: object,
+    ) -> tuple[httplib2.Response, bytes]:
+        with self._lock:
+            spread = self._random.uniform(-self.jitter, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(max(0.0, self.latency * (1 + spread)))
+        if fail:
+            if self.error_status == 403:
+                return self._error(403, RATE_LIMIT_BODY)
+            message = f"Injected error {self.error_status}"
+            return self._error(
+                self.error_status,
+                {"error": {"code": self.error_status, "message": message}},
+            )
+        exchange = self.store.get(method, uri)
+        if exchange is None:
+            message = f"No recorded response for {request_key(method, uri)}"
+            return self._error(404, {"error": {"code": 404, "message": message}})
+        return exchange.response()
+
+
+def google_http(credentials: Credentials | None) -> object:
+    """
+    Transport for ``build(..., http=...)`` in record or replay mode.
+
+    Args:
+        credentials: The user's OAuth credentials; unused when replaying
+
+    Returns:
+        object: A ``RecordingHttp`` around an authorized transport, or a
+            ``ReplayHttp``
+    """
+    store = fixture_store(settings.drive_fixtures)
+    if settings.drive_http_mode == "record":
+        return RecordingHttp(AuthorizedHttp(credentials, http=httplib2.Http()), store)
+    return ReplayHttp(
+        store,
+        latency=settings.drive_replay_latency_ms / 1000,
+        jitter=settings.drive_replay_jitter,
+        error_rate=settings.drive_replay_error_rate,
+        error_status=settings.drive_replay_error_status,
+    )
@@ -0,0 +1,175 @@
+"""
+Spreadsheet digests for CSV-exported Google Sheets.
+
+A large gradebook or dataset exported as CSV would otherwise dominate the
+tutor prompt. ``SheetTable`` parses the CSV into a NumPy grid of Python
+strings once per file revision (an object grid, so one long cell does not
+widen every other cell the way a fixed-width ``<U`` array would); ``digest`` summarizes each column (type, counts, min/max/mean
+or top values) with a few sampled rows, and ``rows`` serves the full data a
+slice at a time.
+"""
+
+import csv
+import io
+import sys
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.settings import settings
+from app.schemas.mcp import ColumnSummary, SheetDigest
+
+# Values shown per text column and characters kept per sampled cell
+TOP_VALUES = 5
+MAX_CELL_CHARS = 40
+BOOLEAN_VALUES = {"true", "false", "yes", "no"}
+
+# Parsed tables keyed by (file_id, revision); a new revision is a new key.
+# Bounded by memory as well as count, since one sheet can be very large
+sheet_tables: TTLCache[tuple[str, str | None], "SheetTable"] = TTLCache(
+    "mcp_sheet_tables",
+    ttl=settings.sheet_cache_ttl_seconds,
+    max_entries=settings.sheet_cache_size,
+    max_bytes=settings.sheet_cache_max_bytes,
+    sizeof=lambda table: table.nbytes,
+)
+
+
+def _as_numbers(values: list[str]) -> np.ndarray | None:
+    """Parse a column as floats, allowing 1,234 / $12 / 85% notation."""
+    cleaned = [value.replace(",", "").replace("$", "") for value in values]
+    if cleaned and all(value.endswith("%") for value in cleaned):
+        cleaned = [value.rstrip("%") for value in cleaned]
+    try:
+        return np.array(cleaned, dtype=np.float64)
+    except ValueError:
+        return None
+
+
+class SheetTable:
+    """A CSV export parsed into a header and a 2-D NumPy grid of strings."""
+
+    def __init__(self, text: str) -> None:
+        rows = list(csv.reader(io.StringIO(text)))
+        header = rows[0] if rows else []
+        body = rows[1:]
+        width = max([len(header), *(len(row) for row in body)])
+        self.header = header + [f"column_{i + 1}" for i in range(len(header), width)]
+        padded = [row + [""] * (width - len(row)) for row in body]
+        self.cells = np.array(padded, dtype=object).reshape(len(body), width)
+        # Approximate memory held by the table, for the cache's byte budget
+        self.nbytes = self.cells.nbytes + sum(
+            sys.getsizeof(cell) for row in padded for cell in row
+        )
+        self._digest: SheetDigest | None = None
+
+    @property
+    def row_count(self) -> int:
+        return self.cells.shape[0]
+
+    def _summarize(self, index: int) -> ColumnSummary:
+        column = [cell.strip() for cell in self.cells[:, index]]
+        values = [cell for cell in column if cell]
+        summary = ColumnSummary(
+            name=self.header[index],
+            type="empty",
+            count=len(values),
+            missing=len(column) - len(values),
+        )
+        if not values:
+            return summary
+
+        unique, counts = np.unique(np.array(values, dtype=object), return_counts=True)
+        summary.unique = int(unique.size)
+        numbers = _as_numbers(values)
+        if numbers is not None:
+            summary.type = "number"
+            summary.min = float(numbers.min())
+            summary.max = float(numbers.max())
+            summary.mean = float(numbers.mean())
+            return summary
+
+        lowered = {value.lower() for value in unique}
+        summary.type = "boolean" if lowered <= BOOLEAN_VALUES else "text"
+        top = np.argsort(-counts, kind="stable")[:TOP_VALUES]
+        summary.top_values = [(str(unique[i]), int(counts[i])) for i in top]
+        return summary
+
+    def digest(self, sample_rows: int) -> SheetDigest:
+        """
+        Summarize every column and pick ``sample_rows`` representative rows.
+
+        The first rows are always included, the rest are spread evenly over
+        the sheet so later sections of long sheets are represented too.
+        """
+        if self._digest is None:
+            head = min(self.row_count, sample_rows // 2)
+            spread = np.linspace(head, self.row_count - 1, sample_rows - head)
+            indices = np.unique(
+                np.concatenate([np.arange(head), spread.astype(int)]),
+            )
+            indices = indices[(indices >= 0) & (indices < self.row_count)]
+            self._digest = SheetDigest(
+                rows=self.row_count,
+                columns=[self._summarize(i) for i in range(len(self.header))],
+                sample_row_numbers=[int(i) + 1 for i in indices],
+                sample_rows=self.cells[indices].tolist(),
+            )
+        return self._digest
+
+    def to_csv(self) -> str:
+        """Serialize the table back to CSV, for sheets too small to digest."""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(self.header)
+        writer.writerows(self.cells.tolist())
+        return out.getvalue()
+
+    def rows(self, offset: int, limit: int) -> list[list[str]]:
+        """Return data rows ``offset`` to ``offset + limit`` (header excluded)."""
+        return self.cells[offset : offset + limit].tolist()
+
+
+def _format_number(value: float | None) -> str:
+    return "-" if value is None else f"{value:.4g}"
+
+
+def _clip(cell: str) -> str:
+    if len(cell) <= MAX_CELL_CHARS:
+        return cell
+    return cell[: MAX_CELL_CHARS - 1] + "…"
+
+
+def render_digest(digest: SheetDigest, header: list[str]) -> str:
+    """Render a digest as compact prompt text."""
+    lines = [
+        f"Spreadsheet digest: {digest.rows} rows x {len(digest.columns)} columns "
+        "(summary and sampled rows only; full rows are available on request).",
+        "Columns:",
+    ]
+    for column in digest.columns:
+        line = (
+            f"- {column.name} ({column.type}): {column.count} values, "
+            f"{column.missing} missing"
+        )
+        if column.type == "number":
+            line += (
+                f", min {_format_number(column.min)}, max {_format_number(column.max)}"
+                f", mean {_format_number(column.mean)}"
+            )
+        elif column.top_values:
+            top = ", ".join(f'"{_clip(v)}" ({n})' for v, n in column.top_values)
+            line += f", {column.unique} unique, top: {top}"
+        lines.append(line)
+
+    lines.append("Sample rows (row number: values):")
+    lines.append("header: " + ", ".join(header))
+    lines.extend(
+        f"{number}: " + ", ".join(_clip(cell) for cell in row)
+        for number, row in zip(
+            digest.sample_row_numbers,
+            digest.sample_rows,
+            strict=True,
+        )
+    )
+    return "\n".join(lines)
@@ -0,0 +1,91 @@
+"""
+Slide-level chunks for Google Slides presentations.
+
+The Drive ``text/plain`` export flattens a deck into one blob. Here the
+Slides API is read instead and every slide becomes an addressable chunk
+(its object ID, position, title, body text and speaker notes), cached per
+file revision so chat retrieval can pick individual slides.
+"""
+
+from app.core.cache import TTLCache
+from app.core.settings import settings
+from app.schemas.mcp import SlideChunk
+
+# Only what chunking needs: element text, placeholders and the notes page
+PRESENTATION_FIELDS = (
+    "slides(objectId,pageElements,"
+    "slideProperties(notesPage(notesProperties,pageElements)))"
+)
+TITLE_PLACEHOLDERS = {"TITLE", "CENTERED_TITLE"}
+
+# Slide chunks keyed by (file_id, revision); a new revision is a new key
+slide_decks: TTLCache[tuple[str, str | None], list[SlideChunk]] = TTLCache(
+    "mcp_slide_decks",
+    ttl=settings.slide_cache_ttl_seconds,
+    max_entries=settings.slide_cache_size,
+)
+
+
+def _text_of(text: dict | None) -> str:
+    if not text:
+        return ""
+    runs = (
+        element.get("textRun", {}).get("content", "")
+        for element in text.get("textElements", [])
+    )
+    return "".join(runs).strip()
+
+
+def _element_texts(element: dict) -> list[tuple[str | None, str]]:
+    """Return (placeholder type, text) for an element and its children."""
+    if "elementGroup" in element:
+        return [
+            item
+            for child in element["elementGroup"].get("children", [])
+            for item in _element_texts(child)
+        ]
+    if "table" in element:
+        cells = [
+            _text_of(cell.get("text"))
+            for row in element["table"].get("tableRows", [])
+            for cell in row.get("tableCells", [])
+        ]
+        return [(None, " | ".join(c for c in cells if c))]
+    shape = element.get("shape", {})
+    placeholder = shape.get("placeholder", {}).get("type")
+    return [(placeholder, _text_of(shape.get("text")))]
+
+
+def _speaker_notes(slide: dict) -> str:
+    notes_page = slide.get("slideProperties", {}).get("notesPage", {})
+    notes_id = notes_page.get("notesProperties", {}).get("speakerNotesObjectId")
+    for element in notes_page.get("pageElements", []):
+        if element.get("objectId") == notes_id:
+            return _text_of(element.get("shape", {}).get("text"))
+    return ""
+
+
+def extract_slides(presentation: dict) -> list[SlideChunk]:
+    """Split a Slides API presentation into one chunk per slide."""
+    chunks = []
+    for index, slide in enumerate(presentation.get("slides", []), start=1):
+        title = ""
+        body = []
+        for element in slide.get("pageElements", []):
+            for placeholder, text in _element_texts(element):
+                if not text:
+                    continue
+                if not title and placeholder in TITLE_PLACEHOLDERS:
+                    title = text
+                else:
+                    body.append(text)
+        chunks.append(
+            SlideChunk(
+                id=slide["objectId"],
+                index=index,
+                title=title,
+                text="\n".join(body),
+                notes=_speaker_notes(slide),
+            ),
+        )
+    return chunks
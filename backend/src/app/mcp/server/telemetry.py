@@ -0,0 +1,184 @@
+"""
+Telemetry for MCP tool calls.
+
+Every tool call carries a ``ToolTrace`` (held in a context variable by the
+worker thread running it) that collects the Drive requests the call made,
+their latency and downloaded bytes, and the time spent in local stages such
+as loading credentials, decoding and compressing. When the call finishes the
+trace feeds the per-user metrics and, if ``mcp_trace_log`` is set, is
+appended to that file as one JSON line, so slow chat turns can be explained
+without a metrics server.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from googleapiclient.errors import HttpError
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+OTHER_USERS = "other"
+
+drive_bytes = metrics.counter(
+    "drive_api_bytes_downloaded_total",
+    "Bytes of file content downloaded from Drive, by method",
+)
+tool_stages = metrics.histogram(
+    "mcp_tool_stage_seconds",
+    "Time MCP tools spend in local stages (credentials, decode, compress), by tool",
+)
+tool_errors = metrics.counter(
+    "mcp_tool_errors_total",
+    "MCP tool calls that returned an error, by tool and error class",
+)
+user_tool_calls = metrics.counter(
+    "mcp_user_tool_calls_total",
+    "MCP tool calls by user",
+)
+user_tool_seconds = metrics.counter(
+    "mcp_user_tool_seconds_total",
+    "Total MCP tool latency by user",
+)
+user_drive_calls = metrics.counter(
+    "mcp_user_drive_calls_total",
+    "Drive API requests by user",
+)
+user_drive_bytes = metrics.counter(
+    "mcp_user_drive_bytes_total",
+    "Bytes downloaded from Drive by user",
+)
+
+
+@dataclass
+class ToolTrace:
+    """What one tool call did and where its time went."""
+
+    tool: str
+    user_id: int
+    started_at: float = field(default_factory=time.time)
+    seconds: float = 0.0
+    queue_seconds: float = 0.0
+    outcome: str = "ok"
+    error_class: str | None = None
+    drive_calls: dict[str, int] = field(default_factory=dict)
+    drive_seconds: dict[str, float] = field(default_factory=dict)
+    drive_errors: dict[str, int] = field(default_factory=dict)
+    bytes_downloaded: int = 0
+    stages: dict[str, float] = field(default_factory=dict)
+
+
+current_trace: ContextVar[ToolTrace | None] = ContextVar("mcp_tool_trace", default=None)
+
+
+def error_class(error: BaseException) -> str:
+    """Short, low-cardinality name for a failure, e.g. ``http_404``."""
+    if isinstance(error, HttpError):
+        return f"http_{error.resp.status}"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, ConnectionError):
+        return "network"
+    return type(error).__name__
+
+
+class _UserLabels:
+    """Map user IDs to metric labels, folding users past a limit into one."""
+
+    def __init__(self, max_users: int) -> None:
+        self.max_users = max_users
+        self._seen: set[int] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, user_id: int) -> str:
+        with self._lock:
+            if user_id not in self._seen:
+                if len(self._seen) >= self.max_users:
+                    return OTHER_USERS
+                self._seen.add(user_id)
+        return str(user_id)
+
+
+user_label = _UserLabels(settings.mcp_metrics_max_users)
+
+
+def record_drive_call(
+    method: str,
+    seconds: float,
+    error: BaseException | None = None,
+) -> None:
+    """Add one Drive request attempt to the current tool call's trace."""
+    trace = current_trace.get()
+    if trace is None:
+        return
+    trace.drive_calls[method] = trace.drive_calls.get(method, 0) + 1
+    trace.drive_seconds[method] = trace.drive_seconds.get(method, 0.0) + seconds
+    if error is not None:
+        name = error_class(error)
+        trace.drive_errors[name] = trace.drive_errors.get(name, 0) + 1
+        trace.error_class = name
+
+
+def record_download(method: str, payload: object) -> None:
+    """Count the size of content a Drive request returned."""
+    if isinstance(payload, (bytes, bytearray, str)):
+        size = len(payload)
+    elif isinstance(payload, int):
+        size = payload
+    else:
+        return
+    drive_bytes.inc(size, method=method)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.bytes_downloaded += size
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a local stage of the current tool call."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        trace = current_trace.get()
+        tool = trace.tool if trace is not None else "none"
+        tool_stages.observe(elapsed, tool=tool, stage=name)
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + elapsed
+
+
+class TraceLog:
+    """Append finished traces to a JSON Lines file."""
+
+    def __init__(self, path: str | None) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def write(self, trace: ToolTrace) -> None:
+        if self.path is None:
+            return
+        line = json.dumps(asdict(trace), separators=(",", ":")) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as log:
+            log.write(line)
+
+
+trace_log = TraceLog(settings.mcp_trace_log)
+
+
+def finish(trace: ToolTrace) -> None:
+    """Publish a finished tool call to the metrics and the trace log."""
+    user = user_label(trace.user_id)
+    user_tool_calls.inc(user=user)
+    user_tool_seconds.inc(trace.seconds, user=user)
+    user_drive_calls.inc(sum(trace.drive_calls.values()), user=user)
+    user_drive_bytes.inc(trace.bytes_downloaded, user=user)
+    if trace.outcome != "ok":
+        tool_errors.inc(tool=trace.tool, error_class=trace.error_class or "other")
+    trace_log.write(trace)
@@ -2,7 +2,7 @@
 This model defines the Google OAuth2 token structure.
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -16,5 +16,8 @@ class AuthToken(Base):
     expiry = Column(String)
     email = Column(String)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True)
+    # Set when Google rejects the refresh token; cleared when new tokens are
+    # stored. The background refresher skips these tokens
+    refresh_revoked_at = Column(DateTime(timezone=True), nullable=True)
 
     user = relationship("User", back_populates="auth_token")
@@ -0,0 +1,58 @@
+"""
+Drive File Model
+Local mirror of a user's Google Drive file metadata, used for file pickers
+and typeahead without going through MCP and the Drive API.
+"""
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class DriveFile(Base):
+    """
+    SQLAlchemy model for one mirrored Google Drive file.
+
+    Attributes:
+        id (int): Primary key.
+        user_id (int): Foreign key to the user whose Drive this file is in.
+        drive_id (str): Google Drive file ID.
+        name (str): File name as shown in Drive.
+        name_lower (str): Lower-cased name, indexed for prefix lookups.
+        mime_type (str): Drive MIME type.
+        modified_time (str): RFC 3339 modification time reported by Drive.
+        size (int): Size in bytes; None for Google Docs/Sheets/Slides.
+        parents (str): JSON list of parent folder IDs.
+        web_view_link (str): Link to open the file in Drive.
+    """
+
+    __tablename__ = "drive_files"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    drive_id = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    name_lower = Column(String, nullable=False)
+    mime_type = Column(String, nullable=False)
+    modified_time = Column(String, nullable=True)
+    size = Column(BigInteger, nullable=True)
+    parents = Column(Text, nullable=False, default="[]")
+    web_view_link = Column(String, nullable=True)
+
+    user = relationship("User", back_populates="drive_files")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "drive_id", name="unique_drive_file_per_user"),
+        # Serves the range scan for prefix matches. Substring matches can only
+        # use it to find the user's rows; each name is then checked with LIKE
+        Index("ix_drive_files_user_name", "user_id", "name_lower"),
+    )
@@ -0,0 +1,31 @@
+"""
+Drive Sync State Model
+Tracks how far the local Drive mirror of each user has been synced.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class DriveSyncState(Base):
+    """
+    SQLAlchemy model for the Drive mirror sync position of a user.
+
+    Attributes:
+        id (int): Primary key.
+        user_id (int): Foreign key to the user, one row per user.
+        changes_page_token (str): Drive changes feed cursor to resume from.
+        last_full_sync (datetime): When the last full crawl finished.
+        last_synced (datetime): When the mirror was last brought up to date.
+    """
+
+    __tablename__ = "drive_sync_state"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
+    changes_page_token = Column(String, nullable=True)
+    last_full_sync = Column(DateTime(timezone=True), nullable=True)
+    last_synced = Column(DateTime(timezone=True), nullable=True)
+
+    user = relationship("User", back_populates="drive_sync_state")
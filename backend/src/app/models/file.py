@@ -26,6 +26,8 @@ class File(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     # course_id: int, required, foreign key to courses.id
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    # revision: str, Drive revision the stored chunks were built from (None until ingested)
+    revision = Column(String, nullable=True)
     # created_at: datetime, default to current time (server-side)
     created_at = Column(
         DateTime(timezone=True),
@@ -36,6 +38,13 @@ class File(Base):
     course = relationship("Course", back_populates="files")
     # A file is many to one with User
     user = relationship("User", back_populates="files")
+    # A file is one to many with FileChunk; chunks are deleted with the file
+    chunks = relationship(
+        "FileChunk",
+        back_populates="file",
+        cascade="all, delete-orphan",
+        order_by="FileChunk.position",
+    )
 
     # Unique constraint: same file name allowed for different courses, but not within same course
     __table_args__ = (
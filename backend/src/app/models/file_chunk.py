@@ -0,0 +1,43 @@
+"""
+File Chunk Model
+Persisted chunks of a course file's text, read by prompt building, search
+and summaries instead of fetching the file from Google Drive. The rows hold
+the chunk metadata; the text itself lives in the memory-mapped segment store
+(``app.core.segments``) under ``content_hash``.
+"""
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class FileChunk(Base):
+    """
+    SQLAlchemy model for one chunk of a course file.
+
+    Attributes:
+        id (int): Primary key.
+        file_id (int): Foreign key to the course file the chunk belongs to.
+        position (int): Order of the chunk within the file, starting at 0.
+        start_offset (int): Character offset of the chunk in the file text.
+        end_offset (int): Character offset just past the end of the chunk.
+        content_hash (str): SHA-256 of the chunk's text and its key in the
+            segment store; unchanged chunks are kept when a new revision is
+            ingested.
+        token_count (int): Estimated model tokens in the chunk's text.
+    """
+
+    __tablename__ = "file_chunks"
+    id = Column(Integer, primary_key=True)
+    file_id = Column(Integer, ForeignKey("files.id"), nullable=False)
+    position = Column(Integer, nullable=False)
+    start_offset = Column(Integer, nullable=False)
+    end_offset = Column(Integer, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    token_count = Column(Integer, nullable=False)
+
+    file = relationship("File", back_populates="chunks")
+
+    # Not unique: positions shift while a new revision is being applied
+    __table_args__ = (Index("ix_file_chunks_file_position", "file_id", "position"),)
@@ -0,0 +1,43 @@
+"""
+Refresh Token Model
+Server-side record of the application refresh tokens issued at login.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class RefreshToken(Base):
+    """
+    SQLAlchemy model for one issued refresh token.
+
+    Only an HMAC of the token is stored. Each refresh marks the presented
+    token used and issues the next one in the same family, so a used token
+    coming back means it was copied and the whole family is revoked.
+
+    Attributes:
+        id (int): Primary key.
+        user_id (int): Foreign key to the user the token was issued to.
+        token_hash (str): HMAC-SHA256 of the token, hex encoded.
+        family_id (str): Shared by every token rotated from the same login.
+        expires_at (datetime): When the token stops being accepted.
+        used_at (datetime): When the token was exchanged; None while unused.
+        created_at (datetime): Timestamp.
+    """
+
+    __tablename__ = "refresh_tokens"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    used_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    user = relationship("User", back_populates="refresh_tokens")
@@ -16,12 +16,31 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     first_name = Column(String(15), nullable=False)
     last_name = Column(String(15), nullable=False)
+    # Carried in access tokens as "ver"; bumping it revokes every issued token
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     files = relationship("File", back_populates="user")
     courses = relationship("Course", back_populates="user")
     chat_messages = relationship("ChatMessage", back_populates="user")
     tutor_sessions = relationship("TutorSession", back_populates="user")
+    # The Drive mirror is a cache of Drive metadata; drop it with the user
+    drive_files = relationship(
+        "DriveFile",
+        back_populates="user",
+        cascade="all, delete-orphan",
+    )
+    drive_sync_state = relationship(
+        "DriveSyncState",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+    refresh_tokens = relationship(
+        "RefreshToken",
+        back_populates="user",
+        cascade="all, delete-orphan",
+    )
 
     auth_token = relationship(
         "AuthToken",
@@ -4,11 +4,17 @@ AuthToken repository.
 Data access for OAuth tokens linked to users.
 """
 
+from datetime import UTC, datetime
+
 from sqlalchemy.orm import Session
 
 from app.models.auth_token import AuthToken
 
 
+def _naive_iso(moment: datetime) -> str:
+    return moment.astimezone(UTC).replace(tzinfo=None).isoformat()
+
+
 class AuthTokenRepository:
     """Repository for auth token data access."""
 
@@ -16,6 +22,49 @@ class AuthTokenRepository:
     def get_by_user_id(db: Session, user_id: int) -> AuthToken | None:
         return db.query(AuthToken).filter(AuthToken.user_id == user_id).first()
 
+    @staticmethod
+    def get_user_ids_expiring_between(
+        db: Session,
+        oldest: datetime,
+        cutoff: datetime,
+    ) -> list[int]:
+        """
+        Return the users whose access token expires in ``[oldest, cutoff)``.
+
+        Tokens expired before ``oldest`` belong to users who have not been
+        back for a while, and tokens whose refresh was revoked cannot be
+        refreshed; both are left out. Expiry is stored as Google's naive UTC
+        ISO string, which sorts like the time it represents, so the
+        comparison runs in the database.
+
+        Args:
+            db: Database session
+            oldest: Aware or UTC datetime, inclusive
+            cutoff: Aware or UTC datetime, exclusive
+
+        Returns:
+            list[int]: User IDs
+        """
+        rows = db.query(AuthToken.user_id).filter(
+            AuthToken.expiry.is_not(None),
+            AuthToken.expiry >= _naive_iso(oldest),
+            AuthToken.expiry < _naive_iso(cutoff),
+            AuthToken.refresh_revoked_at.is_(None),
+        )
+        return [user_id for (user_id,) in rows]
+
+    @staticmethod
+    def mark_revoked(db: Session, db_token: AuthToken) -> None:
+        """
+        Record that Google rejected the token's refresh token.
+
+        Args:
+            db: Database session
+            db_token: Token whose refresh failed permanently
+        """
+        db_token.refresh_revoked_at = datetime.now(UTC)  # pyright: ignore[reportAttributeAccessIssue]
+        db.commit()
+
     @staticmethod
     def create(db: Session, auth_data: dict) -> AuthToken:
         db_token = AuthToken(
@@ -36,6 +85,7 @@ class AuthTokenRepository:
         db_token.refresh_token = auth_data.get("refresh_token", db_token.refresh_token)
         db_token.expiry = auth_data.get("expiry", db_token.expiry)
         db_token.email = auth_data.get("email", db_token.email)
+        db_token.refresh_revoked_at = None  # pyright: ignore[reportAttributeAccessIssue]
         db.commit()
         db.refresh(db_token)
         return db_token
@@ -0,0 +1,155 @@
+"""
+Drive file repository.
+
+Data access for the local mirror of users' Google Drive metadata.
+"""
+
+import json
+
+from sqlalchemy.orm import Session
+
+from app.models.drive_file import DriveFile
+from app.schemas.mcp import DriveFileMetadata
+
+
+class DriveFileRepository:
+    """Repository for mirrored Drive file metadata."""
+
+    @staticmethod
+    def upsert_many(
+        db: Session,
+        user_id: int,
+        files: list[DriveFileMetadata],
+    ) -> None:
+        """
+        Insert or update mirrored files for a user.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            files: Metadata as returned by the MCP listing/changes tools
+        """
+        if not files:
+            return
+        existing = {
+            row.drive_id: row
+            for row in db.query(DriveFile).filter(
+                DriveFile.user_id == user_id,
+                DriveFile.drive_id.in_([f.id for f in files]),
+            )
+        }
+        for f in files:
+            row = existing.get(f.id)
+            if row is None:
+                row = DriveFile(user_id=user_id, drive_id=f.id)
+                db.add(row)
+                existing[f.id] = row
+            row.name = f.name
+            row.name_lower = f.name.lower()
+            row.mime_type = f.mime_type
+            row.modified_time = f.modified_time
+            row.size = f.size
+            row.parents = json.dumps(f.parents)
+            row.web_view_link = f.web_view_link
+        db.commit()
+
+    @staticmethod
+    def delete_many(db: Session, user_id: int, drive_ids: list[str]) -> None:
+        """
+        Remove mirrored files for a user.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            drive_ids: Google Drive file IDs to remove
+        """
+        if not drive_ids:
+            return
+        db.query(DriveFile).filter(
+            DriveFile.user_id == user_id,
+            DriveFile.drive_id.in_(drive_ids),
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def get_drive_ids(db: Session, user_id: int) -> set[str]:
+        """Return every mirrored Drive file ID for a user."""
+        rows = db.query(DriveFile.drive_id).filter(DriveFile.user_id == user_id)
+        return {drive_id for (drive_id,) in rows}
+
+    @staticmethod
+    def get_all(db: Session, user_id: int) -> list[DriveFile]:
+        """
+        Get every mirrored file for a user, ordered by name.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+        """
+        return (
+            db.query(DriveFile)
+            .filter(DriveFile.user_id == user_id)
+            .order_by(DriveFile.name_lower)
+            .all()
+        )
+
+    @staticmethod
+    def search_prefix(
+        db: Session,
+        user_id: int,
+        prefix: str,
+        limit: int,
+    ) -> list[DriveFile]:
+        """
+        Get files whose name starts with ``prefix`` (case-insensitive).
+
+        Written as a range on ``name_lower`` so it is an index range scan on
+        ``ix_drive_files_user_name`` in every database.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            prefix: Lower-cased name prefix
+            limit: Maximum number of rows
+        """
+        return (
+            db.query(DriveFile)
+            .filter(
+                DriveFile.user_id == user_id,
+                DriveFile.name_lower >= prefix,
+                DriveFile.name_lower < prefix + "\U0010ffff",
+            )
+            .order_by(DriveFile.name_lower)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def search_substring(
+        db: Session,
+        user_id: int,
+        text: str,
+        limit: int,
+    ) -> list[DriveFile]:
+        """
+        Get files whose name contains ``text`` anywhere (case-insensitive).
+
+        A leading-wildcard ``LIKE`` cannot use an index: this reads every
+        mirrored file of the user and is linear in the size of their Drive.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            text: Lower-cased text to look for
+            limit: Maximum number of rows
+        """
+        return (
+            db.query(DriveFile)
+            .filter(
+                DriveFile.user_id == user_id,
+                DriveFile.name_lower.contains(text, autoescape=True),
+            )
+            .order_by(DriveFile.name_lower)
+            .limit(limit)
+            .all()
+        )
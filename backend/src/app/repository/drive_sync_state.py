@@ -0,0 +1,52 @@
+"""
+Drive sync state repository.
+
+Data access for the per-user Drive mirror sync position.
+"""
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.drive_sync_state import DriveSyncState
+
+
+class DriveSyncStateRepository:
+    """Repository for Drive mirror sync state."""
+
+    @staticmethod
+    def get_by_user_id(db: Session, user_id: int) -> DriveSyncState | None:
+        return (
+            db.query(DriveSyncState).filter(DriveSyncState.user_id == user_id).first()
+        )
+
+    @staticmethod
+    def save(
+        db: Session,
+        user_id: int,
+        changes_page_token: str | None,
+        synced_at: datetime,
+        *,
+        full_sync: bool = False,
+    ) -> DriveSyncState:
+        """
+        Record a finished sync for a user.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            changes_page_token: Changes feed cursor to resume from next time
+            synced_at: When the sync finished
+            full_sync: Whether this was a full crawl rather than a changes sync
+        """
+        state = DriveSyncStateRepository.get_by_user_id(db, user_id)
+        if state is None:
+            state = DriveSyncState(user_id=user_id)
+            db.add(state)
+        state.changes_page_token = changes_page_token
+        state.last_synced = synced_at
+        if full_sync:
+            state.last_full_sync = synced_at
+        db.commit()
+        db.refresh(state)
+        return state
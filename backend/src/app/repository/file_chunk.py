@@ -0,0 +1,111 @@
+"""
+File chunk repository.
+
+Data access for the persisted chunks of course files: metadata rows in the
+database and their text in the segment store.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy.orm import Session
+
+from app.core.chunking import TextChunk
+from app.core.segments import chunk_store
+from app.models.file import File
+from app.models.file_chunk import FileChunk
+
+
+class FileChunkRepository:
+    """Repository for course file chunks."""
+
+    @staticmethod
+    def get_by_file(db: Session, file_id: int) -> list[FileChunk]:
+        """Return a file's chunks in order."""
+        return (
+            db.query(FileChunk)
+            .filter(FileChunk.file_id == file_id)
+            .order_by(FileChunk.position)
+            .all()
+        )
+
+    @staticmethod
+    def get_by_files(db: Session, file_ids: list[int]) -> list[FileChunk]:
+        """Return the chunks of several files, grouped by file and in order."""
+        if not file_ids:
+            return []
+        return (
+            db.query(FileChunk)
+            .filter(FileChunk.file_id.in_(file_ids))
+            .order_by(FileChunk.file_id, FileChunk.position)
+            .all()
+        )
+
+    @staticmethod
+    def get_text(chunk: FileChunk) -> str:
+        """Read a chunk's text from the segment store ("" if it is missing)."""
+        return chunk_store.get(chunk.content_hash) or ""  # pyright: ignore[reportArgumentType]
+
+    @staticmethod
+    def get_live_hashes(db: Session) -> set[str]:
+        """Return the content hash of every stored chunk."""
+        rows = db.query(FileChunk.content_hash).distinct()
+        return {content_hash for (content_hash,) in rows}
+
+    @staticmethod
+    def replace(
+        db: Session,
+        file: File,
+        chunks: list[TextChunk],
+        revision: str | None,
+    ) -> dict[str, int]:
+        """
+        Store the chunks of a new revision of a file.
+
+        Stored chunks whose content hash reappears are kept (only their
+        position and offsets are updated); new hashes are inserted and the
+        remaining old chunks deleted. Text is appended to the segment store
+        before the rows are committed; text of deleted chunks is reclaimed by
+        compaction.
+
+        Args:
+            db: Database session
+            file: Course file the chunks belong to
+            chunks: Chunks of the new revision, in order
+            revision: Drive revision the chunks were built from
+
+        Returns:
+            dict[str, int]: Number of chunks ``kept``, ``inserted`` and
+                ``deleted``
+        """
+        # Also restores text of kept chunks if the store was lost
+        chunk_store.put_many({chunk.content_hash: chunk.text for chunk in chunks})
+
+        stored: defaultdict[str, list[FileChunk]] = defaultdict(list)
+        for row in FileChunkRepository.get_by_file(db, file.id):  # pyright: ignore[reportArgumentType]
+            stored[row.content_hash].append(row)  # pyright: ignore[reportArgumentType]
+
+        counts = {"kept": 0, "inserted": 0, "deleted": 0}
+        for position, chunk in enumerate(chunks):
+            if stored[chunk.content_hash]:
+                row = stored[chunk.content_hash].pop(0)
+                counts["kept"] += 1
+            else:
+                row = FileChunk(
+                    file_id=file.id,
+                    content_hash=chunk.content_hash,
+                    token_count=chunk.token_count,
+                )
+                db.add(row)
+                counts["inserted"] += 1
+            row.position = position
+            row.start_offset = chunk.start
+            row.end_offset = chunk.end
+
+        for rows in stored.values():
+            for row in rows:
+                db.delete(row)
+                counts["deleted"] += 1
+
+        file.revision = revision
+        db.commit()
+        return counts
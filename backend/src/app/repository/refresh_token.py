@@ -0,0 +1,124 @@
+"""
+RefreshToken repository.
+
+Data access for the application refresh tokens issued to users.
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.refresh_token import RefreshToken
+
+
+class RefreshTokenRepository:
+    """Repository for refresh token data access."""
+
+    @staticmethod
+    def get_by_hash(db: Session, token_hash: str) -> RefreshToken | None:
+        """
+        Get a refresh token by its stored hash.
+
+        Args:
+            db: Database session
+            token_hash: HMAC of the token
+
+        Returns:
+            RefreshToken | None: Token if found, None otherwise
+        """
+        return (
+            db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+        )
+
+    @staticmethod
+    def create(
+        db: Session,
+        user_id: int,
+        token_hash: str,
+        family_id: str,
+        expires_at: datetime,
+    ) -> RefreshToken:
+        """
+        Store a newly issued refresh token.
+
+        The user's expired tokens are pruned in the same transaction, which
+        keeps the table bounded by the number of live sessions.
+
+        Args:
+            db: Database session
+            user_id: Owner of the token
+            token_hash: HMAC of the token
+            family_id: Family the token belongs to
+            expires_at: When the token expires
+
+        Returns:
+            RefreshToken: Created token
+        """
+        db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.expires_at < datetime.now(UTC),
+        ).delete(synchronize_session=False)
+        db_token = RefreshToken(
+            user_id=user_id,
+            token_hash=token_hash,
+            family_id=family_id,
+            expires_at=expires_at,
+        )
+        db.add(db_token)
+        db.commit()
+        db.refresh(db_token)
+        return db_token
+
+    @staticmethod
+    def mark_used(db: Session, db_token: RefreshToken) -> bool:
+        """
+        Mark a token used unless another request already did.
+
+        The check and the write are one conditional UPDATE, so of two
+        requests racing with the same token exactly one wins. The change is
+        not committed; the caller commits it with the replacement token.
+
+        Args:
+            db: Database session
+            db_token: Token being exchanged
+
+        Returns:
+            bool: True if this call marked the token, False if it was used
+        """
+        updated = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.id == db_token.id, RefreshToken.used_at.is_(None))
+            .update(
+                {RefreshToken.used_at: datetime.now(UTC)},
+                synchronize_session=False,
+            )
+        )
+        return updated == 1
+
+    @staticmethod
+    def delete_family(db: Session, family_id: str) -> None:
+        """
+        Revoke every refresh token rotated from the same login.
+
+        Args:
+            db: Database session
+            family_id: Family to revoke
+        """
+        db.query(RefreshToken).filter(RefreshToken.family_id == family_id).delete(
+            synchronize_session=False,
+        )
+        db.commit()
+
+    @staticmethod
+    def delete_for_user(db: Session, user_id: int) -> None:
+        """
+        Revoke every refresh token of a user.
+
+        Args:
+            db: Database session
+            user_id: User ID
+        """
+        db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete(
+            synchronize_session=False,
+        )
+        db.commit()
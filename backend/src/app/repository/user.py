@@ -3,7 +3,7 @@
 This module provides data access layer for user operations.
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.models.user import User
 from app.schemas.user import UserCreate
@@ -40,6 +40,55 @@ class UserRepository:
         """
         return db.query(User).filter(User.id == user_id).first()
 
+    @staticmethod
+    def get_with_auth_token(db: Session, user_id: int) -> User | None:
+        """
+        Get a user and their stored OAuth tokens in one joined query.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            User | None: User with ``auth_token`` loaded, None if not found
+        """
+        return (
+            db.query(User)
+            .options(joinedload(User.auth_token))
+            .filter(User.id == user_id)
+            .first()
+        )
+
+    @staticmethod
+    def get_token_version(db: Session, user_id: int) -> int | None:
+        """
+        Get the version access tokens of a user must carry.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            int | None: Token version, or None if the user does not exist
+        """
+        row = db.query(User.token_version).filter(User.id == user_id).first()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def bump_token_version(db: Session, user_id: int) -> None:
+        """
+        Invalidate every access token issued to a user so far.
+
+        Args:
+            db: Database session
+            user_id: User ID
+        """
+        db.query(User).filter(User.id == user_id).update(
+            {User.token_version: User.token_version + 1},
+            synchronize_session="fetch",
+        )
+        db.commit()
+
     @staticmethod
     def create(db: Session, user: UserCreate, hashed_password: str) -> User:
         """
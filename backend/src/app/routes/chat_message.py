@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 import app.services.chat_message as chat_mesage_service
 from app.core.auth import oauth2_scheme
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user_id
 from app.schemas.chat_message import ChatMessageCreate, ChatMessageResponse
 
 api_router = APIRouter(
@@ -22,12 +22,12 @@ async def create_message(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> ChatMessageResponse:
     """Create a user message and generate an AI response."""
-    user = get_current_user(token, db)
+    user_id = get_current_user_id(token, db)
     # First, save the user's message
     chat_mesage_service.create_chat_message(
         db,
         message,
-        user.id,
+        user_id,
     )  # pyright: ignore[reportArgumentType]
     # create a list of file IDs from the course gdrive_file_id field
 
@@ -35,7 +35,7 @@ async def create_message(
     ai_response = await chat_mesage_service.ai_generate_response_gemini(
         db,
         message.tutor_session_id,
-        user.id,
+        user_id,
     )  # pyright: ignore[reportArgumentType]
 
     # Return the AI response as the response to the user's message
@@ -54,8 +54,8 @@ async def get_message(
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> ChatMessageResponse:
-    user = get_current_user(token, db)
-    return chat_mesage_service.get_chat_message(db, message_id, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return chat_mesage_service.get_chat_message(db, message_id, user_id)
 
 
 @api_router.patch("/{message_id}")
@@ -65,8 +65,8 @@ async def update_message(
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> ChatMessageResponse:
-    user = get_current_user(token, db)
-    return chat_mesage_service.update_chat_message(db, message_id, message, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return chat_mesage_service.update_chat_message(db, message_id, message, user_id)
 
 
 @api_router.delete("/{message_id}")
@@ -75,8 +75,8 @@ async def remove_message(
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> None:
-    user = get_current_user(token, db)
-    return chat_mesage_service.delete_chat_message(db, message_id, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return chat_mesage_service.delete_chat_message(db, message_id, user_id)
 
 
 @api_router.get("/")
@@ -84,5 +84,5 @@ def get_all_messages(  # noqa: ANN201
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ):
-    user = get_current_user(token, db)
-    return chat_mesage_service.get_all_chat_messages(db, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return chat_mesage_service.get_all_chat_messages(db, user_id)
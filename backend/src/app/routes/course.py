@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 import app.services.course as course_service
 from app.core.auth import oauth2_scheme
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user_id
 from app.schemas.course import CourseCreate, CourseResponse
 from app.schemas.tutor_session import TutorSessionResponse
 
@@ -20,8 +20,8 @@ async def create_course(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> CourseResponse:
     """Create a new course"""
-    user = get_current_user(token, db)
-    return course_service.create_course(db, course, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return course_service.create_course(db, course, user_id)
 
 
 @api_router.get("/")
@@ -30,8 +30,8 @@ async def get_all_courses(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> list[CourseResponse]:
     """Get all courses for the current user"""
-    user = get_current_user(token, db)
-    return course_service.get_courses(db, user.id)  # pyright: ignore[reportReturnType, reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return course_service.get_courses(db, user_id)  # pyright: ignore[reportReturnType]
 
 
 @api_router.delete("/{course_id}")
@@ -41,8 +41,8 @@ async def delete_course(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> None:
     """Delete a course by ID"""
-    user = get_current_user(token, db)
-    return course_service.delete_course(db, course_id, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return course_service.delete_course(db, course_id, user_id)
 
 
 @api_router.put("/{course_id}")
@@ -53,8 +53,8 @@ async def update_course(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> CourseResponse:
     """Update a course by ID"""
-    user = get_current_user(token, db)
-    return course_service.update_course(db, course_id, course, user.id)
+    user_id = get_current_user_id(token, db)
+    return course_service.update_course(db, course_id, course, user_id)
 
 
 @api_router.get("/{course_id}")
@@ -64,8 +64,8 @@ async def get_course_by_id(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> CourseResponse:
     """Get a course by ID"""
-    user = get_current_user(token, db)
-    return course_service.get_course_by_id(db, course_id, user.id)
+    user_id = get_current_user_id(token, db)
+    return course_service.get_course_by_id(db, course_id, user_id)
 
 
 @api_router.get("/{course_id}/tutor-sessions")
@@ -75,11 +75,11 @@ async def get_tutor_sessions_by_course(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> list[TutorSessionResponse]:
     """Get all tutor sessions for a course"""
-    user = get_current_user(token, db)
+    user_id = get_current_user_id(token, db)
     tutor_sessions = course_service.get_tutor_sessions_by_course(
         db,
         course_id,
-        user.id,
+        user_id,
     )
     return [
         TutorSessionResponse(
@@ -1,13 +1,19 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 
 import app.services.file as file_service
+import app.services.file_chunk as file_chunk_service
 from app.core.auth import oauth2_scheme
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.schemas.file import FileCreate, FileResponse
+from app.core.dependencies import get_current_user_id
+from app.schemas.file import (
+    FileChunkResponse,
+    FileCreate,
+    FileIngestResponse,
+    FileResponse,
+)
 
 api_router = APIRouter(
     prefix="/files",
@@ -18,13 +24,20 @@ api_router = APIRouter(
 @api_router.post("/")
 async def create_file(
     file: FileCreate,
+    background_tasks: BackgroundTasks,
     # Annotated helps separate typing information from FASTAPI's dependency system cleanly
     db: Annotated[Session, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> FileResponse:
-    """create a new file"""
-    user = get_current_user(token, db)
-    return file_service.create_file(db, file, user.id)
+    """create a new file and chunk its content in the background"""
+    user_id = get_current_user_id(token, db)
+    created = file_service.create_file(db, file, user_id)
+    background_tasks.add_task(
+        file_chunk_service.ingest_file_in_background,
+        created.id,
+        user_id,
+    )
+    return created
 
 
 @api_router.get("/")
@@ -33,8 +46,8 @@ async def get_all_files(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> list[FileResponse]:
     """get all files for the current user"""
-    user = get_current_user(token, db)
-    return file_service.get_all_files(db, user.id)
+    user_id = get_current_user_id(token, db)
+    return file_service.get_all_files(db, user_id)
 
 
 @api_router.get("/{file_id}")
@@ -44,8 +57,30 @@ async def get_file(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> FileResponse:
     """get a file by ID"""
-    user = get_current_user(token, db)
-    return file_service.get_file_response_by_id(db, file_id, user.id)
+    user_id = get_current_user_id(token, db)
+    return file_service.get_file_response_by_id(db, file_id, user_id)
+
+
+@api_router.get("/{file_id}/chunks")
+async def get_file_chunks(
+    file_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> list[FileChunkResponse]:
+    """get the stored chunks of a file"""
+    user_id = get_current_user_id(token, db)
+    return file_chunk_service.get_file_chunks(db, file_id, user_id)
+
+
+@api_router.post("/{file_id}/ingest")
+async def ingest_file(
+    file_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> FileIngestResponse:
+    """re-read a file from Drive and update its stored chunks"""
+    user_id = get_current_user_id(token, db)
+    return await file_chunk_service.ingest_file_by_id(db, file_id, user_id)
 
 
 @api_router.put("/{file_id}")
@@ -56,8 +91,8 @@ async def update_file_name(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> FileResponse:
     """update a file's name by ID"""
-    user = get_current_user(token, db)
-    return file_service.update_file_name(db, file_id, new_name, user.id)
+    user_id = get_current_user_id(token, db)
+    return file_service.update_file_name(db, file_id, new_name, user_id)
 
 
 @api_router.delete("/{file_id}")
@@ -67,8 +102,8 @@ async def delete_file(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> None:
     """delete a file by ID"""
-    user = get_current_user(token, db)
-    file_service.delete_file(db, file_id, user.id)
+    user_id = get_current_user_id(token, db)
+    file_service.delete_file(db, file_id, user_id)
 
 
 # Get all files for a specific course of a user.
@@ -79,5 +114,5 @@ async def get_all_files_from_user_course(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> list[FileResponse]:
     """get all files for a specific course of the current user"""
-    user = get_current_user(token, db)
-    return file_service.get_all_files_from_user_course(db, user.id, course_id)
+    user_id = get_current_user_id(token, db)
+    return file_service.get_all_files_from_user_course(db, user_id, course_id)
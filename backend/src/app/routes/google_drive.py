@@ -1,10 +1,18 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_current_user
-from app.models.user import User
-from app.schemas.google_drive import FileIdRequest
+from app.core.database import get_db
+from app.core.dependencies import get_current_user_id
+from app.schemas.google_drive import (
+    DriveFileResponse,
+    FileIdRequest,
+    SheetRowsRequest,
+    SlidesRequest,
+)
+from app.services.drive_mirror import DriveMirrorService
 from app.services.google_drive import GoogleDriveService
 
 api_router = APIRouter(
@@ -14,25 +22,128 @@ api_router = APIRouter(
 
 
 @api_router.get("/search/")
-async def search_with_query(
-    current_user: Annotated[User, Depends(get_current_user)],
+async def search_with_query(  # noqa: PLR0913
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
     query: Annotated[str | None, Query()] = None,
+    page_token: Annotated[str | None, Query()] = None,
+    page_size: Annotated[int, Query(ge=1, le=100)] = 10,
 ) -> list | dict | None:
-    if query:
-        return await GoogleDriveService.search(current_user.id, query)  # pyright: ignore[reportArgumentType]
-    return await GoogleDriveService.search_all(current_user.id)  # pyright: ignore[reportArgumentType]
+    """
+    Search the user's Drive one page at a time.
+
+    The body stays a plain list of files; the cursor for the next page is
+    returned in the ``X-Next-Page-Token`` header and passed back as
+    ``page_token``. Queries are answered from the local metadata mirror once
+    it has been synced, with the same result shape and paging.
+    """
+    if page_token is not None:
+        from_mirror = DriveMirrorService.is_page_token(page_token)
+    else:
+        from_mirror = bool(query) and await run_in_threadpool(
+            DriveMirrorService.is_ready,
+            db,
+            user_id,
+            background_tasks,
+        )
+    if from_mirror:
+        page = await run_in_threadpool(
+            DriveMirrorService.search_page,
+            db,
+            user_id,
+            query or "",
+            page_token=page_token,
+            page_size=page_size,
+        )
+    else:
+        page = await GoogleDriveService.search_page(
+            user_id,
+            query or "",
+            page_token=page_token,
+            page_size=page_size,
+        )
+    if page["next_page_token"]:
+        response.headers["X-Next-Page-Token"] = page["next_page_token"]
+    return page["files"]
 
 
 @api_router.get("/search/all")
 async def search_user_files(
-    current_user: Annotated[User, Depends(get_current_user)],
+    background_tasks: BackgroundTasks,
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
 ) -> list | dict:
-    return await GoogleDriveService.search_all(current_user.id)  # pyright: ignore[reportArgumentType]
+    """List the user's Drive, from the local mirror once it has been synced."""
+    if await run_in_threadpool(
+        DriveMirrorService.is_ready,
+        db,
+        user_id,
+        background_tasks,
+    ):
+        return await run_in_threadpool(DriveMirrorService.list_files, db, user_id)
+    return await GoogleDriveService.search_all(user_id)
+
+
+@api_router.get("/files/typeahead")
+def typeahead(
+    background_tasks: BackgroundTasks,
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
+    q: Annotated[str, Query(min_length=1)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> list[DriveFileResponse]:
+    """Match file names from the local Drive mirror, prefix matches first."""
+    DriveMirrorService.is_ready(db, user_id, background_tasks)
+    return DriveMirrorService.typeahead(db, user_id, q, limit)
+
+
+@api_router.post("/mirror/sync", status_code=status.HTTP_202_ACCEPTED)
+def sync_mirror(
+    background_tasks: BackgroundTasks,
+    user_id: Annotated[int, Depends(get_current_user_id)],
+) -> dict:
+    """Bring the local Drive mirror up to date in the background."""
+    background_tasks.add_task(DriveMirrorService.refresh, user_id)
+    return {"message": "Drive mirror sync scheduled."}
 
 
 @api_router.post("/read")
 async def read_by_file_id(
-    current_user: Annotated[User, Depends(get_current_user)],
+    user_id: Annotated[int, Depends(get_current_user_id)],
     request: FileIdRequest,
 ) -> list | dict:
-    return await GoogleDriveService.read_file(current_user.id, request.fileid)  # pyright: ignore[reportArgumentType]
+    return await GoogleDriveService.read_file(
+        user_id,
+        request.fileid,
+        if_none_match=request.revision,
+        sheet_digest=request.sheet_digest,
+    )
+
+
+@api_router.post("/read/rows")
+async def read_sheet_rows(
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    request: SheetRowsRequest,
+) -> dict:
+    """Read full rows of a Google Sheet, a page at a time."""
+    return await GoogleDriveService.read_sheet_rows(
+        user_id,
+        request.fileid,
+        offset=request.offset,
+        limit=request.limit,
+    )
+
+
+@api_router.post("/read/slides")
+async def read_slides(
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    request: SlidesRequest,
+) -> dict:
+    """Read a presentation slide by slide, optionally only some slides."""
+    return await GoogleDriveService.read_slides(
+        user_id,
+        request.fileid,
+        slide_ids=request.slide_ids,
+    )
@@ -0,0 +1,45 @@
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import metrics
+from app.core.settings import settings
+
+api_router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+)
+
+
+def require_scraper(authorization: Annotated[str | None, Header()] = None) -> None:
+    """
+    Only let the configured scraper read metrics.
+
+    The endpoint is not served unless ``metrics_token`` is set, and then only
+    to requests presenting it as a bearer token: the counters describe
+    logins and per-user tool usage.
+
+    Raises:
+        HTTPException: 404 when metrics are disabled, 401 on a wrong token
+    """
+    token = settings.metrics_token
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not secrets.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@api_router.get(
+    "",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_scraper)],
+)
+def get_metrics() -> str:
+    """Expose process metrics in Prometheus text format."""
+    return metrics.render()
@@ -7,7 +7,7 @@ import app.services.chat_message as chat_message_service
 import app.services.tutor_session as tutor_session_service
 from app.core.auth import oauth2_scheme
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user_id
 from app.schemas.chat_message import ChatMessageResponse
 from app.schemas.tutor_session import TutorSessionCreate, TutorSessionResponse
 
@@ -24,8 +24,8 @@ async def create_tutor_session(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> TutorSessionResponse:
     """Create a new tutor session for user to chat with."""
-    user = get_current_user(token, db)
-    return tutor_session_service.create_tutor_session(db, tutor_session, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return tutor_session_service.create_tutor_session(db, tutor_session, user_id)
 
 
 @api_router.get("/{tutor_session_id}")
@@ -35,8 +35,8 @@ async def get_tutor_session(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> TutorSessionResponse:
     """Get a tutor session by ID."""
-    user = get_current_user(token, db)
-    return tutor_session_service.get_tutor_session(db, tutor_session_id, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return tutor_session_service.get_tutor_session(db, tutor_session_id, user_id)
 
 
 @api_router.delete("/{tutor_session_id}")
@@ -46,8 +46,8 @@ async def delete_tutor_session(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> None:
     """Delete a tutor session by ID."""
-    user = get_current_user(token, db)
-    return tutor_session_service.delete_tutor_session(db, tutor_session_id, user.id)  # pyright: ignore[reportArgumentType]
+    user_id = get_current_user_id(token, db)
+    return tutor_session_service.delete_tutor_session(db, tutor_session_id, user_id)
 
 
 @api_router.put("/{tutor_session_id}")
@@ -58,12 +58,12 @@ async def update_tutor_session_title(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> TutorSessionResponse:
     """Update a tutor session by ID."""
-    user = get_current_user(token, db)
+    user_id = get_current_user_id(token, db)
     return tutor_session_service.update_tutor_session_title(
         db,
         tutor_session_id,
         title,
-        user.id,  # pyright: ignore[reportArgumentType]
+        user_id,
     )
 
 
@@ -74,11 +74,11 @@ async def get_tutor_session_messages(
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> list[ChatMessageResponse]:
     """Get all messages in a tutor session."""
-    user = get_current_user(token, db)
+    user_id = get_current_user_id(token, db)
     chat_messages = chat_message_service.get_chat_messages_by_tutor_session(
         db,
         tutor_session_id,
-        user.id,
+        user_id,
     )
     return [
         ChatMessageResponse(
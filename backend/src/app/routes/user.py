@@ -7,25 +7,37 @@ import os
 from typing import Annotated, cast
 from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.core.auth import create_access_token
 from app.core.database import get_db
-from app.core.dependencies import get_current_user, get_current_user_oauth_token
+from app.core.dependencies import (
+    get_current_user,
+    get_current_user_id,
+    get_current_user_oauth_token,
+)
 from app.core.google_auth import (
     get_auth_url,
     get_google_email,
     handle_oauth_callback,
 )
+from app.core.login_limiter import client_ip
 from app.core.settings import settings
 from app.models.user import User
 from app.schemas.auth_token import AuthTokenBase
-from app.schemas.user import RedirectResponseSchema, Token, UserCreate, UserUpdate
+from app.schemas.user import (
+    RedirectResponseSchema,
+    Token,
+    TokenRefresh,
+    UserCreate,
+    UserUpdate,
+)
 from app.schemas.user import User as UserSchema
 from app.services.auth_token import AuthTokenService
+from app.services.refresh_token import RefreshTokenService
 from app.services.user import UserService
 
 api_router = APIRouter(
@@ -35,7 +47,7 @@ api_router = APIRouter(
 
 
 @api_router.post("/register", status_code=status.HTTP_200_OK)
-def register(
+async def register(
     user: UserCreate,
     db: Annotated[Session, Depends(get_db)],
 ) -> RedirectResponseSchema:
@@ -45,19 +57,22 @@ def register(
         user: User creation data
         db: Database session
     """
-    UserService.create(db=db, user=user)
+    await UserService.create(db=db, user=user)
     auth_url, _ = get_auth_url()
     return RedirectResponseSchema(redirect_url=auth_url)
 
 
 @api_router.get("/auth/google/callback")
-def auth_google_callback(
+async def auth_google_callback(
     code: str,
     db: Annotated[Session, Depends(get_db)],
 ) -> RedirectResponse:
     """
     Handle Google OAuth2 callback and redirect to frontend with tokens.
 
+    Google is called on the shared async client; database work runs on the
+    threadpool.
+
     Args:
         code: OAuth2 authorization code from Google
         db: Database session
@@ -65,21 +80,21 @@ def auth_google_callback(
     Returns:
         RedirectResponse: Redirects to frontend signup page with tokens as query params
     """
-    creds = handle_oauth_callback(code)
-    email = get_google_email(creds["access_token"])
+    creds = await handle_oauth_callback(code)
+    email = await get_google_email(creds["access_token"])
     if not email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unable to retrieve email from Google.",
         )
     try:
-        user = UserService.get_user_by_email(db, email)
+        user = await run_in_threadpool(UserService.get_user_by_email, db, email)
     except HTTPException:
         user = None
 
     if user:
         uid = cast("int", user.id)
-        AuthTokenService.create_auth_token(db, uid, creds)
+        await run_in_threadpool(AuthTokenService.create_auth_token, db, uid, creds)
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -87,7 +102,8 @@ def auth_google_callback(
         )
 
     # Create JWT token for the user
-    jwt_token = create_access_token(data={"sub": user.email})
+    jwt_token = UserService.create_token(user)
+    jwt_refresh_token = await run_in_threadpool(RefreshTokenService.issue, db, uid)
     token_type = os.environ.get("TOKEN_TYPE", "bearer")
 
     # Build redirect URL with tokens as query parameters
@@ -97,6 +113,7 @@ def auth_google_callback(
         "expiry": creds["expiry"],
         "email": email,
         "jwt_token": jwt_token,
+        "jwt_refresh_token": jwt_refresh_token,
         "token_type": token_type,
     }
     redirect_url = f"{settings.frontend_url}/signup?{urlencode(redirect_params)}"
@@ -104,7 +121,8 @@ def auth_google_callback(
 
 
 @api_router.post("/login")
-def login(
+async def login(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[Session, Depends(get_db)],
 ) -> Token:
@@ -112,19 +130,22 @@ def login(
     Login and get access token.
 
     Args:
+        request: Incoming request, for the client address
         form_data: OAuth2 login form (username=email, password)
         db: Database session
 
     Returns:
-        Token: Access token
+        Token: Access token and a refresh token
 
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid, or 429 after too many
+            failed attempts
     """
-    user = UserService.authenticate(
+    user = await UserService.authenticate(
         db,
         email=form_data.username,
         password=form_data.password,
+        client_ip=client_ip(request),
     )
     if not user:
         raise HTTPException(
@@ -133,15 +154,66 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = UserService.create_token(user)
+    refresh_token = await run_in_threadpool(
+        RefreshTokenService.issue,
+        db,
+        user.id,  # pyright: ignore[reportArgumentType]
+    )
     token_type = os.environ.get("TOKEN_TYPE", "bearer")
 
     return Token(
         access_token=access_token,
         token_type=token_type,
+        refresh_token=refresh_token,
     )
 
 
+@api_router.post("/token/refresh")
+def refresh_access_token(
+    body: TokenRefresh,
+    db: Annotated[Session, Depends(get_db)],
+) -> Token:
+    """
+    Exchange a refresh token for a new access token without the password.
+
+    The refresh token is single use; the response carries its replacement.
+
+    Args:
+        body: Refresh token issued at login or by the previous refresh
+        db: Database session
+
+    Returns:
+        Token: New access token and refresh token
+
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or reused
+    """
+    user, refresh_token = RefreshTokenService.rotate(db, body.refresh_token)
+    token_type = os.environ.get("TOKEN_TYPE", "bearer")
+
+    return Token(
+        access_token=UserService.create_token(user),
+        token_type=token_type,
+        refresh_token=refresh_token,
+    )
+
+
+@api_router.post("/logout")
+def logout(
+    user_id: Annotated[int, Depends(get_current_user_id)],
+    db: Annotated[Session, Depends(get_db)],
+) -> dict:
+    """
+    Log out everywhere by revoking every access and refresh token issued so far.
+
+    Args:
+        user_id: Current user's ID
+        db: Database session
+    """
+    return UserService.revoke_tokens(db, user_id)
+
+
 @api_router.get("/me", response_model=UserSchema)
 def read_users_me(
     current_user: Annotated[User, Depends(get_current_user)],
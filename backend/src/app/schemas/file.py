@@ -25,3 +25,20 @@ class FileResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class FileChunkResponse(BaseModel):
+    position: int
+    start_offset: int
+    end_offset: int
+    text: str
+    content_hash: str
+    token_count: int
+
+
+class FileIngestResponse(BaseModel):
+    revision: str | None = None
+    not_modified: bool = False
+    kept: int = 0
+    inserted: int = 0
+    deleted: int = 0
@@ -3,10 +3,42 @@ Google Drive Schema
 Pydantic models for Google Drive operations.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class FileIdRequest(BaseModel):
     """Request body for file operations."""
 
     fileid: str
+    # Revision returned by an earlier read; unchanged files skip the download
+    revision: str | None = None
+    # Summarize large Google Sheets instead of returning the full CSV
+    sheet_digest: bool = False
+
+
+class SheetRowsRequest(BaseModel):
+    """Request body for reading a slice of a Google Sheet's rows."""
+
+    fileid: str
+    offset: int = Field(default=0, ge=0)
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class DriveFileResponse(BaseModel):
+    """A file served from the local Drive metadata mirror."""
+
+    id: str
+    name: str
+    mime_type: str
+    web_view_link: str | None = None
+    modified_time: str | None = None
+    size: int | None = None
+    parents: list[str] = []
+
+
+class SlidesRequest(BaseModel):
+    """Request body for reading slides of a presentation."""
+
+    fileid: str
+    # Slide object IDs to return; all slides when omitted
+    slide_ids: list[str] | None = None
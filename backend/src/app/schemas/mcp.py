@@ -19,8 +19,110 @@ class SearchResult(BaseModel):
     next_page_token: str | None = None
 
 
+class ColumnSummary(BaseModel):
+    """Type and summary statistics for one spreadsheet column."""
+
+    name: str
+    type: str
+    count: int
+    missing: int
+    unique: int = 0
+    min: float | None = None
+    max: float | None = None
+    mean: float | None = None
+    top_values: list[tuple[str, int]] = []
+
+
+class SheetDigest(BaseModel):
+    """Compact stand-in for a spreadsheet's full CSV export."""
+
+    rows: int
+    columns: list[ColumnSummary]
+    sample_row_numbers: list[int]
+    sample_rows: list[list[str]]
+
+
+class SlideChunk(BaseModel):
+    """One slide of a presentation, addressable by its object ID."""
+
+    id: str
+    index: int
+    title: str = ""
+    text: str = ""
+    notes: str = ""
+
+
+class SlideDeck(BaseModel):
+    """Slide chunks of one presentation revision."""
+
+    file_id: str
+    revision: str | None = None
+    total_slides: int
+    slides: list[SlideChunk]
+
+
 class FileContent(BaseModel):
     """File content model."""
 
     metadata: dict
     content: str | bytes
+    revision: str | None = None
+    # "identity", or "gzip+base64" when the caller accepted compression
+    encoding: str = "identity"
+    # Set when a spreadsheet digest was returned instead of the full CSV
+    digest: SheetDigest | None = None
+    # Set when a presentation was read slide by slide
+    slides: list[SlideChunk] | None = None
+
+
+class SheetRows(BaseModel):
+    """A slice of a spreadsheet's data rows."""
+
+    header: list[str]
+    rows: list[list[str]]
+    offset: int
+    total_rows: int
+    revision: str | None = None
+
+
+class FileNotModified(BaseModel):
+    """Returned instead of content when the caller's revision is current."""
+
+    metadata: dict
+    revision: str | None = None
+    not_modified: bool = True
+
+
+class DriveFileMetadata(BaseModel):
+    """Metadata kept in the local Drive mirror."""
+
+    id: str
+    name: str
+    mime_type: str
+    modified_time: str | None = None
+    size: int | None = None
+    parents: list[str] = []
+    web_view_link: str | None = None
+
+
+class FileListPage(BaseModel):
+    """One page of a full Drive listing."""
+
+    files: list[DriveFileMetadata]
+    next_page_token: str | None = None
+
+
+class DriveChange(BaseModel):
+    """A single entry from the Drive changes feed."""
+
+    file_id: str
+    removed: bool = False
+    file: DriveFileMetadata | None = None
+
+
+class ChangesPage(BaseModel):
+    """One page of the Drive changes feed."""
+
+    changes: list[DriveChange] = []
+    next_page_token: str | None = None
+    new_start_page_token: str | None = None
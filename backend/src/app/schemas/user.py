@@ -78,6 +78,13 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class TokenRefresh(BaseModel):
+    """Schema for exchanging a refresh token."""
+
+    refresh_token: str
 
 
 class RedirectResponseSchema(BaseModel):
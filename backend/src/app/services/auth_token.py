@@ -1,26 +1,90 @@
-from datetime import UTC, datetime
+"""
+AuthToken service.
+
+Stores users' Google OAuth tokens and keeps the access tokens fresh. A
+background task refreshes tokens shortly before they expire, so requests
+rarely pay for a refresh inline. Refreshes are single-flight per user:
+whoever waited on the user's lock re-reads the token and skips the refresh
+another caller already made. Tokens expired for longer than
+``oauth_refresh_grace_seconds`` are left to be refreshed on next use, and a
+refresh token Google rejects is marked revoked so it is not retried until
+the user signs in with Google again.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.credentials import credential_cache, token_version
+from app.core.database import session_scope
 from app.core.encrypt import decrypt_key, encrypt_key
-from app.core.google_auth import refresh_credentials
+from app.core.google_auth import RefreshRevokedError, refresh_credentials
+from app.core.metrics import metrics
+from app.core.settings import settings
 from app.models.auth_token import AuthToken
+from app.models.user import User
 from app.repository.auth_token import AuthTokenRepository
 from app.repository.user import UserRepository
+from app.services.user import UserService
+
+logger = logging.getLogger(__name__)
+
+token_refreshes = metrics.counter(
+    "oauth_token_refreshes_total",
+    "Google token refreshes by trigger (inline or background) and outcome",
+)
+
+_refresh_locks: weakref.WeakValueDictionary[int, threading.Lock] = (
+    weakref.WeakValueDictionary()
+)
+_refresh_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _refresh_lock(user_id: int) -> Iterator[None]:
+    """Hold the user's refresh lock; it is dropped once nobody holds it."""
+    with _refresh_locks_guard:
+        lock = _refresh_locks.get(user_id)
+        if lock is None:
+            lock = threading.Lock()
+            _refresh_locks[user_id] = lock
+    with lock:
+        yield
+
+
+def _expiry(token: AuthToken) -> datetime:
+    return datetime.fromisoformat(token.expiry).replace(tzinfo=UTC)  # pyright: ignore[reportArgumentType]
 
 
 class AuthTokenService:
     @staticmethod
-    def get_auth_token(db: Session, user_id: int) -> AuthToken | None:
+    def get_user_with_token(db: Session, user_id: int) -> tuple[User, AuthToken]:
         """
-        Get OAuth2 tokens for a user.
+        Get a user together with their decrypted OAuth2 tokens.
+
+        The user and the stored tokens come from one joined query, and the
+        decrypted tokens from the credential cache when possible, so a
+        request needing both pays for a single lookup.
 
         Args:
             db: Database session
             user_id: User ID
+
+        Raises:
+            HTTPException: If the user is not found or has no stored tokens
+
+        Returns:
+            tuple[User, AuthToken]: The user and a detached ``AuthToken``
+                holding the decrypted tokens
         """
-        user = UserRepository.get_by_id(db, user_id)
+        user = UserRepository.get_with_auth_token(db, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -31,23 +95,146 @@ class AuthTokenService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User has no stored tokens",
             )
-        expiry = datetime.fromisoformat(user.auth_token.expiry)
-        expiry = expiry.replace(tzinfo=UTC)
-
-        if expiry and expiry < datetime.now(UTC):
-            new_creds = refresh_credentials(decrypt_key(user.auth_token.refresh_token))  # pyright: ignore[reportAttributeAccessIssue]
-            AuthTokenService.update_auth_token(db, user_id, new_creds)
-            user = UserRepository.get_by_id(db, user_id)
-            return user.auth_token  # pyright: ignore[reportOptionalMemberAccess]
-        return AuthToken(
-            id=user.auth_token.id,
-            access_token=decrypt_key(user.auth_token.access_token),
-            refresh_token=decrypt_key(user.auth_token.refresh_token),
-            expiry=user.auth_token.expiry,
-            email=user.auth_token.email,
-            user_id=user.auth_token.user_id,
+        if _expiry(user.auth_token) < datetime.now(UTC):
+            # The background refresher missed this one (or is disabled)
+            AuthTokenService.refresh_auth_token(db, user_id, trigger="inline")
+            db.refresh(user)
+
+        stored = user.auth_token
+        version = token_version(stored.access_token, stored.refresh_token)
+        tokens = credential_cache.get(user_id, version)
+        if tokens is None:
+            tokens = (
+                decrypt_key(stored.access_token),
+                decrypt_key(stored.refresh_token),
+            )
+            credential_cache.put(user_id, *tokens, version=version)
+        return user, AuthToken(
+            id=stored.id,
+            access_token=tokens[0],
+            refresh_token=tokens[1],
+            expiry=stored.expiry,
+            email=stored.email,
+            user_id=stored.user_id,
+        )
+
+    @staticmethod
+    def get_auth_token(db: Session, user_id: int) -> AuthToken | None:
+        """
+        Get OAuth2 tokens for a user.
+
+        Args:
+            db: Database session
+            user_id: User ID
+        """
+        return AuthTokenService.get_user_with_token(db, user_id)[1]
+
+    @staticmethod
+    def refresh_auth_token(
+        db: Session,
+        user_id: int,
+        ahead_seconds: float = 0.0,
+        trigger: str = "inline",
+    ) -> bool:
+        """
+        Refresh a user's access token if it expires within ``ahead_seconds``.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            ahead_seconds: Refresh tokens expiring this soon, not only expired ones
+            trigger: ``inline`` or ``background``, used to label metrics
+
+        Raises:
+            HTTPException: 401 if Google revoked the refresh token
+
+        Returns:
+            bool: True if the token was refreshed, False if it was still fresh
+        """
+        with _refresh_lock(user_id):
+            token = AuthTokenRepository.get_by_user_id(db, user_id)
+            if token is None:
+                return False
+            # Pick up a refresh committed while we waited for the lock
+            db.refresh(token)
+            deadline = datetime.now(UTC) + timedelta(seconds=ahead_seconds)
+            if _expiry(token) > deadline:
+                token_refreshes.inc(trigger=trigger, outcome="skipped")
+                return False
+            if token.refresh_revoked_at is not None:
+                token_refreshes.inc(trigger=trigger, outcome="revoked")
+                raise AuthTokenService._revoked()
+            try:
+                new_creds = refresh_credentials(decrypt_key(token.refresh_token))  # pyright: ignore[reportArgumentType]
+                AuthTokenService.update_auth_token(db, user_id, new_creds)
+            except RefreshRevokedError as e:
+                AuthTokenRepository.mark_revoked(db, token)
+                token_refreshes.inc(trigger=trigger, outcome="revoked")
+                raise AuthTokenService._revoked() from e
+            except Exception:
+                token_refreshes.inc(trigger=trigger, outcome="error")
+                raise
+            token_refreshes.inc(trigger=trigger, outcome="ok")
+            return True
+
+    @staticmethod
+    def _revoked() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Google access was revoked. Sign in with Google again.",
         )
 
+    @staticmethod
+    def refresh_expiring(db: Session) -> int:
+        """
+        Refresh every stored token expiring within ``oauth_refresh_ahead_seconds``.
+
+        Tokens expired longer than ``oauth_refresh_grace_seconds`` and tokens
+        whose refresh was revoked are skipped. A failure for one user is
+        logged and does not stop the others.
+
+        Args:
+            db: Database session
+
+        Returns:
+            int: Number of tokens refreshed
+        """
+        ahead = settings.oauth_refresh_ahead_seconds
+        now = datetime.now(UTC)
+        user_ids = AuthTokenRepository.get_user_ids_expiring_between(
+            db,
+            now - timedelta(seconds=settings.oauth_refresh_grace_seconds),
+            now + timedelta(seconds=ahead),
+        )
+        refreshed = 0
+        for user_id in user_ids:
+            try:
+                refreshed += AuthTokenService.refresh_auth_token(
+                    db,
+                    user_id,
+                    ahead_seconds=ahead,
+                    trigger="background",
+                )
+            except Exception:  # noqa: BLE001
+                db.rollback()
+                logger.warning("Refreshing Google token failed for user %s", user_id)
+        return refreshed
+
+    @staticmethod
+    async def run_refresher() -> None:
+        """Refresh expiring tokens every ``oauth_refresh_interval_seconds``."""
+
+        def refresh_pass() -> int:
+            with session_scope() as db:
+                return AuthTokenService.refresh_expiring(db)
+
+        while True:
+            try:
+                await asyncio.to_thread(refresh_pass)
+            except Exception:
+                logger.exception("Google token refresher pass failed")
+            await asyncio.sleep(settings.oauth_refresh_interval_seconds)
+
     @staticmethod
     def update_auth_token(db: Session, user_id: int, creds: dict) -> AuthToken | None:
         """
@@ -92,8 +279,12 @@ class AuthTokenService:
         }
 
         if existing:
-            return AuthTokenRepository.update(db, existing, auth_data)
-        return AuthTokenRepository.create(db, auth_data)
+            token = AuthTokenRepository.update(db, existing, auth_data)
+        else:
+            token = AuthTokenRepository.create(db, auth_data)
+        UserService.forget_principal(user.email)  # pyright: ignore[reportArgumentType]
+        credential_cache.invalidate(user_id)
+        return token
 
     @staticmethod
     def create_auth_token(
@@ -124,5 +315,9 @@ class AuthTokenService:
         }
         existing = AuthTokenRepository.get_by_user_id(db, user_id)
         if existing:
-            return AuthTokenRepository.update(db, existing, auth_data)
-        return AuthTokenRepository.create(db, auth_data)
+            token = AuthTokenRepository.update(db, existing, auth_data)
+        else:
+            token = AuthTokenRepository.create(db, auth_data)
+        UserService.forget_principal(user.email)  # pyright: ignore[reportArgumentType]
+        credential_cache.invalidate(user_id)
+        return token
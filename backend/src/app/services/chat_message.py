@@ -2,7 +2,9 @@ from http.client import HTTPException
 
 from sqlalchemy.orm import Session
 
+import app.services.file_chunk as file_chunk_service
 from app.core.gemini import generate_ai_response_with_mcp
+from app.core.settings import settings
 from app.models.chat_message import ChatMessage
 from app.repository.chat_message import ChatMessageRepository
 from app.repository.file import FileRepository
@@ -206,12 +208,26 @@ async def ai_generate_response_gemini(
         for message in messages
     ]
 
+    message = messages[-1].message if messages else "Hello"  # Last user message
+
+    # Course material comes from the chunk store, re-checked against Drive
+    # every file_recheck_seconds; unreadable files are noted in the context
+    failures = await file_chunk_service.refresh_course_files(db, files, user_id)
+    files_content = file_chunk_service.build_course_context(
+        db,
+        files,
+        message,  # pyright: ignore[reportArgumentType]
+        settings.chat_context_tokens,
+        failures=failures,
+    )
+
     # Call Gemini with MCP tools
     response_text = await generate_ai_response_with_mcp(
-        message=messages[-1].message if messages else "Hello",  # Last user message
+        message=message,  # pyright: ignore[reportArgumentType]
         chat_history=chat_history,
         file_list=file_ids,
         user_id=user_id,
+        files_content=files_content,
     )
 
     new_chat_message = ChatMessageCreate(
@@ -0,0 +1,361 @@
+"""
+Drive Mirror Service
+--------------------
+Keeps a local copy of each user's Drive file metadata so file pickers and
+typeahead are answered from the database instead of MCP and ``files.list``.
+
+The mirror is filled by a paginated crawl and then kept fresh from the Drive
+changes feed. Both run as background tasks. A changes cursor Drive no longer
+accepts (expired or invalidated) falls back to a full crawl.
+"""
+
+import json
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from fastapi import BackgroundTasks, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.cache import SingleFlight
+from app.core.database import session_scope
+from app.core.mcp_client import mcp_pool, tool_data
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.models.drive_file import DriveFile
+from app.repository.drive_file import DriveFileRepository
+from app.repository.drive_sync_state import DriveSyncStateRepository
+from app.schemas.google_drive import DriveFileResponse
+from app.schemas.mcp import DriveFileMetadata, FileResult
+from app.services.google_drive import GoogleDriveService
+
+logger = logging.getLogger(__name__)
+
+mirror_syncs = metrics.counter(
+    "drive_mirror_syncs_total",
+    "Drive mirror syncs by kind (full or changes) and outcome",
+)
+mirror_lookup_latency = metrics.histogram(
+    "drive_mirror_lookup_seconds",
+    "Time to answer a file list or typeahead query from the local mirror",
+)
+# Only one crawl/changes sync per user at a time
+mirror_sync_flight: SingleFlight[int, None] = SingleFlight("drive_mirror_sync")
+# Marks search page tokens issued by the mirror rather than by Drive
+MIRROR_PAGE_PREFIX = "mirror:"
+
+
+class StaleChangesTokenError(Exception):
+    """Raised when Drive rejects the stored changes page token."""
+
+
+async def _call_tool(tool: str, arguments: dict) -> dict:
+    async with mcp_pool.session() as client:
+        result = await client.call_tool(tool, arguments)
+    parsed = tool_data(result)
+    if parsed.get("reason") == "invalid_page_token":
+        raise StaleChangesTokenError(parsed["error"])
+    if "error" in parsed:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Drive sync failed: {parsed['error']}",
+        )
+    return parsed
+
+
+def _to_response(row: DriveFile) -> DriveFileResponse:
+    return DriveFileResponse(
+        id=row.drive_id,  # pyright: ignore[reportArgumentType]
+        name=row.name,  # pyright: ignore[reportArgumentType]
+        mime_type=row.mime_type,  # pyright: ignore[reportArgumentType]
+        web_view_link=row.web_view_link,  # pyright: ignore[reportArgumentType]
+        modified_time=row.modified_time,  # pyright: ignore[reportArgumentType]
+        size=row.size,  # pyright: ignore[reportArgumentType]
+        parents=json.loads(row.parents),  # pyright: ignore[reportArgumentType]
+    )
+
+
+def _to_result(row: DriveFile) -> dict:
+    # Same shape as the live Drive search results
+    return FileResult(
+        id=row.drive_id,  # pyright: ignore[reportArgumentType]
+        name=row.name,  # pyright: ignore[reportArgumentType]
+        mime_type=row.mime_type,  # pyright: ignore[reportArgumentType]
+        web_view_link=row.web_view_link or "",  # pyright: ignore[reportArgumentType]
+    ).model_dump()
+
+
+class DriveMirrorService:
+    """Service layer for the local Drive metadata mirror."""
+
+    @staticmethod
+    async def crawl(db: Session, user_id: int) -> None:
+        """
+        Rebuild a user's mirror from a full paginated Drive listing.
+
+        The changes cursor is taken before the crawl starts, so edits made
+        while it runs are picked up by the next changes sync. Database writes
+        run in the thread pool so large pages do not block the event loop.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+        """
+        start = await _call_tool("gdrive_list_changes", {"user_id": user_id})
+        seen: set[str] = set()
+        page_token = None
+        while True:
+            page = await _call_tool(
+                "gdrive_list_files",
+                {
+                    "user_id": user_id,
+                    "page_token": page_token,
+                    "page_size": settings.drive_mirror_page_size,
+                },
+            )
+            files = [DriveFileMetadata(**f) for f in page["files"]]
+            await run_in_threadpool(DriveFileRepository.upsert_many, db, user_id, files)
+            seen.update(f.id for f in files)
+            page_token = page.get("next_page_token")
+            if not page_token:
+                break
+
+        known = await run_in_threadpool(DriveFileRepository.get_drive_ids, db, user_id)
+        await run_in_threadpool(
+            DriveFileRepository.delete_many,
+            db,
+            user_id,
+            list(known - seen),
+        )
+        await run_in_threadpool(
+            DriveSyncStateRepository.save,
+            db,
+            user_id,
+            start.get("new_start_page_token"),
+            datetime.now(UTC),
+            full_sync=True,
+        )
+        # Live search pages cached before the crawl may list stale files
+        GoogleDriveService.invalidate_search_cache(user_id)
+
+    @staticmethod
+    async def sync_changes(db: Session, user_id: int) -> None:
+        """
+        Apply Drive changes since the last sync.
+
+        Crawls instead when the mirror was never synced or Drive rejects the
+        stored changes token.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+        """
+        state = await run_in_threadpool(
+            DriveSyncStateRepository.get_by_user_id,
+            db,
+            user_id,
+        )
+        if state is None or not state.changes_page_token:
+            await DriveMirrorService.crawl(db, user_id)
+            mirror_syncs.inc(kind="full", outcome="ok")
+            return
+
+        try:
+            await DriveMirrorService._apply_changes(
+                db,
+                user_id,
+                state.changes_page_token,  # pyright: ignore[reportArgumentType]
+            )
+        except StaleChangesTokenError:
+            mirror_syncs.inc(kind="changes", outcome="stale_token")
+            logger.info("Drive changes token expired for user %s, recrawling", user_id)
+            await DriveMirrorService.crawl(db, user_id)
+            mirror_syncs.inc(kind="full", outcome="ok")
+            return
+        mirror_syncs.inc(kind="changes", outcome="ok")
+
+    @staticmethod
+    async def _apply_changes(db: Session, user_id: int, start_token: str) -> None:
+        page_token = start_token
+        new_start = None
+        while page_token:
+            page = await _call_tool(
+                "gdrive_list_changes",
+                {"user_id": user_id, "page_token": page_token},
+            )
+            changes = page.get("changes", [])
+            await run_in_threadpool(
+                DriveFileRepository.upsert_many,
+                db,
+                user_id,
+                [
+                    DriveFileMetadata(**c["file"])
+                    for c in changes
+                    if not c["removed"] and c.get("file")
+                ],
+            )
+            await run_in_threadpool(
+                DriveFileRepository.delete_many,
+                db,
+                user_id,
+                [c["file_id"] for c in changes if c["removed"]],
+            )
+            new_start = page.get("new_start_page_token") or new_start
+            page_token = page.get("next_page_token")
+
+        await run_in_threadpool(
+            DriveSyncStateRepository.save,
+            db,
+            user_id,
+            new_start or start_token,
+            datetime.now(UTC),
+        )
+        GoogleDriveService.invalidate_search_cache(user_id)
+
+    @staticmethod
+    async def refresh(user_id: int) -> None:
+        """Background entry point: sync a user's mirror with its own session."""
+
+        async def run() -> None:
+            with session_scope() as db:
+                await DriveMirrorService.sync_changes(db, user_id)
+
+        try:
+            await mirror_sync_flight.do(user_id, run)
+        except Exception:  # noqa: BLE001
+            mirror_syncs.inc(kind="background", outcome="error")
+            logger.warning("Drive mirror sync failed for user %s", user_id)
+
+    @staticmethod
+    def is_ready(
+        db: Session,
+        user_id: int,
+        background_tasks: BackgroundTasks,
+    ) -> bool:
+        """
+        Tell whether the user's mirror can serve lookups.
+
+        Schedules a first crawl when there is no mirror yet, and a changes
+        sync when the last one is older than ``drive_mirror_refresh_seconds``.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            background_tasks: Request background tasks used to schedule syncs
+        """
+        state = DriveSyncStateRepository.get_by_user_id(db, user_id)
+        if state is None or state.last_synced is None:
+            background_tasks.add_task(DriveMirrorService.refresh, user_id)
+            return False
+        last_synced = state.last_synced.replace(tzinfo=UTC)  # pyright: ignore[reportAttributeAccessIssue]
+        max_age = timedelta(seconds=settings.drive_mirror_refresh_seconds)
+        if datetime.now(UTC) - last_synced > max_age:
+            background_tasks.add_task(DriveMirrorService.refresh, user_id)
+        return True
+
+    @staticmethod
+    def list_files(db: Session, user_id: int) -> list[dict]:
+        """
+        Get every mirrored file for a user, shaped like live search results.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+        """
+        start = time.perf_counter()
+        rows = DriveFileRepository.get_all(db, user_id)
+        mirror_lookup_latency.observe(time.perf_counter() - start, kind="list")
+        return [_to_result(row) for row in rows]
+
+    @staticmethod
+    def is_page_token(page_token: str) -> bool:
+        """Tell whether a search page token was issued by the mirror."""
+        return page_token.startswith(MIRROR_PAGE_PREFIX)
+
+    @staticmethod
+    def search_page(
+        db: Session,
+        user_id: int,
+        text: str,
+        page_token: str | None = None,
+        page_size: int = 10,
+    ) -> dict:
+        """
+        Search mirrored file names one page at a time.
+
+        Pages are cut from the typeahead ordering, so the files and the
+        ``next_page_token`` match what a live Drive search returns.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            text: Text to look for in file names
+            page_token: Token returned with the previous page, if any
+            page_size: Files per page
+
+        Returns:
+            dict: ``files`` and the ``next_page_token`` (None on the last page)
+        """
+        offset = 0
+        if page_token is not None:
+            position = page_token.removeprefix(MIRROR_PAGE_PREFIX)
+            if not position.isdigit():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid page token",
+                )
+            offset = int(position)
+        start = time.perf_counter()
+        rows = DriveMirrorService._match(db, user_id, text, offset + page_size + 1)
+        mirror_lookup_latency.observe(time.perf_counter() - start, kind="search")
+        end = offset + page_size
+        return {
+            "files": [_to_result(row) for row in rows[offset:end]],
+            "next_page_token": (
+                f"{MIRROR_PAGE_PREFIX}{end}" if len(rows) > end else None
+            ),
+        }
+
+    @staticmethod
+    def typeahead(
+        db: Session,
+        user_id: int,
+        text: str,
+        limit: int = 20,
+    ) -> list[DriveFileResponse]:
+        """
+        Find mirrored files by name, prefix matches first.
+
+        Args:
+            db: Database session
+            user_id: Owner of the Drive
+            text: What the user has typed so far
+            limit: Maximum number of files
+
+        Returns:
+            list[DriveFileResponse]: Prefix matches followed by other names
+            containing ``text``
+        """
+        start = time.perf_counter()
+        rows = DriveMirrorService._match(db, user_id, text, limit)
+        mirror_lookup_latency.observe(time.perf_counter() - start, kind="typeahead")
+        return [_to_response(row) for row in rows]
+
+    @staticmethod
+    def _match(db: Session, user_id: int, text: str, limit: int) -> list[DriveFile]:
+        needle = text.strip().lower()
+        rows = DriveFileRepository.search_prefix(db, user_id, needle, limit)
+        if len(rows) < limit:
+            seen = {row.id for row in rows}
+            rows += [
+                row
+                for row in DriveFileRepository.search_substring(
+                    db,
+                    user_id,
+                    needle,
+                    limit,
+                )
+                if row.id not in seen
+            ][: limit - len(rows)]
+        return rows
@@ -0,0 +1,326 @@
+"""
+File Chunk Service
+------------------
+Keeps a chunked copy of every course file's text in the database so prompt
+building, search and summaries read course material without going to Drive.
+
+Ingesting a file is a conditional read against the stored revision: an
+unchanged file costs one metadata call, and a new revision only rewrites the
+chunks whose content hash changed. Tutor turns re-check each course file at
+most once per ``file_recheck_seconds``, so edits made in Drive reach the
+prompt without reading every file on every turn.
+"""
+
+import asyncio
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.chunking import chunk_text
+from app.core.database import session_scope
+from app.core.metrics import metrics
+from app.core.retrieval import terms
+from app.core.segments import chunk_store
+from app.core.settings import settings
+from app.models.file import File
+from app.models.file_chunk import FileChunk
+from app.repository.file import FileRepository
+from app.repository.file_chunk import FileChunkRepository
+from app.schemas.file import FileChunkResponse, FileIngestResponse
+from app.services.file import get_file_by_id
+from app.services.google_drive import GoogleDriveService
+
+logger = logging.getLogger(__name__)
+
+file_ingests = metrics.counter(
+    "file_ingests_total",
+    "Course file ingests by outcome (ingested, not_modified or error)",
+)
+chunk_writes = metrics.counter(
+    "file_chunks_written_total",
+    "Stored course file chunks kept, inserted or deleted by ingests",
+)
+
+# Outcome of each file's last revision check by file ID: "" when its chunks
+# are current, otherwise why Drive could not be read
+file_checks: TTLCache[int, str] = TTLCache(
+    "file_revision_checks",
+    ttl=settings.file_recheck_seconds,
+    max_entries=settings.file_recheck_cache_size,
+)
+
+
+async def _read(file: File, user_id: int) -> dict:
+    return await GoogleDriveService.read_file(
+        user_id,
+        file.google_drive_id,  # pyright: ignore[reportArgumentType]
+        if_none_match=file.revision,  # pyright: ignore[reportArgumentType]
+        # Prompts want the digest of large sheets and decks split by slide
+        sheet_digest=True,
+        slide_chunks=True,
+    )
+
+
+def _failure(file: File, error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return f"Reading {file.name} from Drive failed: {error}"
+
+
+def _store(db: Session, file: File, parsed: dict) -> FileIngestResponse:
+    if parsed.get("error"):
+        file_ingests.inc(outcome="error")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Reading {file.name} from Drive failed: {parsed['error']}",
+        )
+    if parsed["not_modified"]:
+        file_ingests.inc(outcome="not_modified")
+        return FileIngestResponse(revision=file.revision, not_modified=True)  # pyright: ignore[reportArgumentType]
+
+    chunks = chunk_text(
+        parsed["content"],
+        settings.chunk_min_tokens,
+        settings.chunk_max_tokens,
+    )
+    counts = FileChunkRepository.replace(db, file, chunks, parsed["revision"])
+    for op, count in counts.items():
+        chunk_writes.inc(count, op=op)
+    file_ingests.inc(outcome="ingested")
+    return FileIngestResponse(revision=parsed["revision"], **counts)
+
+
+async def ingest_file(db: Session, file: File, user_id: int) -> FileIngestResponse:
+    """
+    Bring a file's stored chunks up to date with its Drive revision.
+
+    Args:
+        db: database session
+        file: course file to ingest
+        user_id: id of the user whose Drive holds the file
+
+    Returns:
+        FileIngestResponse: Revision stored and chunks kept, inserted and deleted
+    """
+    result = _store(db, file, await _read(file, user_id))
+    file_checks.set(file.id, "")  # pyright: ignore[reportArgumentType]
+    return result
+
+
+async def ingest_files(db: Session, files: list[File], user_id: int) -> None:
+    """
+    Ingest several files, reading them from Drive concurrently.
+
+    A file that cannot be read keeps its previously stored chunks; the
+    reason is remembered in ``file_checks``.
+
+    Args:
+        db: database session
+        files: course files to ingest
+        user_id: id of the user whose Drive holds the files
+    """
+    reads = await asyncio.gather(
+        *(_read(file, user_id) for file in files),
+        return_exceptions=True,
+    )
+    for file, parsed in zip(files, reads, strict=True):
+        try:
+            if isinstance(parsed, BaseException):
+                raise parsed  # noqa: TRY301
+            _store(db, file, parsed)
+        except Exception as e:
+            logger.exception("Ingesting file %s failed", file.id)
+            file_checks.set(file.id, _failure(file, e))  # pyright: ignore[reportArgumentType]
+        else:
+            file_checks.set(file.id, "")  # pyright: ignore[reportArgumentType]
+
+
+async def refresh_course_files(
+    db: Session,
+    files: list[File],
+    user_id: int,
+) -> dict[int, str]:
+    """
+    Bring course files up to date before building a tutor prompt.
+
+    Only files not checked in the last ``file_recheck_seconds`` are read,
+    with the stored revision as a conditional read; a file that failed is
+    retried once that time has passed.
+
+    Args:
+        db: database session
+        files: course files
+        user_id: id of the user whose Drive holds the files
+
+    Returns:
+        dict[int, str]: Why each file that could not be read failed, by file ID
+    """
+    due = [file for file in files if file_checks.get(file.id) is None]  # pyright: ignore[reportArgumentType]
+    if due:
+        await ingest_files(db, due, user_id)
+    failures = {}
+    for file in files:
+        error = file_checks.get(file.id)  # pyright: ignore[reportArgumentType]
+        if error:
+            failures[file.id] = error
+    return failures
+
+
+async def ingest_file_in_background(file_id: int, user_id: int) -> None:
+    """Ingest a newly added file after the request that added it has returned."""
+    with session_scope() as db:
+        file = FileRepository.get_file_by_id(db, file_id, user_id)
+        if file is not None:
+            await ingest_files(db, [file], user_id)
+
+
+async def ingest_file_by_id(
+    db: Session,
+    file_id: int,
+    user_id: int,
+) -> FileIngestResponse:
+    """
+    Re-ingest a file of the user by ID.
+
+    Args:
+        db: database session
+        file_id: id of the file to ingest
+        user_id: id of the user
+
+    Returns:
+        FileIngestResponse: Revision stored and chunks kept, inserted and deleted
+    """
+    file = get_file_by_id(db, file_id, user_id)
+    return await ingest_file(db, file, user_id)
+
+
+def get_file_chunks(db: Session, file_id: int, user_id: int) -> list[FileChunkResponse]:
+    """
+    Get the stored chunks of a file.
+
+    Args:
+        db: database session
+        file_id: id of the file
+        user_id: id of the user
+
+    Returns:
+        list[FileChunkResponse]: The file's chunks in order
+    """
+    file = get_file_by_id(db, file_id, user_id)
+    return [
+        FileChunkResponse(
+            position=chunk.position,  # pyright: ignore[reportArgumentType]
+            start_offset=chunk.start_offset,  # pyright: ignore[reportArgumentType]
+            end_offset=chunk.end_offset,  # pyright: ignore[reportArgumentType]
+            text=FileChunkRepository.get_text(chunk),
+            content_hash=chunk.content_hash,  # pyright: ignore[reportArgumentType]
+            token_count=chunk.token_count,  # pyright: ignore[reportArgumentType]
+        )
+        for chunk in FileChunkRepository.get_by_file(db, file.id)  # pyright: ignore[reportArgumentType]
+    ]
+
+
+def _render(chunks: list[FileChunk], total: int) -> str:
+    parts = []
+    previous = None
+    for chunk in chunks:
+        if previous is not None and chunk.position != previous + 1:
+            parts.append("[...]")
+        parts.append(FileChunkRepository.get_text(chunk))
+        previous = chunk.position
+    text = "\n\n".join(parts)  # pyright: ignore[reportCallIssue, reportArgumentType]
+    if len(chunks) < total:
+        text = f"(Excerpt: {len(chunks)} of {total} sections)\n{text}"
+    return text
+
+
+def build_course_context(
+    db: Session,
+    files: list[File],
+    query: str,
+    budget_tokens: int,
+    failures: dict[int, str] | None = None,
+) -> dict[str, str]:
+    """
+    Pick stored course material for a tutor prompt.
+
+    Chunks are ranked by how many distinct terms of ``query`` they contain
+    and taken best first until ``budget_tokens`` is spent; without any match
+    the opening chunks of each file are used. Each file's selection is
+    rendered in document order.
+
+    Args:
+        db: database session
+        files: course files to draw from
+        query: the student's message
+        budget_tokens: estimated tokens of material to include
+        failures: Why files could not be read from Drive, by file ID; noted
+            in the context so the tutor knows material may be stale or missing
+
+    Returns:
+        dict[str, str]: Google Drive file ID to selected text, for files with
+            stored chunks or a failed read
+    """
+    by_id = {file.id: file for file in files}
+    chunks = FileChunkRepository.get_by_files(db, list(by_id))  # pyright: ignore[reportArgumentType]
+    wanted = terms(query)
+    ranked = sorted(
+        chunks,
+        # Text is decoded from the shared map only while it is scored
+        key=lambda c: (
+            -len(wanted & terms(FileChunkRepository.get_text(c))),
+            c.position,
+            c.file_id,
+        ),  # pyright: ignore[reportArgumentType]
+    )
+
+    selected: dict[int, list[FileChunk]] = {}
+    totals: dict[int, int] = {}
+    spent = 0
+    for chunk in chunks:
+        totals[chunk.file_id] = totals.get(chunk.file_id, 0) + 1  # pyright: ignore[reportArgumentType]
+    for chunk in ranked:
+        if spent + chunk.token_count > budget_tokens:  # pyright: ignore[reportOperatorIssue]
+            continue
+        selected.setdefault(chunk.file_id, []).append(chunk)  # pyright: ignore[reportArgumentType]
+        spent += chunk.token_count  # pyright: ignore[reportOperatorIssue]
+
+    context = {
+        by_id[file_id].google_drive_id: _render(  # pyright: ignore[reportArgumentType]
+            sorted(picked, key=lambda c: c.position),  # pyright: ignore[reportArgumentType]
+            totals[file_id],
+        )
+        for file_id, picked in selected.items()
+    }
+    for file_id, error in (failures or {}).items():
+        drive_id: str = by_id[file_id].google_drive_id  # pyright: ignore[reportAssignmentType]
+        if drive_id in context:
+            context[drive_id] = (
+                f"({error}; this is the last stored copy)\n{context[drive_id]}"
+            )
+        elif file_id not in totals:
+            context[drive_id] = f"({error}; its content is not available)"
+    return context
+
+
+def compact_chunk_store() -> dict[str, int] | None:
+    """
+    Drop text of old revisions from the chunk store once enough is unused.
+
+    Returns:
+        dict[str, int] | None: Compaction counts, or None if the share of
+            unreferenced text is below ``chunk_store_compact_ratio``
+    """
+    with session_scope() as db:
+        live = FileChunkRepository.get_live_hashes(db)
+    used, total = chunk_store.usage(live)
+    if not total or (total - used) / total < settings.chunk_store_compact_ratio:
+        return None
+    result = chunk_store.compact(
+        live,
+        grace_seconds=settings.chunk_store_compact_grace_seconds,
+    )
+    logger.info("Compacted chunk store: %s", result)
+    return result
@@ -4,21 +4,71 @@ Google Drive Service
 Handles business logic for Google Drive operations via MCP.
 """
 
-import json
-
-from fastmcp import Client
-
+from app.core.cache import SingleFlight, TTLCache
+from app.core.mcp_client import accepted_encoding, mcp_pool, tool_data
 from app.core.settings import settings
 
-
-def get_mcp_client() -> Client:
-    """Return a configured FastMCP client instance."""
-    return Client(settings.mcp_server)
+# Keystroke-driven searches repeat the same query within seconds, so results
+# are cached per user for a short TTL and identical in-flight calls coalesce.
+search_cache: TTLCache[tuple, dict] = TTLCache(
+    "drive_search",
+    ttl=settings.drive_search_cache_ttl_seconds,
+    max_entries=settings.drive_search_cache_size,
+)
+search_flight: SingleFlight[tuple, dict] = SingleFlight("drive_search")
 
 
 class GoogleDriveService:
     """Service layer for Google Drive MCP operations."""
 
+    @staticmethod
+    async def search_page(
+        user_id: int,
+        query: str = "",
+        page_token: str | None = None,
+        page_size: int = 10,
+    ) -> dict:
+        """
+        Fetch one page of Drive search results for a given user.
+
+        Args:
+            user_id: The user ID whose Drive to search.
+            query: The text to search for in Drive.
+            page_token: Cursor returned as ``next_page_token`` by the previous page.
+            page_size: Number of files per page.
+
+        Returns:
+            dict with ``files`` and ``next_page_token`` (None on the last page).
+        """
+        key = (user_id, query, page_token, page_size)
+        cached = search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def fetch() -> dict:
+            async with mcp_pool.session() as client:
+                result = await client.call_tool(
+                    "gdrive_search",
+                    {
+                        "query": query,
+                        "user_id": user_id,
+                        "page_size": page_size,
+                        "page_token": page_token,
+                    },
+                )
+
+            parsed = tool_data(result)
+            page = {
+                "files": parsed.get("files", []),
+                "next_page_token": parsed.get("next_page_token"),
+            }
+            # Errors are returned as {"error": ...}; never cache those
+            if "error" not in parsed:
+                search_cache.set(key, page)
+            return page
+
+        return await search_flight.do(key, fetch)
+
     @staticmethod
     async def search(
         user_id: int,
@@ -30,57 +80,126 @@ class GoogleDriveService:
         Args:
             user_id: The user ID whose Drive to search.
             query: The text to search for in Drive.
-            client: Optional MCP client; if not provided, one will be created.
 
         Returns:
             A parsed list of files.
         """
-        client = get_mcp_client()
-
-        async with client:
-            result = await client.call_tool(
-                "gdrive_search",
-                {"query": query, "user_id": user_id},
-            )
-
-            # Extract text and parse JSON
-            raw_text = result.content[0].text  # pyright: ignore[reportAttributeAccessIssue]
-            parsed = json.loads(raw_text)
-
-            return parsed.get("files", [])
+        page = await GoogleDriveService.search_page(user_id, query)
+        return page["files"]
 
     @staticmethod
     async def read_file(
         user_id: int,
         file_id: str,
+        if_none_match: str | None = None,
+        *,
+        sheet_digest: bool = False,
+        slide_chunks: bool = False,
     ) -> dict:
-        """Read and extract a files metadata and content."""
-        client = get_mcp_client()
+        """
+        Read and extract a files metadata and content.
 
-        async with client:
+        Args:
+            user_id: The user ID whose Drive to read.
+            file_id: Google Drive file ID.
+            if_none_match: Revision from an earlier read; if the file has not
+                changed the content is skipped and ``not_modified`` is True.
+            sheet_digest: For large Google Sheets, return a column summary
+                with sampled rows (also as ``digest``) instead of the full CSV.
+            slide_chunks: For Google Slides, read the deck slide by slide
+                (also as ``slides``) instead of the flat text export.
+
+        Returns:
+            dict with ``content``, ``revision``, ``not_modified``, ``digest``,
+            ``slides`` and ``error``.
+        """
+        async with mcp_pool.session() as client:
             result = await client.call_tool(
                 "gdrive_read_file",
-                {"file_id": file_id, "user_id": user_id},
+                {
+                    "file_id": file_id,
+                    "user_id": user_id,
+                    "if_none_match": if_none_match,
+                    "accept_encoding": accepted_encoding(),
+                    "sheet_digest": sheet_digest,
+                    "slide_chunks": slide_chunks,
+                },
             )
 
-            raw_text = result.content[0].text  # pyright: ignore[reportAttributeAccessIssue]
-            parsed = json.loads(raw_text)
+            parsed = tool_data(result)
 
             return {
                 "content": parsed.get("content", ""),
+                "revision": parsed.get("revision"),
+                "not_modified": parsed.get("not_modified", False),
+                "digest": parsed.get("digest"),
+                "slides": parsed.get("slides"),
+                "error": parsed.get("error"),
             }
 
     @staticmethod
-    async def search_all(user_id: int) -> list | dict:
-        client = get_mcp_client()
-        async with client:
+    async def read_sheet_rows(
+        user_id: int,
+        file_id: str,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Read a slice of a Google Sheet's data rows.
+
+        Args:
+            user_id: The user ID whose Drive to read.
+            file_id: Google Drive file ID of the sheet.
+            offset: Index of the first data row (0 is the row after the header).
+            limit: Maximum number of rows to return.
+
+        Returns:
+            dict with ``header``, ``rows``, ``offset``, ``total_rows`` and
+            ``revision``, or ``error``.
+        """
+        async with mcp_pool.session() as client:
             result = await client.call_tool(
-                "gdrive_search",
-                {"query": "", "user_id": user_id},
+                "gdrive_read_sheet_rows",
+                {
+                    "file_id": file_id,
+                    "user_id": user_id,
+                    "offset": offset,
+                    "limit": limit,
+                },
             )
+        return tool_data(result)
 
-            # Extract text and parse JSON
-            raw_text = result.content[0].text  # pyright: ignore[reportAttributeAccessIssue]
-            parsed = json.loads(raw_text)
+    @staticmethod
+    async def read_slides(
+        user_id: int,
+        file_id: str,
+        slide_ids: list[str] | None = None,
+    ) -> dict:
+        """
+        Read a Google Slides presentation as per-slide chunks.
+
+        Args:
+            user_id: The user ID whose Drive to read.
+            file_id: Google Drive file ID of the presentation.
+            slide_ids: Object IDs of the slides to return; all when None.
 
-            return parsed.get("files", [])
+        Returns:
+            dict with ``file_id``, ``revision``, ``total_slides`` and
+            ``slides``, or ``error``.
+        """
+        async with mcp_pool.session() as client:
+            result = await client.call_tool(
+                "gdrive_read_slides",
+                {"file_id": file_id, "user_id": user_id, "slide_ids": slide_ids},
+            )
+        return tool_data(result)
+
+    @staticmethod
+    async def search_all(user_id: int) -> list | dict:
+        page = await GoogleDriveService.search_page(user_id)
+        return page["files"]
+
+    @staticmethod
+    def invalidate_search_cache(user_id: int) -> None:
+        """Drop every cached search page for a user."""
+        search_cache.pop_matching(lambda key: key[0] == user_id)
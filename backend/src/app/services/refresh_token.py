@@ -0,0 +1,122 @@
+"""
+Refresh token service.
+
+Access tokens are short-lived; instead of signing in again with a password,
+which costs a full Argon2 verification, clients exchange a refresh token for
+a new access token. Refresh tokens are single use: every exchange rotates
+the token, and presenting one that was already exchanged revokes every
+token rotated from the same login (its family), since one of the two holders
+has a stolen copy. The user's other sessions are unaffected; access tokens
+already issued to the family stay valid until they expire, which
+``access_token_expire_minutes`` keeps short.
+"""
+
+import logging
+import secrets
+from datetime import UTC, datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.auth import create_refresh_token, hash_refresh_token
+from app.core.metrics import metrics
+from app.core.settings import settings
+from app.models.user import User
+from app.repository.refresh_token import RefreshTokenRepository
+from app.repository.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+refresh_outcomes = metrics.counter(
+    "refresh_token_exchanges_total",
+    "Refresh token exchanges, by outcome",
+)
+
+
+def _invalid() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+class RefreshTokenService:
+    """Service layer for issuing and rotating refresh tokens."""
+
+    @staticmethod
+    def issue(db: Session, user_id: int, family_id: str | None = None) -> str:
+        """
+        Issue a refresh token.
+
+        Args:
+            db: Database session
+            user_id: User the token is for
+            family_id: Family of the token being rotated, or None to start
+                a new family at login
+
+        Returns:
+            str: The refresh token, which is not stored anywhere in clear
+        """
+        token = create_refresh_token()
+        RefreshTokenRepository.create(
+            db,
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            family_id=family_id or secrets.token_hex(16),
+            expires_at=datetime.now(UTC)
+            + timedelta(days=settings.refresh_token_expire_days),
+        )
+        return token
+
+    @staticmethod
+    def rotate(db: Session, token: str) -> tuple[User, str]:
+        """
+        Exchange a refresh token for the user it belongs to and its successor.
+
+        Args:
+            db: Database session
+            token: Refresh token presented by the client
+
+        Raises:
+            HTTPException: 401 if the token is unknown, expired or reused; a
+                reused token also revokes its family
+
+        Returns:
+            tuple[User, str]: The user and the new refresh token
+        """
+        db_token = RefreshTokenRepository.get_by_hash(db, hash_refresh_token(token))
+        if db_token is None:
+            refresh_outcomes.inc(outcome="invalid")
+            raise _invalid()
+
+        user_id: int = db_token.user_id  # pyright: ignore[reportAssignmentType]
+        family_id: str = db_token.family_id  # pyright: ignore[reportAssignmentType]
+        expires_at: datetime = db_token.expires_at  # pyright: ignore[reportAssignmentType]
+        if expires_at.tzinfo is None:
+            # SQLite hands back the stored UTC time without its zone
+            expires_at = expires_at.replace(tzinfo=UTC)
+        if expires_at <= datetime.now(UTC):
+            refresh_outcomes.inc(outcome="expired")
+            raise _invalid()
+
+        if not RefreshTokenRepository.mark_used(db, db_token):
+            db.rollback()
+            logger.warning(
+                "Refresh token reused for user %s; revoking its family",
+                user_id,
+            )
+            refresh_outcomes.inc(outcome="reused")
+            RefreshTokenRepository.delete_family(db, family_id)
+            raise _invalid()
+
+        user = UserRepository.get_by_id(db, user_id)
+        if user is None:
+            db.rollback()
+            refresh_outcomes.inc(outcome="invalid")
+            raise _invalid()
+
+        # Commits the used mark together with its successor
+        new_token = RefreshTokenService.issue(db, user_id, family_id=family_id)
+        refresh_outcomes.inc(outcome="ok")
+        return user, new_token
@@ -5,53 +5,203 @@ This module handles business logic for user operations,
 combining validation, hashing, and repository calls.
 """
 
+import math
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.core.auth import get_password_hash, verify_password
+from app.core.auth import create_access_token
+from app.core.cache import TTLCache
+from app.core.credentials import credential_cache
+from app.core.hashing import HashingBusyError, check_password, hash_password
+from app.core.login_limiter import login_limiter
+from app.core.metrics import metrics
+from app.core.settings import settings
 from app.models.user import User
+from app.repository.refresh_token import RefreshTokenRepository
 from app.repository.user import UserRepository
 from app.schemas.user import UserCreate
 
+# Every authenticated request resolves its token subject to a user. The
+# column values are cached per subject so that lookup skips the database;
+# changes made here drop the entry, and the short TTL bounds staleness for
+# changes made by other worker processes.
+principal_cache: TTLCache[str, dict] = TTLCache(
+    "principal",
+    ttl=settings.principal_cache_ttl_seconds,
+    max_entries=settings.principal_cache_size,
+)
+principal_hit_ratio = metrics.gauge(
+    "principal_cache_hit_ratio",
+    "Share of authenticated requests whose user came from the principal cache",
+)
+principal_hit_ratio.set_function(principal_cache.hit_ratio)
+
+PRINCIPAL_COLUMNS = ("id", "email", "first_name", "last_name")
+
+# Current token version per user ID, so tokens carrying "uid" and "ver" are
+# checked without a query. A bump elsewhere is seen once the entry expires.
+token_versions: TTLCache[int, int] = TTLCache(
+    "token_version",
+    ttl=settings.token_version_cache_ttl_seconds,
+    max_entries=settings.principal_cache_size,
+)
+
 
 class UserService:
     """Service layer for user-related operations."""
 
     @staticmethod
-    def create(db: Session, user: UserCreate) -> User:
+    async def create(db: Session, user: UserCreate) -> User:
         """
         Register a new user.
 
+        Database calls run on the threadpool and the hash on the hashing
+        pool, so the event loop is never blocked.
+
         Args:
             db: Database session
             user: User creation data
 
         Raises:
-            HTTPException: If email already exists
+            HTTPException: If email already exists, or 503 if password
+                hashing is saturated
 
         Returns:
             User: Created user
         """
-        existing_user = UserRepository.get_by_email(db, user.email)
+        existing_user = await run_in_threadpool(
+            UserRepository.get_by_email,
+            db,
+            user.email,
+        )
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email is already registered.",
             )
 
-        hashed_pw = get_password_hash(user.password)
-        return UserRepository.create(db, user, hashed_pw)
+        try:
+            hashed_pw = await hash_password(user.password)
+        except HashingBusyError as e:
+            raise UserService._busy() from e
+        return await run_in_threadpool(UserRepository.create, db, user, hashed_pw)
 
     @staticmethod
-    def authenticate(db: Session, email: str, password: str) -> User | None:
-        user = UserRepository.get_by_email(db, email)
-        if not user:
-            return None
-        if not verify_password(password, user.hashed_password):  # pyright: ignore[reportArgumentType]
+    async def authenticate(
+        db: Session,
+        email: str,
+        password: str,
+        client_ip: str | None = None,
+    ) -> User | None:
+        """
+        Check a user's credentials.
+
+        The user lookup runs on the threadpool and the hash on the hashing
+        pool, so the event loop is never blocked.
+
+        Args:
+            db: Database session
+            email: User email
+            password: Plaintext password
+            client_ip: Address the attempt came from, for throttling
+
+        Raises:
+            HTTPException: 429 if the account or address has too many recent
+                failed attempts, or 503 if password hashing is saturated
+
+        Returns:
+            User | None: The user if the credentials are valid, else None
+        """
+        retry_after = login_limiter.check(email, client_ip)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed sign-in attempts. Try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+        # The attempt is reserved until it is recorded or released
+        try:
+            user = await run_in_threadpool(UserRepository.get_by_email, db, email)
+            valid = user is not None and await check_password(
+                password,
+                user.hashed_password,  # pyright: ignore[reportArgumentType]
+            )
+        except HashingBusyError as e:
+            login_limiter.release(email, client_ip)
+            raise UserService._busy() from e
+        except BaseException:
+            login_limiter.release(email, client_ip)
+            raise
+        login_limiter.record(email, client_ip, success=valid)
+        if not valid:
             return None
 
         return user
 
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress. Try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    @staticmethod
+    def create_token(user: User) -> str:
+        """
+        Issue an access token for a user.
+
+        Besides the email subject, the token carries the user ID (``uid``)
+        and token version (``ver``) so requests can be authorized without
+        looking the user up.
+
+        Args:
+            user: Authenticated user
+
+        Returns:
+            str: Encoded JWT
+        """
+        return create_access_token(
+            data={"sub": user.email, "uid": user.id, "ver": user.token_version},
+        )
+
+    @staticmethod
+    def get_token_version(db: Session, user_id: int) -> int | None:
+        """
+        Get the token version a user's access tokens must carry.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            int | None: Current version, or None if the user does not exist
+        """
+        version = token_versions.get(user_id)
+        if version is None:
+            version = UserRepository.get_token_version(db, user_id)
+            if version is not None:
+                token_versions.set(user_id, version)
+        return version
+
+    @staticmethod
+    def revoke_tokens(db: Session, user_id: int) -> dict:
+        """
+        Invalidate every access and refresh token issued to a user, e.g. on
+        logout.
+
+        Args:
+            db: Database session
+            user_id: User ID
+        """
+        RefreshTokenRepository.delete_for_user(db, user_id)
+        UserRepository.bump_token_version(db, user_id)
+        token_versions.pop(user_id)
+        return {"message": "Logged out successfully."}
+
     @staticmethod
     def get_user_by_id(db: Session, user_id: int) -> User | None:
         """
@@ -98,6 +248,45 @@ class UserService:
             )
         return user
 
+    @staticmethod
+    def get_principal(db: Session, email: str) -> User | None:
+        """
+        Get the user a token subject refers to, from the cache when possible.
+
+        A cached user is attached to ``db`` without a query; relationships
+        and the password hash load lazily if accessed.
+
+        Args:
+            db: Database session
+            email: Token subject (user email)
+
+        Returns:
+            User | None: User if found, None otherwise
+        """
+        cached = principal_cache.get(email)
+        if cached is not None:
+            user = User(**cached)
+            make_transient_to_detached(user)
+            return db.merge(user, load=False)
+
+        user = UserRepository.get_by_email(db, email)
+        if user is not None:
+            principal_cache.set(
+                email,
+                {column: getattr(user, column) for column in PRINCIPAL_COLUMNS},
+            )
+        return user
+
+    @staticmethod
+    def forget_principal(email: str) -> None:
+        """
+        Drop a cached principal after the user or their tokens change.
+
+        Args:
+            email: Token subject (user email)
+        """
+        principal_cache.pop(email)
+
     @staticmethod
     def delete_user(db: Session, user_id: int) -> dict:
         """
@@ -117,7 +306,11 @@ class UserService:
                 detail="User not found.",
             )
 
+        email = user.email
         UserRepository.delete(db, user)
+        UserService.forget_principal(email)  # pyright: ignore[reportArgumentType]
+        token_versions.pop(user_id)
+        credential_cache.invalidate(user_id)
         return {"message": "User deleted successfully."}
 
     @staticmethod
@@ -146,4 +339,6 @@ class UserService:
 
         user.first_name = first_name
         user.last_name = last_name
-        return UserRepository.update(db, user)
+        user = UserRepository.update(db, user)
+        UserService.forget_principal(user.email)  # pyright: ignore[reportArgumentType]
+        return user
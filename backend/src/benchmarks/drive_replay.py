@@ -0,0 +1,161 @@
+"""
+Benchmark: MCP Drive tools against replayed Drive traffic.
+
+Records a synthetic Drive (``--files`` documents of ``--kb`` KB each) through
+``RecordingHttp``, or uses an existing recording (``--fixtures``), then calls
+``gdrive_search`` and ``gdrive_read_file`` on the in-process MCP server with
+Drive served by ``ReplayHttp``. For each concurrency level it reports
+throughput and p50/p99 latency.
+
+Run from ``backend/src``::
+
+    python -m benchmarks.drive_replay [--concurrency 1 8 32] [--latency-ms 40]
+        [--error-rate 0.01] [--with-quota] [--fixtures drive_fixtures.jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import httplib2
+from fastmcp import Client
+from googleapiclient.discovery import build
+
+from app.core.mcp_client import tool_data
+from app.core.settings import settings
+from app.mcp.server import main as server
+from app.mcp.server.quota import DriveQuota
+from app.mcp.server.replay import FixtureStore, RecordingHttp
+from benchmarks.tool_output import make_document
+
+DOC_MIME = "application/vnd.google-apps.document"
+QUERIES = ["lecture", "notes", "exam"]
+
+
+class SyntheticDrive:
+    """httplib2-compatible stand-in answering the Drive calls the tools make."""
+
+    def __init__(self, files: int, size: int) -> None:
+        self.ids = [f"doc-{i}" for i in range(files)]
+        self.size = size
+
+    def metadata(self, file_id: str) -> dict:
+        return {
+            "id": file_id,
+            "name": f"{QUERIES[hash(file_id) % len(QUERIES)]} {file_id}",
+            "mimeType": DOC_MIME,
+            "webViewLink": f"https://docs.google.com/document/d/{file_id}",
+            "modifiedTime": "2025-10-01T12:00:00.000Z",
+            "version": "1",
+        }
+
+    def request(
+        self,
+        uri: str,
+        _method: str = "GET",
+        *_args: object,
+        **_kwargs: object,
+    ) -> tuple[httplib2.Response, bytes]:
+        parts = urlsplit(uri)
+        path = parts.path.removeprefix("/drive/v3/files").strip("/").split("/")
+        if path == [""]:
+            query = parse_qs(parts.query)["q"][0]
+            body = json.dumps(
+                {"files": [self.metadata(i) for i in self.ids if i[-1] in query]},
+            ).encode()
+        elif len(path) == 2 and path[1] == "export":
+            body = make_document(self.size).encode()
+        else:
+            body = json.dumps(self.metadata(path[0])).encode()
+        return httplib2.Response({"status": 200}), body
+
+
+def record(path: Path, files: int, size: int) -> None:
+    """Record the synthetic Drive through the Drive client's own requests."""
+    drive = SyntheticDrive(files, size)
+    client = server.GoogleDriveClient.__new__(server.GoogleDriveClient)
+    client.user_id = 0
+    client.service = build("drive", "v3", http=RecordingHttp(drive, FixtureStore(path)))
+    for file_id in drive.ids:
+        client.get_file(file_id)
+    for digit in range(10):
+        client.search_files(str(digit))
+
+
+async def run_level(
+    concurrency: int,
+    requests: int,
+    files: int,
+    users: int,
+) -> list[float]:
+    """Issue ``requests`` tool calls with ``concurrency`` in flight."""
+    latencies: list[float] = []
+    counter = iter(range(requests))
+
+    async def worker(client: Client) -> None:
+        for n in counter:
+            if n % 4 == 0:
+                tool, args = "gdrive_search", {"query": str(n % 10)}
+            else:
+                tool, args = "gdrive_read_file", {"file_id": f"doc-{n % files}"}
+            start = time.perf_counter()
+            result = await client.call_tool(tool, {**args, "user_id": n % users})
+            latencies.append(time.perf_counter() - start)
+            tool_data(result)
+
+    async with Client(server.mcp) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--kb", type=int, default=64)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--with-quota", action="store_true", help="keep QPS limits")
+    parser.add_argument("--fixtures", type=Path, help="replay this recording")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = args.fixtures or Path(tmp) / "drive_fixtures.jsonl"
+        if args.fixtures is None:
+            record(fixtures, args.files, args.kb * 1024)
+
+        settings.drive_http_mode = "replay"
+        settings.drive_fixtures = str(fixtures)
+        settings.drive_replay_latency_ms = args.latency_ms
+        settings.drive_replay_jitter = args.jitter
+        settings.drive_replay_error_rate = args.error_rate
+        quota = server.drive_quota
+        if not args.with_quota:
+            quota = DriveQuota(1e9, 1e9, quota.max_retries, 0.05, 1.0)
+
+        print(f"{'concurrency':>11} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        with patch.object(server, "drive_quota", quota):
+            for concurrency in args.concurrency:
+                start = time.perf_counter()
+                latencies = asyncio.run(
+                    run_level(concurrency, args.requests, args.files, args.users),
+                )
+                elapsed = time.perf_counter() - start
+                cuts = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{concurrency:>11} {len(latencies) / elapsed:>8.1f} "
+                    f"{cuts[49] * 1000:>8.1f} {cuts[98] * 1000:>8.1f}",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark: calibrate Argon2 password hashing cost for this host.
+
+Keeps ``--memory-kib`` and ``--parallelism`` and picks the largest time cost
+whose median hash takes at most ``--target-ms``. If even one pass is too
+slow, memory is halved (down to OWASP's 19 MiB minimum); if one pass is still
+too slow there, the run fails without choosing anything. Prints the timings,
+the chosen parameters and the login throughput they allow with
+``password_hash_workers`` threads, and with ``--write`` records them in an
+env file read by the settings.
+
+Existing hashes keep verifying after a change: each stores its own
+parameters.
+
+Run from ``backend/src``::
+
+    python -m benchmarks.password_hash [--target-ms 250] [--write ../.env]
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from app.core.settings import settings
+
+MIN_MEMORY_KIB = 19 * 1024
+MAX_TIME_COST = 16
+PASSWORD = "Calibrate@123"  # nosec B105 - benchmark input, not a credential
+
+
+def measure(time_cost: int, memory_kib: int, parallelism: int, repeat: int) -> float:
+    """Median seconds per hash with the given parameters."""
+    hasher = Argon2Hasher(
+        time_cost=time_cost,
+        memory_cost=memory_kib,
+        parallelism=parallelism,
+    )
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target: float,
+    memory_kib: int,
+    parallelism: int,
+    repeat: int,
+) -> tuple[int, int, float]:
+    """
+    Find the strongest parameters hashing within ``target`` seconds.
+
+    Raises:
+        RuntimeError: If one pass at the minimum memory is slower than
+            ``target``
+
+    Returns:
+        tuple[int, int, float]: Time cost, memory in KiB and seconds per hash
+    """
+    while True:
+        chosen = None
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            seconds = measure(time_cost, memory_kib, parallelism, repeat)
+            print(
+                f"  t={time_cost:<2} m={memory_kib:>7} KiB p={parallelism}: "
+                f"{seconds * 1000:7.1f} ms",
+            )
+            if seconds > target:
+                break
+            chosen = (time_cost, memory_kib, seconds)
+        if chosen is not None:
+            return chosen
+        if memory_kib // 2 < MIN_MEMORY_KIB:
+            msg = (
+                f"t=1 m={memory_kib} KiB already takes {seconds * 1000:.1f} ms; "
+                f"no parameters fit {target * 1000:g} ms, raise --target-ms"
+            )
+            raise RuntimeError(msg)
+        memory_kib //= 2
+
+
+def throughput(
+    time_cost: int,
+    memory_kib: int,
+    parallelism: int,
+    workers: int,
+) -> float:
+    """Hashes per second with ``workers`` threads hashing at once."""
+    count = workers * 4
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(
+            pool.map(
+                measure,
+                [time_cost] * count,
+                [memory_kib] * count,
+                [parallelism] * count,
+                [1] * count,
+            ),
+        )
+    return count / (time.perf_counter() - start)
+
+
+def write_env(path: Path, values: dict[str, object]) -> None:
+    """Set ``values`` in an env file, keeping its other lines."""
+    lines = path.read_text().splitlines() if path.exists() else []
+    keys = {key.upper() for key in values}
+    kept = [line for line in lines if line.split("=", 1)[0].strip().upper() not in keys]
+    kept.extend(f"{key.upper()}={value}" for key, value in values.items())
+    path.write_text("\n".join(kept) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--memory-kib", type=int, default=settings.argon2_memory_kib)
+    parser.add_argument("--parallelism", type=int, default=settings.argon2_parallelism)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--write", type=Path, help="record the result in this env file")
+    args = parser.parse_args()
+
+    print(f"Calibrating for {args.target_ms:g} ms per hash:")
+    try:
+        time_cost, memory_kib, seconds = calibrate(
+            args.target_ms / 1000,
+            args.memory_kib,
+            args.parallelism,
+            args.repeat,
+        )
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    workers = settings.password_hash_workers or os.cpu_count() or 1
+    rate = throughput(time_cost, memory_kib, args.parallelism, workers)
+
+    chosen = {
+        "argon2_time_cost": time_cost,
+        "argon2_memory_kib": memory_kib,
+        "argon2_parallelism": args.parallelism,
+    }
+    print(
+        f"Chosen: t={time_cost} m={memory_kib} KiB p={args.parallelism} "
+        f"({seconds * 1000:.1f} ms per hash, {rate:.1f} hashes/s on {workers} workers)",
+    )
+    if args.write:
+        write_env(args.write, chosen)
+        print(f"Recorded in {args.write}")
+    else:
+        for key, value in chosen.items():
+            print(f"{key.upper()}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark: cost of returning Drive file content from an MCP tool.
+
+Compares, per MB of document text, the full server -> JSON-RPC -> client
+round trip for:
+
+- ``legacy``: the tool returns a FileContent model, FastMCP serializes it
+  twice (a JSON text block plus structured content) and the API parses the
+  text block again with ``json.loads``.
+- ``structured``: the tool returns structured content only (``_structured``).
+- ``structured+gzip``: as above with ``accept_encoding="gzip"``.
+
+Run from ``backend/src``::
+
+    python -m benchmarks.tool_output [--sizes 1 4 16] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from fastmcp.tools.tool import FunctionTool, ToolResult
+from mcp.types import CallToolResult
+
+from app.core.compression import GZIP_BASE64, compress_text
+from app.core.mcp_client import tool_data
+from app.mcp.server.main import _structured
+from app.schemas.mcp import FileContent
+
+MB = 1024 * 1024
+WORDS = [
+    "the",
+    "of",
+    "and",
+    "to",
+    "in",
+    "is",
+    "that",
+    "for",
+    "lecture",
+    "notes",
+    "theorem",
+    "proof",
+    "example",
+    "algorithm",
+    "graph",
+    "sorting",
+    "complexity",
+    "memory",
+    "cache",
+    "thread",
+    "process",
+    "student",
+    "exam",
+    "chapter",
+    "section",
+    "figure",
+    "table",
+    "equation",
+    "derivative",
+]
+
+
+def make_document(size: int) -> str:
+    """Build roughly ``size`` bytes of prose-like text."""
+    rng = random.Random(size)  # nosec B311 - reproducible test data
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def round_trip(tool: FunctionTool, decode: Callable[[CallToolResult], str]) -> int:
+    """Run the tool, send its result over JSON-RPC and decode it client-side."""
+    result: ToolResult = asyncio.run(tool.run({}))
+    content, structured = (
+        result.to_mcp_result()
+        if result.structured_content is not None
+        else (result.content, None)
+    )
+    wire = CallToolResult(
+        content=content,
+        structuredContent=structured,
+    ).model_dump_json(
+        by_alias=True,
+        exclude_none=True,
+    )
+    received = CallToolResult.model_validate_json(wire)
+    decode(received)
+    return len(wire)
+
+
+def legacy_decode(result: CallToolResult) -> str:
+    return json.loads(result.content[0].text)["content"]  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def structured_decode(result: CallToolResult) -> str:
+    # fastmcp's CallToolResult exposes this as ``structured_content``
+    result.structured_content = result.structuredContent  # pyright: ignore[reportAttributeAccessIssue]
+    return tool_data(result)["content"]  # pyright: ignore[reportArgumentType]
+
+
+def variants(document: str) -> dict[str, tuple[FunctionTool, Callable]]:
+    file = FileContent(metadata={"id": "bench"}, content=document, revision="1")
+
+    def legacy() -> FileContent:
+        return file
+
+    def structured() -> ToolResult:
+        return _structured(file)
+
+    def structured_gzip() -> ToolResult:
+        compressed = file.model_copy(
+            update={"content": compress_text(document), "encoding": GZIP_BASE64},
+        )
+        return _structured(compressed)
+
+    return {
+        "legacy": (FunctionTool.from_function(legacy), legacy_decode),
+        "structured": (FunctionTool.from_function(structured), structured_decode),
+        "structured+gzip": (
+            FunctionTool.from_function(structured_gzip),
+            structured_decode,
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>6} {'variant':<16} {'wire MB':>8} {'ms/MB':>8} {'saved ms/MB':>12}",
+    )
+    for size_mb in args.sizes:
+        document = make_document(size_mb * MB)
+        baseline = None
+        for name, (tool, decode) in variants(document).items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                wire_bytes = round_trip(tool, decode)
+                timings.append(time.perf_counter() - start)
+            ms_per_mb = statistics.median(timings) * 1000 / size_mb
+            baseline = baseline or ms_per_mb
+            print(
+                f"{size_mb:>5}M {name:<16} {wire_bytes / MB:>8.2f} "
+                f"{ms_per_mb:>8.1f} {baseline - ms_per_mb:>12.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: access token verification with and without the verified token cache.
+
+Replays a stream of ``--requests`` authenticated requests spread over
+``--sessions`` active sessions, each with its own access token, on
+``--threads`` threads (the API's sync routes run on a threadpool). Tokens
+are picked from a Zipf-like distribution, as a few busy sessions send most
+requests. The same stream is checked with ``decode_token`` (HMAC and claim
+parsing every time) and with ``verify_token`` backed by a cache of
+``--cache-size`` entries; a cache smaller than the session count shows LRU
+churn. Prints per-check latency, checks per second and the hit ratio.
+
+Run from ``backend/src``::
+
+    python -m benchmarks.verify_token [--sessions 500] [--requests 200000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.auth import create_access_token, decode_token, verified_tokens
+from app.core.auth import verify_token as cached_verify
+from app.core.cache import cache_hits, cache_misses
+from app.core.settings import settings
+
+
+def make_stream(sessions: int, requests: int, seed: int) -> list[str]:
+    """Tokens of ``requests`` requests, busy sessions sending the most."""
+    tokens = [
+        create_access_token(
+            data={"sub": f"user{n}@example.com", "uid": n, "ver": 0},
+        )
+        for n in range(sessions)
+    ]
+    weights = [1 / (rank + 1) for rank in range(sessions)]
+    # Seeded so runs replay the same request stream
+    return random.Random(seed).choices(tokens, weights=weights, k=requests)  # nosec B311
+
+
+def run(check: Callable[[str], dict | None], stream: list[str], threads: int) -> float:
+    """Seconds taken to check every token in ``stream`` on ``threads`` threads."""
+    chunks = [stream[i::threads] for i in range(threads)]
+
+    def check_all(chunk: list[str]) -> None:
+        for token in chunk:
+            if check(token) is None:
+                msg = "token failed verification"
+                raise RuntimeError(msg)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(check_all, chunks))
+    return time.perf_counter() - start
+
+
+def report(name: str, timings: list[float], requests: int) -> float:
+    seconds = statistics.median(timings)
+    print(
+        f"  {name:<9} {seconds / requests * 1e6:7.2f} us/check "
+        f"{requests / seconds:12,.0f} checks/s",
+    )
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=settings.verified_token_cache_size,
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stream = make_stream(args.sessions, args.requests, args.seed)
+    verified_tokens.max_entries = args.cache_size
+    print(
+        f"{args.requests:,} checks over {args.sessions} sessions on "
+        f"{args.threads} threads, cache of {args.cache_size} entries:",
+    )
+
+    uncached = [run(decode_token, stream, args.threads) for _ in range(args.repeat)]
+    cached = []
+    for _ in range(args.repeat):
+        verified_tokens.clear()
+        hits = cache_hits.value(cache=verified_tokens.name)
+        misses = cache_misses.value(cache=verified_tokens.name)
+        cached.append(run(cached_verify, stream, args.threads))
+    hits = cache_hits.value(cache=verified_tokens.name) - hits
+    misses = cache_misses.value(cache=verified_tokens.name) - misses
+
+    baseline = report("uncached", uncached, args.requests)
+    seconds = report("cached", cached, args.requests)
+    print(
+        f"Speed-up {baseline / seconds:.1f}x, hit ratio "
+        f"{hits / (hits + misses):.1%} (last run)",
+    )
+
+
+if __name__ == "__main__":
+    main()
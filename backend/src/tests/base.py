@@ -13,9 +13,12 @@ from sqlalchemy.orm import Session, sessionmaker
 from app.core.auth import get_password_hash
 from app.core.database import Base
 from app.core.dependencies import get_db
+from app.core.login_limiter import login_limiter
 from app.main import app
 from app.models.user import User
 from app.repository.user import UserRepository
+from app.services.file_chunk import file_checks
+from app.services.user import principal_cache, token_versions
 
 
 class BaseTestCase(unittest.TestCase):
@@ -87,6 +90,11 @@ class BaseTestCase(unittest.TestCase):
         with self.engine.begin() as connection:
             for table in reversed(Base.metadata.sorted_tables):
                 connection.execute(table.delete())
+        # Users were deleted behind the services' backs
+        principal_cache.clear()
+        token_versions.clear()
+        login_limiter.clear()
+        file_checks.clear()
         app.dependency_overrides.clear()
 
     def create_registered_user(self) -> User:
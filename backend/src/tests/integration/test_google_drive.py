@@ -0,0 +1,83 @@
+"""Integration tests for Google Drive endpoints served from the local mirror."""
+
+import unittest
+from datetime import UTC, datetime
+
+from app.repository.drive_file import DriveFileRepository
+from app.repository.drive_sync_state import DriveSyncStateRepository
+from app.repository.user import UserRepository
+from app.schemas.mcp import DriveFileMetadata
+from tests.base import BaseTestCase
+
+
+class TestDriveMirrorEndpoints(BaseTestCase):
+    """Tests for Drive endpoints once the user's mirror is synced."""
+
+    def setUp(self) -> None:
+        """Set up an authenticated user with a freshly synced mirror."""
+        super().setUp()
+        self.authenticated_client = self.get_authenticated_client()
+        user = UserRepository.get_by_email(
+            self.db_session,
+            self.test_user_data["email"],
+        )
+        DriveFileRepository.upsert_many(
+            self.db_session,
+            user.id,
+            [
+                DriveFileMetadata(id="a", name="Syllabus", mime_type="application/pdf"),
+                DriveFileMetadata(id="b", name="Lecture 1", mime_type="text/plain"),
+            ],
+        )
+        DriveSyncStateRepository.save(
+            self.db_session,
+            user.id,
+            "cursor",
+            datetime.now(UTC),
+            full_sync=True,
+        )
+
+    def test_search_all_uses_mirror(self) -> None:
+        """Test listing every file from the mirror."""
+        response = self.authenticated_client.get("/api/v1/drive/search/all")
+
+        assert response.status_code == 200
+        assert [f["name"] for f in response.json()] == ["Lecture 1", "Syllabus"]
+
+    def test_search_pages_through_mirror(self) -> None:
+        """Test that mirror search results are paged like live results."""
+        first = self.authenticated_client.get(
+            "/api/v1/drive/search/",
+            params={"query": "l", "page_size": 1},
+        )
+        token = first.headers["X-Next-Page-Token"]
+        second = self.authenticated_client.get(
+            "/api/v1/drive/search/",
+            params={"query": "l", "page_size": 1, "page_token": token},
+        )
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == [
+            {
+                "id": "b",
+                "name": "Lecture 1",
+                "mime_type": "text/plain",
+                "web_view_link": "",
+            },
+        ]
+        assert [f["id"] for f in second.json()] == ["a"]
+        assert "X-Next-Page-Token" not in second.headers
+
+    def test_typeahead(self) -> None:
+        """Test name lookups from the mirror."""
+        response = self.authenticated_client.get(
+            "/api/v1/drive/files/typeahead",
+            params={"q": "syl"},
+        )
+
+        assert response.status_code == 200
+        assert [f["id"] for f in response.json()] == ["a"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Integration tests for the metrics endpoint."""
+
+import unittest
+from unittest.mock import patch
+
+from app.core.settings import settings
+from tests.base import BaseTestCase
+
+
+class TestMetricsEndpoint(BaseTestCase):
+    """Tests for the Prometheus scrape endpoint."""
+
+    def test_metrics_exposes_mcp_pool(self) -> None:
+        """Test that the endpoint renders pool metrics as plain text."""
+        with patch.object(settings, "metrics_token", "scrape-secret"):
+            response = self.client.get(
+                "/api/v1/metrics",
+                headers={"Authorization": "Bearer scrape-secret"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE mcp_pool_size gauge" in response.text
+
+    def test_metrics_require_the_token(self) -> None:
+        """Test that metrics are off by default and need the scrape token."""
+        disabled = self.client.get("/api/v1/metrics")
+        with patch.object(settings, "metrics_token", "scrape-secret"):
+            anonymous = self.client.get("/api/v1/metrics")
+            user = self.get_authenticated_client().get("/api/v1/metrics")
+
+        assert disabled.status_code == 404
+        assert anonymous.status_code == 401
+        assert user.status_code == 401
+
+
+if __name__ == "__main__":
+    unittest.main()
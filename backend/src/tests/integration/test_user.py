@@ -1,7 +1,11 @@
 """Integration tests for user endpoints."""
 
 import unittest
+from unittest.mock import patch
 
+from httpx import Response
+
+from app.core.auth import create_access_token
 from tests.base import BaseTestCase
 
 
@@ -152,5 +156,107 @@ class TestUserProfile(BaseTestCase):
         assert response.status_code in [200, 404]
 
 
+class TestUserLogout(BaseTestCase):
+    """Tests for revoking access tokens."""
+
+    def test_logout_revokes_token(self) -> None:
+        """Test that a token stops working after logout."""
+        authenticated_client = self.get_authenticated_client()
+        assert authenticated_client.get("/api/v1/courses/").status_code == 200
+
+        response = authenticated_client.post("/api/v1/user/logout")
+
+        assert response.status_code == 200
+        assert authenticated_client.get("/api/v1/courses/").status_code == 401
+        assert authenticated_client.get("/api/v1/user/me").status_code == 401
+
+    def test_token_without_version_is_accepted(self) -> None:
+        """Test that tokens issued before the uid/ver claims still work."""
+        self.create_registered_user()
+        token = create_access_token(data={"sub": self.test_user_data["email"]})
+
+        response = self.client.get(
+            "/api/v1/courses/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+
+
+class TestRefreshToken(BaseTestCase):
+    """Tests for renewing access tokens without the password."""
+
+    def login(self) -> dict:
+        self.create_registered_user()
+        response = self.client.post(
+            "/api/v1/user/login",
+            data={
+                "username": self.test_user_data["email"],
+                "password": self.test_user_data["password"],
+            },
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    def refresh(self, refresh_token: str) -> Response:
+        return self.client.post(
+            "/api/v1/user/token/refresh",
+            json={"refresh_token": refresh_token},
+        )
+
+    def test_refresh_rotates_token(self) -> None:
+        """Test that a refresh returns a working access token and a new refresh token."""
+        tokens = self.login()
+
+        with patch("app.services.user.check_password") as check:
+            response = self.refresh(tokens["refresh_token"])
+
+        assert response.status_code == 200
+        renewed = response.json()
+        assert renewed["refresh_token"] != tokens["refresh_token"]
+        assert check.call_count == 0
+        me = self.client.get(
+            "/api/v1/user/me",
+            headers={"Authorization": f"Bearer {renewed['access_token']}"},
+        )
+        assert me.status_code == 200
+        assert self.refresh(renewed["refresh_token"]).status_code == 200
+
+    def test_reused_token_revokes_its_family(self) -> None:
+        """Test that replaying an exchanged refresh token ends only that login."""
+        tokens = self.login()
+        other = self.client.post(
+            "/api/v1/user/login",
+            data={
+                "username": self.test_user_data["email"],
+                "password": self.test_user_data["password"],
+            },
+        ).json()
+        renewed = self.refresh(tokens["refresh_token"]).json()
+
+        response = self.refresh(tokens["refresh_token"])
+
+        assert response.status_code == 401
+        assert self.refresh(renewed["refresh_token"]).status_code == 401
+        assert self.refresh(other["refresh_token"]).status_code == 200
+
+    def test_unknown_token_is_rejected(self) -> None:
+        """Test that a made-up refresh token gets 401."""
+        self.login()
+
+        assert self.refresh("not-a-token").status_code == 401
+
+    def test_logout_revokes_refresh_tokens(self) -> None:
+        """Test that logging out also ends refresh-token renewals."""
+        tokens = self.login()
+
+        self.client.post(
+            "/api/v1/user/logout",
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+
+        assert self.refresh(tokens["refresh_token"]).status_code == 401
+
+
 if __name__ == "__main__":
     unittest.main()
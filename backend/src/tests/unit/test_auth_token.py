@@ -0,0 +1,257 @@
+"""Unit tests for Google OAuth token refresh, caching and loading."""
+
+import threading
+import time
+import unittest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.credentials import credential_cache
+from app.core.encrypt import decrypt_key
+from app.core.google_auth import RefreshRevokedError
+from app.core.settings import settings
+from app.services.auth_token import AuthTokenService, token_refreshes
+from tests.base import BaseTestCase
+
+
+def expiring_in(seconds: float) -> str:
+    """Expiry in the naive UTC ISO format Google credentials use."""
+    expiry = datetime.now(UTC) + timedelta(seconds=seconds)
+    return expiry.replace(tzinfo=None).isoformat()
+
+
+class FakeGoogle:
+    """Stand-in for ``refresh_credentials`` counting how often it is called."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, refresh_token: str) -> dict:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {
+            "access_token": f"fresh-{refresh_token}",
+            "refresh_token": refresh_token,
+            "expiry": expiring_in(3600),
+        }
+
+
+class TestTokenRefresh(BaseTestCase):
+    """Tests for inline and background refreshes of Google tokens."""
+
+    def setUp(self) -> None:
+        """Create a user with stored tokens."""
+        super().setUp()
+        self.user = self.create_registered_user()
+        self.user_id: int = self.user.id  # pyright: ignore[reportAttributeAccessIssue]
+
+    def store_tokens(self, expiry: str) -> None:
+        AuthTokenService.create_auth_token(
+            self.db_session,
+            self.user_id,
+            {"access_token": "old", "refresh_token": "refresh", "expiry": expiry},
+        )
+
+    def test_background_pass_refreshes_only_expiring_tokens(self) -> None:
+        """Test that tokens inside the refresh window are renewed ahead of time."""
+        self.store_tokens(expiring_in(60))
+        google = FakeGoogle()
+
+        with patch("app.services.auth_token.refresh_credentials", google):
+            refreshed = AuthTokenService.refresh_expiring(self.db_session)
+            again = AuthTokenService.refresh_expiring(self.db_session)
+
+        tokens = AuthTokenService.get_auth_token(self.db_session, self.user_id)
+        assert (refreshed, again) == (1, 0)
+        assert google.calls == 1
+        assert tokens is not None
+        assert tokens.access_token == "fresh-refresh"
+
+    def test_concurrent_inline_refreshes_are_single_flight(self) -> None:
+        """Test that requests racing on an expired token refresh it once."""
+        self.store_tokens(expiring_in(-60))
+        google = FakeGoogle(delay=0.1)
+        sessions = sessionmaker(bind=self.engine)
+        inline = token_refreshes.value(trigger="inline", outcome="ok")
+        tokens = []
+
+        def request() -> None:
+            db = sessions()
+            try:
+                tokens.append(AuthTokenService.get_auth_token(db, self.user_id))
+            finally:
+                db.close()
+
+        with patch("app.services.auth_token.refresh_credentials", google):
+            threads = [threading.Thread(target=request) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert google.calls == 1
+        assert [t.access_token for t in tokens] == ["fresh-refresh"] * 4
+        assert token_refreshes.value(trigger="inline", outcome="ok") == inline + 1
+
+    def test_failed_refresh_does_not_stop_the_pass(self) -> None:
+        """Test that a user whose refresh fails is counted and skipped."""
+        self.store_tokens(expiring_in(-60))
+        errors = token_refreshes.value(trigger="background", outcome="error")
+
+        with patch(
+            "app.services.auth_token.refresh_credentials",
+            side_effect=ValueError("invalid_grant"),
+        ):
+            refreshed = AuthTokenService.refresh_expiring(self.db_session)
+
+        assert refreshed == 0
+        assert (
+            token_refreshes.value(trigger="background", outcome="error") == errors + 1
+        )
+
+    def test_long_expired_tokens_are_left_for_next_use(self) -> None:
+        """Test that tokens expired past the grace period are not refreshed."""
+        self.store_tokens(expiring_in(-2 * settings.oauth_refresh_grace_seconds))
+        google = FakeGoogle()
+
+        with patch("app.services.auth_token.refresh_credentials", google):
+            refreshed = AuthTokenService.refresh_expiring(self.db_session)
+
+        assert refreshed == 0
+        assert google.calls == 0
+
+    def test_revoked_refresh_token_is_not_retried(self) -> None:
+        """Test that a rejected refresh token is skipped until new tokens arrive."""
+        self.store_tokens(expiring_in(-60))
+
+        with patch(
+            "app.services.auth_token.refresh_credentials",
+            side_effect=RefreshRevokedError,
+        ) as google:
+            AuthTokenService.refresh_expiring(self.db_session)
+            AuthTokenService.refresh_expiring(self.db_session)
+            try:
+                AuthTokenService.get_auth_token(self.db_session, self.user_id)
+            except HTTPException as e:
+                error = e
+            else:
+                self.fail("HTTPException not raised")
+
+        assert google.call_count == 1
+        assert error.status_code == 401
+        self.store_tokens(expiring_in(60))
+        with patch("app.services.auth_token.refresh_credentials", FakeGoogle()):
+            assert AuthTokenService.refresh_expiring(self.db_session) == 1
+
+
+class TestDecryptedTokenCache(BaseTestCase):
+    """Tests for serving decrypted tokens without Fernet."""
+
+    def setUp(self) -> None:
+        """Create a user with stored tokens and an empty cache."""
+        super().setUp()
+        credential_cache.clear()
+        self.addCleanup(credential_cache.clear)
+        self.user_id: int = self.create_registered_user().id  # pyright: ignore[reportAttributeAccessIssue]
+        self.store("access")
+
+    def store(self, access_token: str) -> None:
+        AuthTokenService.create_auth_token(
+            self.db_session,
+            self.user_id,
+            {
+                "access_token": access_token,
+                "refresh_token": "refresh",
+                "expiry": expiring_in(3600),
+            },
+        )
+
+    def test_repeated_lookups_skip_decryption(self) -> None:
+        """Test that only the first lookup decrypts."""
+        with patch(
+            "app.services.auth_token.decrypt_key",
+            side_effect=decrypt_key,
+        ) as decrypt:
+            first = AuthTokenService.get_auth_token(self.db_session, self.user_id)
+            second = AuthTokenService.get_auth_token(self.db_session, self.user_id)
+
+        assert decrypt.call_count == 2
+        assert first is not None
+        assert second is not None
+        assert second.access_token == first.access_token == "access"
+
+    def test_stored_tokens_change_invalidates(self) -> None:
+        """Test that new tokens are never served from a stale entry."""
+        AuthTokenService.get_auth_token(self.db_session, self.user_id)
+        self.store("rotated")
+
+        assert len(credential_cache) == 0
+        tokens = AuthTokenService.get_auth_token(self.db_session, self.user_id)
+        assert tokens is not None
+        assert tokens.access_token == "rotated"
+
+
+class TestUserWithToken(BaseTestCase):
+    """Tests for loading a user and their tokens together."""
+
+    def setUp(self) -> None:
+        """Create a user with stored tokens and an empty cache."""
+        super().setUp()
+        credential_cache.clear()
+        self.addCleanup(credential_cache.clear)
+        self.user_id: int = self.create_registered_user().id  # pyright: ignore[reportAttributeAccessIssue]
+        AuthTokenService.create_auth_token(
+            self.db_session,
+            self.user_id,
+            {
+                "access_token": "access",
+                "refresh_token": "refresh",
+                "expiry": expiring_in(3600),
+            },
+        )
+        self.db_session.expunge_all()
+
+    def test_single_query(self) -> None:
+        """Test that the user and stored tokens come from one query."""
+        statements = []
+
+        def count(*_args: object) -> None:
+            statements.append(1)
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        try:
+            user, tokens = AuthTokenService.get_user_with_token(
+                self.db_session,
+                self.user_id,
+            )
+        finally:
+            event.remove(self.engine, "before_cursor_execute", count)
+
+        assert len(statements) == 1
+        assert user.id == self.user_id
+        assert tokens.access_token == "access"
+
+    def test_request_resolves_user_and_token_once(self) -> None:
+        """Test that the OAuth token route looks the user up once per request."""
+        client = self.get_authenticated_client()
+
+        with patch(
+            "app.core.dependencies.AuthTokenService.get_user_with_token",
+            side_effect=AuthTokenService.get_user_with_token,
+        ) as load:
+            response = client.get("/api/v1/user/token")
+
+        assert response.status_code == 200
+        assert response.json()["access_token"] == "access"
+        assert load.call_count == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
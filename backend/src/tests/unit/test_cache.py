@@ -0,0 +1,297 @@
+"""Unit tests for the in-process cache helpers and the token, credential and Drive search caches."""
+
+import asyncio
+import time
+import unittest
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import jwt
+
+from app.core.auth import create_access_token, verified_tokens, verify_token
+from app.core.cache import SingleFlight, TTLCache
+from app.core.credentials import CredentialCache, SecretPair
+from app.services.google_drive import GoogleDriveService, search_cache
+
+
+class TestTTLCache(unittest.TestCase):
+    """Tests for the bounded TTL cache."""
+
+    def test_entries_expire(self) -> None:
+        """Test that entries are not served after their TTL."""
+        cache: TTLCache[str, int] = TTLCache("test_expiry", ttl=0.01, max_entries=4)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """Test that the cache stays within max_entries."""
+        evicted = []
+        cache: TTLCache[str, int] = TTLCache(
+            "test_lru",
+            ttl=60,
+            max_entries=2,
+            on_evict=lambda key, _value: evicted.append(key),
+        )
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert evicted == ["b"]
+
+    def test_byte_budget_evicts_least_recently_used(self) -> None:
+        """Test that large values push older entries out of a max_bytes cache."""
+        cache: TTLCache[str, str] = TTLCache(
+            "test_bytes",
+            ttl=60,
+            max_entries=10,
+            max_bytes=10,
+            sizeof=len,
+        )
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.set("c", "cccccc")
+
+        assert cache.get("a") is None
+        assert cache.get("b") == "bbbb"
+        assert cache.nbytes == 10
+
+    def test_hit_ratio(self) -> None:
+        """Test that hits and misses are counted per cache."""
+        cache: TTLCache[str, int] = TTLCache("test_ratio", ttl=60, max_entries=4)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+
+        assert cache.hit_ratio() == 0.5
+
+
+class TestCredentialCache(unittest.TestCase):
+    """Tests for the cache of decrypted OAuth tokens."""
+
+    def setUp(self) -> None:
+        """Record the buffers of every pair the cache creates."""
+        self.cache = CredentialCache("test_credentials", ttl=60, max_entries=2)
+        self.pairs: list[SecretPair] = []
+        original = SecretPair.__init__
+
+        def track(pair: SecretPair, access: str, refresh: str) -> None:
+            original(pair, access, refresh)
+            self.pairs.append(pair)
+
+        patcher = patch.object(SecretPair, "__init__", track)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wiped(self, pair: SecretPair) -> bool:
+        return not any(pair._access) and not any(pair._refresh)  # noqa: SLF001
+
+    def test_entries_are_keyed_by_token_version(self) -> None:
+        """Test that a new version misses and replaces the old entry."""
+        self.cache.put(1, "access", "refresh", version="v1")
+
+        assert self.cache.get(1, "v1") == ("access", "refresh")
+        assert self.cache.get(1, "v2") is None
+        self.cache.put(1, "access2", "refresh2", version="v2")
+        assert self.cache.get(1, "v1") is None
+        assert self.wiped(self.pairs[0])
+
+    def test_dropped_entries_are_wiped(self) -> None:
+        """Test that invalidated, evicted and expired tokens are zeroed."""
+        self.cache.put(1, "a1", "r1")
+        self.cache.put(2, "a2", "r2")
+        self.cache.invalidate(1)
+        self.cache.put(3, "a3", "r3")
+        self.cache.put(4, "a4", "r4")
+        self.cache.put(5, "a5", "r5", ttl=0.01)
+        time.sleep(0.02)
+        self.cache._next_purge = 0  # noqa: SLF001
+        self.cache.get(4)
+
+        assert [self.wiped(pair) for pair in self.pairs] == [
+            True,
+            True,
+            True,
+            False,
+            True,
+        ]
+        assert len(self.cache) == 1
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    """Tests for skipping repeated JWT verification."""
+
+    def setUp(self) -> None:
+        """Start from an empty cache."""
+        verified_tokens.clear()
+        self.addCleanup(verified_tokens.clear)
+
+    def test_repeated_tokens_are_decoded_once(self) -> None:
+        """Test that only the first check of a token runs jwt.decode."""
+        token = create_access_token(data={"sub": "user@example.com", "uid": 1})
+
+        with patch("app.core.auth.jwt.decode", side_effect=jwt.decode) as decode:
+            first = verify_token(token)
+            second = verify_token(token)
+
+        assert decode.call_count == 1
+        assert first == second
+        assert second is not None
+        assert second["uid"] == 1
+
+    def test_expiry_is_exact(self) -> None:
+        """Test that a cached token is refused from its exp second on."""
+        token = create_access_token(data={"sub": "user@example.com"})
+        payload = verify_token(token)
+        assert payload is not None
+
+        with patch("app.core.auth.time.time", return_value=payload["exp"] - 0.001):
+            assert verify_token(token) is not None
+        with patch("app.core.auth.time.time", return_value=payload["exp"]):
+            assert verify_token(token) is None
+        assert len(verified_tokens) == 0
+
+    def test_invalid_tokens_are_not_cached(self) -> None:
+        """Test that a token failing verification leaves no entry."""
+        token = create_access_token(data={"sub": "user@example.com"})
+
+        assert verify_token(token[:-2] + "xx") is None
+        assert len(verified_tokens) == 0
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests for coalescing identical in-flight calls."""
+
+    def test_identical_calls_share_one_execution(self) -> None:
+        """Test that concurrent callers with one key run the work once."""
+        flight: SingleFlight[str, int] = SingleFlight("test_flight")
+        calls = 0
+
+        async def work() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        async def scenario() -> list[int]:
+            return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert asyncio.run(scenario()) == [42] * 5
+        assert calls == 1
+
+    def test_cancelled_leader_does_not_fail_followers(self) -> None:
+        """Test that callers who joined a call get its result if the first leaves."""
+        flight: SingleFlight[str, int] = SingleFlight("test_flight_cancel")
+
+        async def work() -> int:
+            await asyncio.sleep(0.05)
+            return 42
+
+        async def scenario() -> int:
+            leader = asyncio.ensure_future(flight.do("k", work))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("k", work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(scenario()) == 42
+
+
+class FakeDriveClient:
+    """Stands in for a pooled MCP client and counts tool calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    async def call_tool(self, _name: str, arguments: dict) -> SimpleNamespace:
+        self.calls.append(arguments)
+        await asyncio.sleep(0.01)
+        payload = {
+            "files": [{"id": "1", "name": arguments["query"]}],
+            "next_page_token": "next" if not arguments["page_token"] else None,
+        }
+        return SimpleNamespace(content=[], structured_content=payload)
+
+
+class TestDriveSearchCache(unittest.TestCase):
+    """Tests for cached, coalesced and paginated Drive search."""
+
+    def setUp(self) -> None:
+        """Route the service through a fake MCP client."""
+        search_cache.clear()
+        self.client = FakeDriveClient()
+
+        @asynccontextmanager
+        async def session() -> AsyncIterator[FakeDriveClient]:
+            yield self.client
+
+        self.patcher = patch(
+            "app.services.google_drive.mcp_pool",
+            SimpleNamespace(session=session),
+        )
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """Restore the real pool and clear cached pages."""
+        self.patcher.stop()
+        search_cache.clear()
+
+    def test_repeated_search_is_served_from_cache(self) -> None:
+        """Test that a repeated query within the TTL skips MCP."""
+
+        async def scenario() -> None:
+            await GoogleDriveService.search(1, "notes")
+            await GoogleDriveService.search(1, "notes")
+
+        asyncio.run(scenario())
+        assert len(self.client.calls) == 1
+
+    def test_concurrent_searches_are_coalesced(self) -> None:
+        """Test that identical in-flight searches make one MCP call."""
+
+        async def scenario() -> None:
+            await asyncio.gather(
+                *(GoogleDriveService.search(1, "notes") for _ in range(4)),
+            )
+
+        asyncio.run(scenario())
+        assert len(self.client.calls) == 1
+
+    def test_cache_is_per_user(self) -> None:
+        """Test that users never share cached results."""
+
+        async def scenario() -> None:
+            await GoogleDriveService.search(1, "notes")
+            await GoogleDriveService.search(2, "notes")
+
+        asyncio.run(scenario())
+        assert len(self.client.calls) == 2
+
+    def test_pagination_cursor(self) -> None:
+        """Test that the cursor is returned and forwarded to MCP."""
+
+        async def scenario() -> tuple[dict, dict]:
+            first = await GoogleDriveService.search_page(1, "notes")
+            second = await GoogleDriveService.search_page(
+                1,
+                "notes",
+                page_token=first["next_page_token"],
+            )
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first["next_page_token"] == "next"
+        assert second["next_page_token"] is None
+        assert self.client.calls[1]["page_token"] == "next"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Unit tests for database session lifecycle, pool metrics and upgrades."""
+
+import unittest
+
+from sqlalchemy import create_engine, text
+
+from app.core.database import (
+    Base,
+    add_missing_columns,
+    pool_checked_out,
+    pool_checkouts,
+    pool_hold,
+    session_scope,
+)
+
+
+class TestSessionScope(unittest.TestCase):
+    """Tests for scoped sessions outside of requests."""
+
+    def test_connection_is_returned(self) -> None:
+        """Test that the session's connection goes back to the pool on exit."""
+        before_checkouts = pool_checkouts.total()
+        before_holds = pool_hold.count()
+        idle = pool_checked_out.value()
+
+        with session_scope() as db:
+            db.execute(text("SELECT 1"))
+            assert pool_checked_out.value() == idle + 1
+
+        assert pool_checked_out.value() == idle
+        assert pool_checkouts.total() == before_checkouts + 1
+        assert pool_hold.count() == before_holds + 1
+
+    def test_connection_is_returned_on_error(self) -> None:
+        """Test that a failing block still releases its connection."""
+        idle = pool_checked_out.value()
+
+        try:
+            with session_scope() as db:
+                db.execute(text("SELECT 1"))
+                db.execute(text("SELECT * FROM missing_table"))
+        except Exception:  # noqa: BLE001
+            pass
+
+        assert pool_checked_out.value() == idle
+
+
+class TestAddMissingColumns(unittest.TestCase):
+    """Tests for upgrading tables created by an older version."""
+
+    def test_new_column_is_added_with_its_default(self) -> None:
+        """Test that a column missing from an existing table is added once."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE users DROP COLUMN token_version"))
+            conn.execute(
+                text(
+                    "INSERT INTO users (email, hashed_password, first_name, "
+                    "last_name) VALUES ('old@example.com', 'x', 'Old', 'User')",
+                ),
+            )
+
+        added = add_missing_columns(engine)
+
+        with engine.connect() as conn:
+            version = conn.execute(text("SELECT token_version FROM users")).scalar()
+        assert added == ["users.token_version"]
+        assert version == 0
+        assert add_missing_columns(engine) == []
+
+
+if __name__ == "__main__":
+    unittest.main()
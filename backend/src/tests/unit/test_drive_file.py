@@ -0,0 +1,214 @@
+"""Unit tests for the Drive metadata mirror."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from app.core.auth import get_password_hash
+from app.repository.drive_file import DriveFileRepository
+from app.repository.drive_sync_state import DriveSyncStateRepository
+from app.repository.user import UserRepository
+from app.schemas.mcp import DriveFileMetadata
+from app.schemas.user import UserCreate
+from app.services.drive_mirror import DriveMirrorService, StaleChangesTokenError
+from app.services.google_drive import search_cache
+from tests.base import BaseTestCase
+
+
+def drive_file(drive_id: str, name: str) -> DriveFileMetadata:
+    """Build mirrored metadata for a plain document."""
+    return DriveFileMetadata(
+        id=drive_id,
+        name=name,
+        mime_type="application/vnd.google-apps.document",
+        modified_time="2025-10-01T12:00:00.000Z",
+        parents=["root"],
+    )
+
+
+class TestDriveFileRepository(BaseTestCase):
+    """Tests for Drive mirror repository operations."""
+
+    def setUp(self) -> None:
+        """Set up a user with a few mirrored files."""
+        super().setUp()
+        hashed_password = get_password_hash(self.test_user_data["password"])
+        self.user = UserRepository.create(
+            self.db_session,
+            UserCreate(**self.test_user_data),
+            hashed_password,
+        )
+        DriveFileRepository.upsert_many(
+            self.db_session,
+            self.user.id,
+            [
+                drive_file("1", "Lecture 1 - Sorting"),
+                drive_file("2", "lecture 2 - Graphs"),
+                drive_file("3", "Homework 100%_final"),
+            ],
+        )
+
+    def test_upsert_updates_existing_rows(self) -> None:
+        """Test that upserting an existing Drive ID renames instead of duplicating."""
+        DriveFileRepository.upsert_many(
+            self.db_session,
+            self.user.id,
+            [drive_file("1", "Lecture 1 - Sorting (v2)")],
+        )
+
+        rows = DriveFileRepository.get_all(self.db_session, self.user.id)
+        assert len(rows) == 3
+        assert "Lecture 1 - Sorting (v2)" in {row.name for row in rows}
+
+    def test_search_prefix_is_case_insensitive(self) -> None:
+        """Test that prefix search matches regardless of case."""
+        rows = DriveFileRepository.search_prefix(
+            self.db_session,
+            self.user.id,
+            "lecture",
+            10,
+        )
+
+        assert [row.drive_id for row in rows] == ["1", "2"]
+
+    def test_search_substring_escapes_wildcards(self) -> None:
+        """Test that % and _ in the query are matched literally."""
+        rows = DriveFileRepository.search_substring(
+            self.db_session,
+            self.user.id,
+            "100%_",
+            10,
+        )
+
+        assert [row.drive_id for row in rows] == ["3"]
+
+    def test_delete_many(self) -> None:
+        """Test removing mirrored files."""
+        DriveFileRepository.delete_many(self.db_session, self.user.id, ["1", "3"])
+
+        assert DriveFileRepository.get_drive_ids(self.db_session, self.user.id) == {
+            "2",
+        }
+
+    def test_mirror_is_per_user(self) -> None:
+        """Test that another user's mirror is not visible."""
+        assert DriveFileRepository.get_all(self.db_session, 9999) == []
+
+
+class TestDriveMirrorService(BaseTestCase):
+    """Tests for crawling and incrementally syncing the Drive mirror."""
+
+    def setUp(self) -> None:
+        """Set up a user and a fake Drive behind the MCP tools."""
+        super().setUp()
+        self.user = self.create_registered_user()
+        self.drive = {"1": "Syllabus", "2": "Lecture 1"}
+        self.changes: list[dict] = []
+        self.expired_tokens: set[str] = set()
+
+        async def fake_call_tool(tool: str, arguments: dict) -> dict:
+            if tool == "gdrive_list_files":
+                # Serve one file per page to exercise pagination
+                ids = sorted(self.drive)
+                index = int(arguments["page_token"] or 0)
+                return {
+                    "files": [
+                        drive_file(ids[index], self.drive[ids[index]]).model_dump(),
+                    ],
+                    "next_page_token": str(index + 1) if index + 1 < len(ids) else None,
+                }
+            if arguments.get("page_token") is None:
+                return {"changes": [], "new_start_page_token": "start"}
+            if arguments["page_token"] in self.expired_tokens:
+                raise StaleChangesTokenError(arguments["page_token"])
+            return {"changes": self.changes, "new_start_page_token": "after"}
+
+        self.patcher = patch(
+            "app.services.drive_mirror._call_tool",
+            side_effect=fake_call_tool,
+        )
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """Remove the fake Drive."""
+        self.patcher.stop()
+        super().tearDown()
+
+    def test_crawl_mirrors_all_pages(self) -> None:
+        """Test that a first sync crawls every page and saves the cursor."""
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+
+        names = [
+            f["name"]
+            for f in DriveMirrorService.list_files(self.db_session, self.user.id)
+        ]
+        state = DriveSyncStateRepository.get_by_user_id(self.db_session, self.user.id)
+        assert names == ["Lecture 1", "Syllabus"]
+        assert state.changes_page_token == "start"
+        assert state.last_full_sync is not None
+
+    def test_changes_are_applied_incrementally(self) -> None:
+        """Test that a later sync only applies the changes feed."""
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+        self.changes = [
+            {"file_id": "1", "removed": True, "file": None},
+            {
+                "file_id": "3",
+                "removed": False,
+                "file": drive_file("3", "Lecture 2").model_dump(),
+            },
+        ]
+
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+
+        matches = DriveMirrorService.typeahead(self.db_session, self.user.id, "lec")
+        state = DriveSyncStateRepository.get_by_user_id(self.db_session, self.user.id)
+        assert [f.id for f in matches] == ["2", "3"]
+        assert state.changes_page_token == "after"
+
+    def test_expired_changes_token_falls_back_to_crawl(self) -> None:
+        """Test that a changes token Drive rejects is replaced by a crawl."""
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+        self.expired_tokens.add("start")
+        self.drive = {"2": "Lecture 1", "3": "Lecture 2"}
+
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+
+        state = DriveSyncStateRepository.get_by_user_id(self.db_session, self.user.id)
+        assert DriveFileRepository.get_drive_ids(self.db_session, self.user.id) == {
+            "2",
+            "3",
+        }
+        assert state.changes_page_token == "start"
+
+    def test_sync_drops_cached_search_pages(self) -> None:
+        """Test that crawls and changes syncs clear the user's live search cache."""
+        self.addCleanup(search_cache.clear)
+        search_cache.set((self.user.id, "lec", None, 10), {"files": []})
+        search_cache.set((self.user.id + 1, "lec", None, 10), {"files": []})
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+
+        assert search_cache.get((self.user.id, "lec", None, 10)) is None
+        assert search_cache.get((self.user.id + 1, "lec", None, 10)) is not None
+
+        search_cache.set((self.user.id, "lec", None, 10), {"files": []})
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+
+        assert search_cache.get((self.user.id, "lec", None, 10)) is None
+
+    def test_typeahead_ranks_prefix_matches_first(self) -> None:
+        """Test that names starting with the text come before other matches."""
+        self.drive = {"1": "Intro to Lectures", "2": "Lectures overview"}
+        asyncio.run(DriveMirrorService.sync_changes(self.db_session, self.user.id))
+
+        matches = DriveMirrorService.typeahead(
+            self.db_session,
+            self.user.id,
+            "lectures",
+        )
+
+        assert [f.id for f in matches] == ["2", "1"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Unit tests for the MCP server's Drive quota governor."""
+
+import json
+import unittest
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from app.mcp.server.quota import (
+    DriveQuota,
+    TokenBucket,
+    drive_calls,
+    drive_retries,
+    retry_reason,
+)
+
+
+def http_error(status: int, reason: str | None = None) -> HttpError:
+    """Build a Drive HttpError with an optional error reason."""
+    content = b""
+    if reason is not None:
+        content = json.dumps(
+            {"error": {"errors": [{"reason": reason}], "message": reason}},
+        ).encode()
+    return HttpError(httplib2.Response({"status": status}), content)
+
+
+class FlakyRequest:
+    """Callable that fails with the given errors before succeeding."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests for the QPS token bucket."""
+
+    def test_burst_then_wait(self) -> None:
+        """Test that requests beyond the burst are told to wait."""
+        bucket = TokenBucket(rate=10, burst=2)
+
+        waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert 0.05 < waits[2] <= 0.1
+
+
+class TestRetryReason(unittest.TestCase):
+    """Tests for classifying failed Drive requests."""
+
+    def test_rate_limits_and_server_errors_are_retried(self) -> None:
+        """Test the transient failures Drive documents as retryable."""
+        assert retry_reason(http_error(429)) == "rate_limit"
+        assert retry_reason(http_error(403, "userRateLimitExceeded")) == "rate_limit"
+        assert retry_reason(http_error(503)) == "server_error"
+
+    def test_other_errors_are_not_retried(self) -> None:
+        """Test that permission and missing-file errors fail fast."""
+        assert retry_reason(http_error(403, "insufficientFilePermissions")) is None
+        assert retry_reason(http_error(404, "notFound")) is None
+        assert retry_reason(ValueError("bad")) is None
+
+
+class TestDriveQuota(unittest.TestCase):
+    """Tests for QPS limiting and backoff around Drive requests."""
+
+    def setUp(self) -> None:
+        """Set up a governor that records sleeps instead of sleeping."""
+        self.sleeps: list[float] = []
+        self.quota = DriveQuota(
+            project_qps=100,
+            user_qps=2,
+            max_retries=3,
+            backoff_base=1,
+            backoff_max=4,
+            sleep=self.sleeps.append,
+        )
+
+    def test_rate_limited_request_is_retried(self) -> None:
+        """Test that a 429 followed by success returns the result."""
+        request = FlakyRequest(http_error(429), http_error(403, "rateLimitExceeded"))
+        before = drive_retries.value(reason="rate_limit")
+
+        result = self.quota.execute(1, "files.list", request)
+
+        assert result == "ok"
+        assert request.calls == 3
+        assert drive_retries.value(reason="rate_limit") == before + 2
+
+    def test_backoff_is_capped_and_jittered(self) -> None:
+        """Test that retry delays stay within the exponential ceiling."""
+        for attempt, ceiling in enumerate([1, 2, 4, 4, 4]):
+            assert 0 <= self.quota.backoff(attempt) <= ceiling
+        assert self.quota.backoff(0, retry_after=10) == 10
+
+    def test_retries_are_bounded(self) -> None:
+        """Test that the last error is raised once retries run out."""
+        request = FlakyRequest(*(http_error(503) for _ in range(5)))
+        before = drive_calls.value(method="files.get", outcome="error")
+
+        try:
+            self.quota.execute(1, "files.get", request)
+        except HttpError as e:
+            status = e.resp.status
+        else:
+            self.fail("HttpError not raised")
+
+        assert status == 503
+        assert request.calls == 4
+        assert drive_calls.value(method="files.get", outcome="error") == before + 1
+
+    def test_permanent_errors_fail_fast(self) -> None:
+        """Test that non-retryable errors are raised on the first attempt."""
+        request = FlakyRequest(http_error(404, "notFound"))
+
+        try:
+            self.quota.execute(1, "files.get", request)
+        except HttpError:
+            pass
+
+        assert request.calls == 1
+        assert self.sleeps == []
+
+    def test_per_user_limit(self) -> None:
+        """Test that one user is throttled without slowing down another."""
+        for _ in range(3):
+            self.quota.acquire(1)
+        self.quota.acquire(2)
+
+        assert len(self.sleeps) == 1
+        assert self.quota.utilization() > 0
+
+
+if __name__ == "__main__":
+    unittest.main()
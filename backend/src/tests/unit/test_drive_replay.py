@@ -0,0 +1,110 @@
+"""Unit tests for recording and replaying Drive HTTP traffic."""
+
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httplib2
+from googleapiclient.discovery import build
+
+from app.core.settings import settings
+from app.mcp.server.main import GoogleDriveClient, api_clients
+from app.mcp.server.replay import (
+    Exchange,
+    FixtureStore,
+    RecordingHttp,
+    ReplayHttp,
+    fixture_store,
+)
+from app.schemas.mcp import FileContent
+
+METADATA = {
+    "id": "doc-1",
+    "name": "Lecture notes",
+    "mimeType": "application/vnd.google-apps.document",
+    "webViewLink": "https://docs.google.com/document/d/doc-1",
+    "version": "7",
+}
+
+
+class FakeDrive:
+    """Transport answering metadata and export requests for one document."""
+
+    def request(self, uri: str, _method: str = "GET", **_: object) -> tuple:
+        """Return the export body or the metadata, depending on the path."""
+        body = b"exported text" if "/export" in uri else json.dumps(METADATA).encode()
+        return httplib2.Response({"status": 200}), body
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Tests for serving recorded Drive responses to the Drive client."""
+
+    def setUp(self) -> None:
+        """Record one document read into a fresh fixture file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "fixtures.jsonl"
+        recorder = GoogleDriveClient.__new__(GoogleDriveClient)
+        recorder.user_id = 1
+        recorder.service = build(
+            "drive",
+            "v3",
+            http=RecordingHttp(FakeDrive(), FixtureStore(self.path)),
+        )
+        recorder.get_file("doc-1")
+
+    def tearDown(self) -> None:
+        """Remove the fixture file."""
+        fixture_store.cache_clear()
+        api_clients.clear()
+        self.tmp.cleanup()
+
+    def test_replay_mode_needs_no_credentials(self) -> None:
+        """Test that a replaying client reads recorded files without tokens."""
+        with (
+            patch.object(settings, "drive_http_mode", "replay"),
+            patch.object(settings, "drive_fixtures", str(self.path)),
+            patch("app.mcp.server.main.AuthTokenService.get_auth_token") as tokens,
+        ):
+            result = GoogleDriveClient(1).get_file("doc-1")
+
+        assert isinstance(result, FileContent)
+        assert result.content == b"exported text"
+        assert result.revision == "7"
+        tokens.assert_not_called()
+
+    def test_fixture_file_is_reloaded(self) -> None:
+        """Test that recordings survive a restart."""
+        store = FixtureStore(self.path)
+
+        assert len(store) == 2
+
+    def test_unrecorded_request_is_not_found(self) -> None:
+        """Test that requests missing from the recording get a 404."""
+        replay = ReplayHttp(FixtureStore(self.path))
+
+        response, _ = replay.request("https://www.googleapis.com/drive/v3/files/x")
+
+        assert response.status == 404
+
+    def test_injected_errors_and_latency(self) -> None:
+        """Test that replay adds latency and fails the configured share."""
+        store = FixtureStore(self.path)
+        store.add("GET", "https://example.test/a?b=1&c=2", Exchange(200, {}, b"ok"))
+        slow = ReplayHttp(store, latency=0.02)
+        failing = ReplayHttp(store, error_rate=1.0, error_status=500)
+
+        start = time.perf_counter()
+        response, body = slow.request("https://example.test/a?c=2&b=1")
+        elapsed = time.perf_counter() - start
+        failed, _ = failing.request("https://example.test/a?b=1&c=2")
+
+        assert (response.status, body) == (200, b"ok")
+        assert elapsed >= 0.02
+        assert failed.status == 500
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+"""Unit tests for the course file chunk store."""
+
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from app.core.auth import get_password_hash
+from app.core.chunking import chunk_text
+from app.core.segments import SegmentStore
+from app.repository.course import CourseRepository
+from app.repository.file import FileRepository
+from app.repository.file_chunk import FileChunkRepository
+from app.repository.user import UserRepository
+from app.schemas.course import CourseCreate
+from app.schemas.file import FileCreate
+from app.schemas.user import UserCreate
+from app.services import file_chunk as file_chunk_service
+from app.services.file_chunk import file_checks
+from tests.base import BaseTestCase
+
+TOPICS = ["sorting", "graphs", "trees", "hashing", "recursion", "queues"]
+DOCUMENT = "\n\n".join(
+    f"Section {i} about {TOPICS[i % len(TOPICS)]}. " + "Some more words here. " * 8
+    for i in range(60)
+)
+
+
+def edit_section(text: str, index: int) -> str:
+    """Return ``text`` with one paragraph changed."""
+    paragraphs = text.split("\n\n")
+    paragraphs[index] = "Rewritten: " + paragraphs[index]
+    return "\n\n".join(paragraphs)
+
+
+class TestChunkText(unittest.TestCase):
+    """Tests for content-defined chunking."""
+
+    def test_offsets_cover_chunk_text(self) -> None:
+        """Test that every chunk is the slice of the source its offsets name."""
+        chunks = chunk_text(DOCUMENT, min_tokens=50, max_tokens=200)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert DOCUMENT[chunk.start : chunk.end] == chunk.text
+            assert chunk.token_count <= 200
+
+    def test_edit_only_changes_nearby_chunks(self) -> None:
+        """Test that changing one paragraph leaves most chunk hashes intact."""
+        before = chunk_text(DOCUMENT, min_tokens=50, max_tokens=200)
+        after = chunk_text(edit_section(DOCUMENT, 30), min_tokens=50, max_tokens=200)
+
+        changed = {c.content_hash for c in after} - {c.content_hash for c in before}
+        assert 1 <= len(changed) <= 2
+
+    def test_long_paragraph_is_split(self) -> None:
+        """Test that a paragraph over the maximum is cut into several chunks."""
+        chunks = chunk_text("word " * 1000, min_tokens=50, max_tokens=100)
+
+        assert len(chunks) > 1
+        assert all(chunk.token_count <= 100 for chunk in chunks)
+
+    def test_blank_text_has_no_chunks(self) -> None:
+        """Test that whitespace-only content produces no chunks."""
+        assert chunk_text(" \n\n \n", min_tokens=50, max_tokens=100) == []
+
+
+class TestFileChunkStore(BaseTestCase):
+    """Tests for storing and reading file chunks."""
+
+    def setUp(self) -> None:
+        """Set up a user with a course file and an empty chunk text store."""
+        super().setUp()
+        self.store_dir = tempfile.TemporaryDirectory()
+        self.store_patcher = patch(
+            "app.repository.file_chunk.chunk_store",
+            SegmentStore(self.store_dir.name),
+        )
+        self.store_patcher.start()
+        hashed_password = get_password_hash(self.test_user_data["password"])
+        self.user = UserRepository.create(
+            self.db_session,
+            UserCreate(**self.test_user_data),
+            hashed_password,
+        )
+        course = CourseRepository.create(
+            self.db_session,
+            CourseCreate(**self.test_class_data),
+            self.user.id,
+        )
+        self.file = FileRepository.create(
+            self.db_session,
+            FileCreate(name="Notes", google_drive_id="doc-1", course_id=course.id),
+            self.user.id,
+        )
+
+    def tearDown(self) -> None:
+        """Restore the chunk text store and remove its files."""
+        self.store_patcher.stop()
+        self.store_dir.cleanup()
+        super().tearDown()
+
+    def ingest(self, read_result: dict) -> dict:
+        """Ingest ``self.file`` with Drive returning ``read_result``."""
+        with patch(
+            "app.services.file_chunk.GoogleDriveService.read_file",
+            AsyncMock(return_value=read_result),
+        ) as read_file:
+            result = asyncio.run(
+                file_chunk_service.ingest_file(
+                    self.db_session,
+                    self.file,
+                    self.user.id,
+                ),
+            )
+        self.read_kwargs = read_file.call_args.kwargs
+        return result.model_dump()
+
+    def test_new_revision_only_rewrites_changed_chunks(self) -> None:
+        """Test that re-ingesting keeps chunks whose hash is unchanged."""
+        first = self.ingest(
+            {"content": DOCUMENT, "revision": "1", "not_modified": False},
+        )
+        stored = FileChunkRepository.get_by_file(self.db_session, self.file.id)
+        ids_before = {chunk.content_hash: chunk.id for chunk in stored}
+
+        second = self.ingest(
+            {
+                "content": edit_section(DOCUMENT, 30),
+                "revision": "2",
+                "not_modified": False,
+            },
+        )
+        stored = FileChunkRepository.get_by_file(self.db_session, self.file.id)
+
+        assert first["inserted"] == len(ids_before)
+        assert second["inserted"] == second["deleted"] >= 1
+        assert second["kept"] == len(stored) - second["inserted"]
+        kept = [c for c in stored if c.content_hash in ids_before]
+        assert all(ids_before[c.content_hash] == c.id for c in kept)
+        assert [c.position for c in stored] == list(range(len(stored)))
+        assert self.file.revision == "2"
+
+    def test_unchanged_revision_is_not_rechunked(self) -> None:
+        """Test that the stored revision is sent as a conditional read."""
+        self.ingest({"content": DOCUMENT, "revision": "1", "not_modified": False})
+
+        result = self.ingest({"content": "", "revision": "1", "not_modified": True})
+
+        assert result["not_modified"]
+        assert self.read_kwargs["if_none_match"] == "1"
+        assert FileChunkRepository.get_by_file(self.db_session, self.file.id)
+
+    def test_chunk_text_is_read_from_segment_store(self) -> None:
+        """Test that stored chunks reassemble the ingested text."""
+        self.ingest({"content": DOCUMENT, "revision": "1", "not_modified": False})
+
+        chunks = file_chunk_service.get_file_chunks(
+            self.db_session,
+            self.file.id,
+            self.user.id,
+        )
+
+        assert all(DOCUMENT[c.start_offset : c.end_offset] == c.text for c in chunks)
+
+    def test_course_context_prefers_matching_chunks(self) -> None:
+        """Test that prompt material is ranked by the question and budgeted."""
+        self.ingest({"content": DOCUMENT, "revision": "1", "not_modified": False})
+
+        context = file_chunk_service.build_course_context(
+            self.db_session,
+            [self.file],
+            "explain hashing",
+            budget_tokens=250,
+        )
+
+        assert list(context) == ["doc-1"]
+        assert "hashing" in context["doc-1"]
+        assert context["doc-1"].startswith("(Excerpt:")
+
+    def refresh(self, read_result: dict) -> tuple[dict, int]:
+        """Refresh ``self.file`` before a turn, Drive returning ``read_result``."""
+        with patch(
+            "app.services.file_chunk.GoogleDriveService.read_file",
+            AsyncMock(return_value=read_result),
+        ) as read_file:
+            failures = asyncio.run(
+                file_chunk_service.refresh_course_files(
+                    self.db_session,
+                    [self.file],
+                    self.user.id,
+                ),
+            )
+        return failures, read_file.call_count
+
+    def test_course_files_are_rechecked_after_the_interval(self) -> None:
+        """Test that tutor turns pick up Drive edits once the check expires."""
+        self.refresh({"content": DOCUMENT, "revision": "1", "not_modified": False})
+        _, reads = self.refresh({"content": "", "revision": "1", "not_modified": True})
+        file_checks.pop(self.file.id)
+
+        failures, again = self.refresh(
+            {"content": "Rewritten notes.", "revision": "2", "not_modified": False},
+        )
+
+        assert (reads, again, failures) == (0, 1, {})
+        assert self.file.revision == "2"
+
+    def test_unreadable_file_is_noted_in_context(self) -> None:
+        """Test that a file Drive cannot serve is reported, not dropped."""
+        failures, _ = self.refresh({"error": "File not found"})
+
+        context = file_chunk_service.build_course_context(
+            self.db_session,
+            [self.file],
+            "anything",
+            budget_tokens=250,
+            failures=failures,
+        )
+
+        assert "File not found" in failures[self.file.id]
+        assert "File not found" in context["doc-1"]
+        assert "not available" in context["doc-1"]
+
+    def test_chunks_are_deleted_with_file(self) -> None:
+        """Test that deleting a file removes its chunks."""
+        self.ingest({"content": DOCUMENT, "revision": "1", "not_modified": False})
+        file_id = self.file.id
+
+        FileRepository.delete(self.db_session, self.file)
+
+        assert FileChunkRepository.get_by_file(self.db_session, file_id) == []
+
+
+if __name__ == "__main__":
+    unittest.main()
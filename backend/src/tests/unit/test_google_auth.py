@@ -0,0 +1,106 @@
+"""Unit tests for the shared Google OAuth HTTP clients."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+import httpx
+
+from app.core.google_auth import (
+    GoogleHttp,
+    RefreshRevokedError,
+    get_google_email,
+    handle_oauth_callback,
+    refresh_credentials,
+)
+
+
+class FakeGoogle:
+    """Token and userinfo endpoints recording the requests they receive."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith("/userinfo"):
+            return httpx.Response(200, json={"email": "test@example.com"})
+        form = parse_qs(request.content.decode())
+        if form.get("refresh_token") == ["revoked"]:
+            return httpx.Response(400, json={"error": "invalid_grant"})
+        if form["grant_type"] == ["refresh_token"]:
+            return httpx.Response(
+                200,
+                json={"access_token": "fresh", "expires_in": 3599},
+            )
+        return httpx.Response(
+            200,
+            json={
+                "access_token": "access",
+                "refresh_token": "refresh",
+                "expires_in": 3599,
+                "scope": "openid",
+            },
+        )
+
+
+class TestGoogleHttp(unittest.TestCase):
+    """Tests for OAuth calls over the shared clients."""
+
+    def setUp(self) -> None:
+        """Route a fresh set of clients to a fake Google."""
+        self.google = FakeGoogle()
+        self.http = GoogleHttp()
+        options = {"transport": httpx.MockTransport(self.google)}
+        for patcher in (
+            patch("app.core.google_auth.google_http", self.http),
+            patch.object(GoogleHttp, "_options", return_value=options),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_refreshes_reuse_one_client(self) -> None:
+        """Test that refreshes share a client and keep the refresh token."""
+        first = refresh_credentials("refresh")
+        client = self.http.sync_client()
+        second = refresh_credentials("refresh")
+
+        assert self.http.sync_client() is client
+        assert len(self.google.requests) == 2
+        assert first["access_token"] == second["access_token"] == "fresh"
+        assert first["refresh_token"] == "refresh"
+        assert first["expiry"] is not None
+
+    def test_revoked_refresh_token(self) -> None:
+        """Test that invalid_grant is reported as a revoked refresh token."""
+        try:
+            refresh_credentials("revoked")
+        except RefreshRevokedError:
+            pass
+        else:
+            self.fail("RefreshRevokedError not raised")
+
+    def test_code_exchange_and_userinfo(self) -> None:
+        """Test the sign-up callback calls on the async client."""
+
+        async def scenario() -> tuple[dict, str | None, bool]:
+            creds = await handle_oauth_callback("code")
+            client = self.http.client()
+            email = await get_google_email(creds["access_token"])
+            shared = self.http.client() is client
+            await self.http.close()
+            return creds, email, shared
+
+        creds, email, shared = asyncio.run(scenario())
+
+        assert creds["refresh_token"] == "refresh"
+        assert creds["scopes"] == ["openid"]
+        assert email == "test@example.com"
+        assert shared
+        userinfo = self.google.requests[1]
+        assert userinfo.headers["Authorization"] == "Bearer access"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,321 @@
+"""Unit tests for the MCP server's Google Drive client."""
+
+import threading
+import unittest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.mcp.server.main import GoogleDriveClient, api_clients, credentials_cache
+from app.mcp.server.sheets import sheet_tables
+from app.mcp.server.slides import slide_decks
+from app.models.auth_token import AuthToken
+from app.schemas.mcp import FileContent, FileNotModified, SheetRows, SlideDeck
+
+DOC_METADATA = {
+    "id": "doc-1",
+    "name": "Lecture notes",
+    "mimeType": "application/vnd.google-apps.document",
+    "webViewLink": "https://docs.google.com/document/d/doc-1",
+    "modifiedTime": "2025-10-01T12:00:00.000Z",
+    "version": "42",
+}
+
+
+def make_client(metadata: dict, exported: str = "") -> GoogleDriveClient:
+    """Build a GoogleDriveClient backed by a mocked Drive service."""
+    client = GoogleDriveClient.__new__(GoogleDriveClient)
+    client.user_id = 1
+    service = MagicMock()
+    files = service.files.return_value
+    files.get.return_value.execute.return_value = metadata
+    files.export.return_value.execute.return_value = exported
+    client.service = service
+    return client
+
+
+class TestConditionalRead(unittest.TestCase):
+    """Tests for metadata-first conditional reads."""
+
+    def test_read_returns_revision(self) -> None:
+        """Test that a full read reports the file's revision fingerprint."""
+        client = make_client(DOC_METADATA, exported="hello")
+
+        result = client.get_file("doc-1")
+
+        assert isinstance(result, FileContent)
+        assert result.content == "hello"
+        assert result.revision == "42"
+
+    def test_matching_revision_skips_export(self) -> None:
+        """Test that a matching fingerprint only costs the metadata call."""
+        client = make_client(DOC_METADATA, exported="hello")
+
+        result = client.get_file("doc-1", if_none_match="42")
+
+        assert isinstance(result, FileNotModified)
+        assert result.not_modified
+        client.service.files.return_value.export.assert_not_called()
+
+    def test_modified_time_is_accepted_as_fingerprint(self) -> None:
+        """Test that modifiedTime also counts as a known revision."""
+        client = make_client(DOC_METADATA, exported="hello")
+
+        result = client.get_file("doc-1", if_none_match=DOC_METADATA["modifiedTime"])
+
+        assert isinstance(result, FileNotModified)
+
+    def test_stale_revision_downloads_content(self) -> None:
+        """Test that an outdated fingerprint falls through to the export."""
+        client = make_client(DOC_METADATA, exported="new content")
+
+        result = client.get_file("doc-1", if_none_match="41")
+
+        assert isinstance(result, FileContent)
+        assert result.content == "new content"
+
+    def test_md5_checksum_is_preferred(self) -> None:
+        """Test that binary files use md5Checksum as their revision."""
+        metadata = {**DOC_METADATA, "mimeType": "text/plain", "md5Checksum": "abc"}
+
+        assert GoogleDriveClient.revision_of(metadata) == "abc"
+
+
+class TestSearchFiles(unittest.TestCase):
+    """Tests for paginated Drive search."""
+
+    def test_page_token_and_quotes_are_forwarded(self) -> None:
+        """Test that the cursor is passed on and quotes are escaped."""
+        client = make_client(DOC_METADATA)
+        files = client.service.files.return_value
+        files.list.return_value.execute.return_value = {
+            "files": [],
+            "nextPageToken": "page-3",
+        }
+
+        result = client.search_files("it's", page_size=5, page_token="page-2")
+
+        kwargs = files.list.call_args.kwargs
+        assert kwargs["pageToken"] == "page-2"
+        assert kwargs["pageSize"] == 5
+        assert kwargs["q"] == "name contains 'it\\'s'"
+        assert result.next_page_token == "page-3"
+
+
+SHEET_METADATA = {
+    **DOC_METADATA,
+    "id": "sheet-1",
+    "mimeType": "application/vnd.google-apps.spreadsheet",
+}
+SHEET_CSV = "name,score\n" + "\n".join(f"s{i},{i}" for i in range(100))
+
+
+class TestSheetDigest(unittest.TestCase):
+    """Tests for spreadsheet digests and on-demand rows."""
+
+    def setUp(self) -> None:
+        """Start without any parsed sheets cached."""
+        sheet_tables.clear()
+
+    def tearDown(self) -> None:
+        """Drop parsed sheets."""
+        sheet_tables.clear()
+
+    def test_digest_replaces_large_csv(self) -> None:
+        """Test that a large sheet is summarized when a digest is requested."""
+        client = make_client(SHEET_METADATA, exported=SHEET_CSV.encode())
+
+        result = client.get_file("sheet-1", sheet_digest=True)
+
+        assert result.digest is not None
+        assert result.digest.rows == 100
+        assert result.content.startswith("Spreadsheet digest: 100 rows x 2 columns")
+
+    def test_full_csv_without_digest(self) -> None:
+        """Test that the default read still returns the whole export."""
+        client = make_client(SHEET_METADATA, exported=SHEET_CSV)
+
+        result = client.get_file("sheet-1")
+
+        assert result.content == SHEET_CSV
+        assert result.digest is None
+
+    def test_sheet_is_parsed_once_per_revision(self) -> None:
+        """Test that digests and row reads share one export per revision."""
+        client = make_client(SHEET_METADATA, exported=SHEET_CSV)
+
+        client.get_file("sheet-1", sheet_digest=True)
+        rows = client.read_sheet_rows("sheet-1", offset=98, limit=10)
+
+        assert isinstance(rows, SheetRows)
+        assert rows.rows == [["s98", "98"], ["s99", "99"]]
+        assert rows.total_rows == 100
+        assert client.service.files.return_value.export.call_count == 1
+
+    def test_rows_of_non_sheet(self) -> None:
+        """Test that reading rows of a document is an error."""
+        client = make_client(DOC_METADATA)
+
+        assert "error" in client.read_sheet_rows("doc-1")
+
+
+DECK_METADATA = {
+    **DOC_METADATA,
+    "id": "deck-1",
+    "mimeType": "application/vnd.google-apps.presentation",
+}
+DECK = {
+    "slides": [
+        {
+            "objectId": f"slide-{i}",
+            "pageElements": [
+                {
+                    "shape": {
+                        "placeholder": {"type": "TITLE"},
+                        "text": {
+                            "textElements": [{"textRun": {"content": f"Topic {i}"}}],
+                        },
+                    },
+                },
+            ],
+        }
+        for i in range(1, 4)
+    ],
+}
+
+
+class TestSlideChunks(unittest.TestCase):
+    """Tests for reading presentations slide by slide."""
+
+    def setUp(self) -> None:
+        """Set up a client whose Slides API returns a three-slide deck."""
+        slide_decks.clear()
+        self.client = make_client(DECK_METADATA, exported="flat text")
+        self.client.slides = MagicMock()
+        presentations = self.client.slides.presentations.return_value
+        presentations.get.return_value.execute.return_value = DECK
+
+    def tearDown(self) -> None:
+        """Drop cached slide chunks."""
+        slide_decks.clear()
+
+    def test_read_returns_slide_chunks(self) -> None:
+        """Test that a chunked read carries one chunk per slide."""
+        result = self.client.get_file("deck-1", slide_chunks=True)
+
+        assert [s.title for s in result.slides] == ["Topic 1", "Topic 2", "Topic 3"]
+        assert result.content.startswith("Slide 1: Topic 1\n\nSlide 2: Topic 2")
+        self.client.service.files.return_value.export.assert_not_called()
+
+    def test_slides_are_addressable_and_cached(self) -> None:
+        """Test fetching single slides by ID from the per-revision cache."""
+        self.client.get_file("deck-1", slide_chunks=True)
+        deck = self.client.read_slides("deck-1", slide_ids=["slide-2"])
+
+        assert isinstance(deck, SlideDeck)
+        assert [s.id for s in deck.slides] == ["slide-2"]
+        assert deck.total_slides == 3
+        presentations = self.client.slides.presentations.return_value
+        assert presentations.get.call_count == 1
+
+
+class TestCredentialsCache(unittest.TestCase):
+    """Tests for the MCP server's read-only OAuth token cache."""
+
+    def setUp(self) -> None:
+        """Start every test with an empty cache and no real Drive service."""
+        credentials_cache.clear()
+        api_clients.clear()
+        self.build_patcher = patch("app.mcp.server.main.build")
+        self.build_patcher.start()
+
+    def tearDown(self) -> None:
+        """Drop cached tokens and restore the Drive client factory."""
+        self.build_patcher.stop()
+        credentials_cache.clear()
+        api_clients.clear()
+
+    def stored_tokens(self, expires_in: timedelta) -> AuthToken:
+        """Build decrypted tokens expiring ``expires_in`` from now."""
+        expiry = (datetime.now(UTC) + expires_in).replace(tzinfo=None)
+        return AuthToken(
+            access_token="access",
+            refresh_token="refresh",
+            expiry=expiry.isoformat(),
+            user_id=1,
+        )
+
+    def test_tokens_are_loaded_once(self) -> None:
+        """Test that back-to-back tool calls share one database lookup."""
+        with patch(
+            "app.mcp.server.main.AuthTokenService.get_auth_token",
+            return_value=self.stored_tokens(timedelta(hours=1)),
+        ) as get_auth_token:
+            GoogleDriveClient(1)
+            client = GoogleDriveClient(1)
+
+        assert get_auth_token.call_count == 1
+        assert client.user_id == 1
+
+    def test_nearly_expired_tokens_are_not_cached(self) -> None:
+        """Test that tokens about to expire are always re-read."""
+        with patch(
+            "app.mcp.server.main.AuthTokenService.get_auth_token",
+            return_value=self.stored_tokens(timedelta(seconds=30)),
+        ) as get_auth_token:
+            GoogleDriveClient(1)
+            GoogleDriveClient(1)
+
+        assert get_auth_token.call_count == 2
+
+
+class TestApiClientCache(unittest.TestCase):
+    """Tests for reusing built Drive clients across tool calls."""
+
+    def setUp(self) -> None:
+        """Serve tokens from the cache and count client builds."""
+        api_clients.clear()
+        credentials_cache.put(1, "access", "refresh", ttl=60)
+        self.build_patcher = patch(
+            "app.mcp.server.main.build",
+            side_effect=lambda *_args, **_kwargs: MagicMock(),
+        )
+        self.build = self.build_patcher.start()
+
+    def tearDown(self) -> None:
+        """Drop cached clients and tokens."""
+        self.build_patcher.stop()
+        credentials_cache.clear()
+        api_clients.clear()
+
+    def test_client_is_built_once_per_thread(self) -> None:
+        """Test that tool calls on one thread share a client."""
+        first = GoogleDriveClient(1).service
+        second = GoogleDriveClient(1).service
+
+        assert first is second
+        assert self.build.call_count == 1
+
+    def test_threads_do_not_share_clients(self) -> None:
+        """Test that another worker thread builds its own client."""
+        here = GoogleDriveClient(1).service
+        there = []
+        worker = threading.Thread(
+            target=lambda: there.append(GoogleDriveClient(1).service),
+        )
+        worker.start()
+        worker.join()
+
+        assert there[0] is not here
+        assert self.build.call_count == 2
+
+    def test_new_access_token_rebuilds_client(self) -> None:
+        """Test that a refreshed token is not sent through a stale client."""
+        first = GoogleDriveClient(1).service
+        credentials_cache.put(1, "new-access", "refresh", ttl=60)
+
+        assert GoogleDriveClient(1).service is not first
+        assert self.build.call_count == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
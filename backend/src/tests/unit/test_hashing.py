@@ -0,0 +1,97 @@
+"""Unit tests for the password hashing pool."""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from app.core.hashing import (
+    HashingBusyError,
+    HashingPool,
+    check_password,
+    hash_password,
+    hash_rejected,
+    hash_seconds,
+)
+from app.services.user import UserService
+from tests.base import BaseTestCase
+
+
+class TestHashingPool(unittest.TestCase):
+    """Tests for hashing off the event loop with a bounded queue."""
+
+    def setUp(self) -> None:
+        """Set up a pool with one worker and room for one waiting call."""
+        self.pool = HashingPool(max_workers=1, max_queue=1)
+
+    def tearDown(self) -> None:
+        """Shut the pool down."""
+        self.pool.shutdown()
+
+    def test_hash_and_verify_round_trip(self) -> None:
+        """Test that hashes made on the pool verify, and latency is recorded."""
+        before = hash_seconds.count(operation="verify")
+
+        async def scenario() -> tuple[bool, bool]:
+            hashed = await hash_password("Test@123")
+            return (
+                await check_password("Test@123", hashed),
+                await check_password("wrong", hashed),
+            )
+
+        assert asyncio.run(scenario()) == (True, False)
+        assert hash_seconds.count(operation="verify") == before + 2
+
+    def test_full_queue_is_refused(self) -> None:
+        """Test that calls beyond workers plus queue fail fast."""
+        release = threading.Event()
+        rejected = hash_rejected.value(operation="test")
+
+        async def scenario() -> None:
+            running = asyncio.ensure_future(self.pool.run("test", release.wait))
+            waiting = asyncio.ensure_future(self.pool.run("test", release.wait))
+            await asyncio.sleep(0.05)
+            try:
+                await self.pool.run("test", release.wait)
+            except HashingBusyError:
+                pass
+            else:
+                self.fail("HashingBusyError not raised")
+            release.set()
+            await asyncio.gather(running, waiting)
+
+        asyncio.run(scenario())
+
+        assert hash_rejected.value(operation="test") == rejected + 1
+        assert self.pool.pending == 0
+
+
+class TestLoginWhenBusy(BaseTestCase):
+    """Tests for the API's response to a saturated hashing pool."""
+
+    def test_authenticate_returns_503(self) -> None:
+        """Test that a refused verification surfaces as 503 with Retry-After."""
+        self.create_registered_user()
+
+        with patch("app.services.user.check_password", side_effect=HashingBusyError):
+            try:
+                asyncio.run(
+                    UserService.authenticate(
+                        self.db_session,
+                        self.test_user_data["email"],
+                        self.test_user_data["password"],
+                    ),
+                )
+            except HTTPException as e:
+                error = e
+            else:
+                self.fail("HTTPException not raised")
+
+        assert error.status_code == 503
+        assert error.headers == {"Retry-After": "1"}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Unit tests for login throttling."""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.login_limiter import (
+    LoginLimiter,
+    SlidingWindow,
+    client_ip,
+    login_attempts,
+    login_limiter,
+    login_rejected,
+)
+from app.services.user import UserService
+from tests.base import BaseTestCase
+
+
+class TestSlidingWindow(unittest.TestCase):
+    """Tests for counting events over a sliding window."""
+
+    def test_limit_lifts_as_events_age_out(self) -> None:
+        """Test that a key is refused at its limit until the oldest event expires."""
+        window = SlidingWindow(limit=2, window=0.2, max_keys=10)
+        window.hit("key")
+        time.sleep(0.1)
+        window.hit("key")
+
+        assert 0 < window.retry_after("key") <= 0.1
+        time.sleep(0.12)
+        assert window.retry_after("key") == 0
+
+    def test_least_recent_keys_are_forgotten(self) -> None:
+        """Test that the number of remembered keys is bounded."""
+        window = SlidingWindow(limit=1, window=60, max_keys=2)
+        for key in ("a", "b", "c"):
+            window.hit(key)
+
+        assert window.retry_after("a") == 0
+        assert window.retry_after("c") > 0
+
+
+class TestLoginLimiter(unittest.TestCase):
+    """Tests for per-account and per-IP failure limits."""
+
+    def setUp(self) -> None:
+        """Allow two failures per account and three per IP."""
+        self.limiter = LoginLimiter(
+            window=60,
+            max_per_account=2,
+            max_per_ip=3,
+            max_keys=100,
+        )
+
+    def test_success_clears_account_failures(self) -> None:
+        """Test that logging in successfully resets the account's count."""
+        for success in (False, True, False):
+            self.limiter.check("user@example.com", "10.0.0.1")
+            self.limiter.record("User@Example.com", "10.0.0.1", success=success)
+
+        assert self.limiter.check("user@example.com", "10.0.0.1") == 0
+
+    def test_attempts_in_flight_count_against_the_limit(self) -> None:
+        """Test that parallel attempts cannot all pass before one fails."""
+        assert self.limiter.check("user@example.com", "10.0.0.1") == 0
+        assert self.limiter.check("user@example.com", "10.0.0.2") == 0
+        assert self.limiter.check("user@example.com", "10.0.0.3") > 0
+
+        self.limiter.release("user@example.com", "10.0.0.1")
+        self.limiter.record("user@example.com", "10.0.0.2", success=False)
+
+        assert self.limiter.check("user@example.com", "10.0.0.3") == 0
+        self.limiter.record("user@example.com", "10.0.0.3", success=False)
+        assert self.limiter.check("user@example.com", "10.0.0.4") > 0
+
+    def test_stuffing_from_one_ip_is_refused(self) -> None:
+        """Test that failures spread over accounts still hit the IP limit."""
+        rejected = login_rejected.value(limit="ip")
+        for n in range(3):
+            self.limiter.check(f"user{n}@example.com", "10.0.0.1")
+            self.limiter.record(f"user{n}@example.com", "10.0.0.1", success=False)
+
+        assert self.limiter.check("other@example.com", "10.0.0.1") > 0
+        assert self.limiter.check("other@example.com", "10.0.0.2") == 0
+        assert login_rejected.value(limit="ip") == rejected + 1
+
+
+class TestClientIp(unittest.TestCase):
+    """Tests for finding the client address behind a reverse proxy."""
+
+    def request(self, peer: str, forwarded: str | None = None) -> Request:
+        headers = (
+            [] if forwarded is None else [(b"x-forwarded-for", forwarded.encode())]
+        )
+        return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+    def test_forwarded_address_from_trusted_proxy(self) -> None:
+        """Test that the proxy's peer address is replaced by the client's."""
+        request = self.request("127.0.0.1", "203.0.113.9, 198.51.100.7")
+
+        assert client_ip(request) == "198.51.100.7"
+
+    def test_header_from_untrusted_peer_is_ignored(self) -> None:
+        """Test that a client cannot choose its address with the header."""
+        request = self.request("198.51.100.7", "203.0.113.9")
+
+        assert client_ip(request) == "198.51.100.7"
+
+
+class TestAuthenticateThrottling(BaseTestCase):
+    """Tests for refusing logins before verifying the password."""
+
+    def authenticate(self, password: str) -> object:
+        return asyncio.run(
+            UserService.authenticate(
+                self.db_session,
+                self.test_user_data["email"],
+                password,
+                client_ip="10.0.0.1",
+            ),
+        )
+
+    def test_refused_attempts_skip_verification(self) -> None:
+        """Test that once the account limit is hit no hash is computed."""
+        self.create_registered_user()
+        failures = login_attempts.value(outcome="failure")
+        for _ in range(login_limiter.accounts.limit):
+            assert self.authenticate("wrong") is None
+
+        with patch("app.services.user.check_password") as check:
+            try:
+                self.authenticate(self.test_user_data["password"])
+            except HTTPException as e:
+                error = e
+            else:
+                self.fail("HTTPException not raised")
+
+        assert error.status_code == 429
+        assert int(error.headers["Retry-After"]) > 0  # pyright: ignore[reportOptionalSubscript]
+        assert check.call_count == 0
+        assert (
+            login_attempts.value(outcome="failure")
+            == failures + login_limiter.accounts.limit
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+"""Unit tests for the API-side MCP client."""
+
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastmcp import Client, FastMCP
+from fastmcp.client.transports import FastMCPTransport, StreamableHttpTransport
+from fastmcp.exceptions import ToolError
+
+from app.core.compression import GZIP_BASE64, compress_text
+from app.core.mcp_client import (
+    MCPClientPool,
+    get_mcp_client,
+    pool_recycles,
+    tool_data,
+)
+from app.core.settings import settings
+from app.mcp.server.main import mcp
+from app.schemas.mcp import FileContent
+
+echo_server = FastMCP()
+
+
+@echo_server.tool()
+def echo(text: str) -> str:
+    """Return the text unchanged."""
+    return text
+
+
+@echo_server.tool()
+def fail() -> str:
+    """Always raise a tool error."""
+    msg = "tool failed"
+    raise ValueError(msg)
+
+
+class TestMCPClientTransport(unittest.TestCase):
+    """Tests for choosing between HTTP and in-process MCP transports."""
+
+    def test_http_transport_by_default(self) -> None:
+        """Test that the default transport targets the configured MCP server."""
+        with patch.object(settings, "mcp_transport", "http"):
+            client = get_mcp_client()
+
+        assert isinstance(client.transport, StreamableHttpTransport)
+        assert client.transport.url == settings.mcp_server
+
+    def test_memory_transport_mounts_server(self) -> None:
+        """Test that the memory transport talks to the in-process server."""
+        with patch.object(settings, "mcp_transport", "memory"):
+            client = get_mcp_client()
+
+        async def list_tool_names() -> set[str]:
+            async with client:
+                return {tool.name for tool in await client.list_tools()}
+
+        assert isinstance(client.transport, FastMCPTransport)
+        assert {"gdrive_search", "gdrive_read_file"} <= asyncio.run(
+            list_tool_names(),
+        )
+
+
+class TestMCPClientPool(unittest.TestCase):
+    """Tests for the pooled MCP client sessions."""
+
+    def setUp(self) -> None:
+        """Set up a pool whose sessions talk to a small in-process server."""
+        self.created: list[Client] = []
+
+        def factory() -> Client:
+            client = Client(echo_server)
+            self.created.append(client)
+            return client
+
+        self.pool = MCPClientPool(size=2, health_check_interval=60, factory=factory)
+
+    def test_sessions_are_reused(self) -> None:
+        """Test that sequential borrows share one initialized session."""
+
+        async def scenario() -> list[str]:
+            await self.pool.start()
+            results = []
+            for word in ("a", "b", "c"):
+                async with self.pool.session() as client:
+                    result = await client.call_tool("echo", {"text": word})
+                    results.append(result.data)
+            await self.pool.close()
+            return results
+
+        assert asyncio.run(scenario()) == ["a", "b", "c"]
+        assert len(self.created) == 2
+
+    def test_pool_is_bounded(self) -> None:
+        """Test that concurrent borrowers never open more than ``size`` sessions."""
+
+        async def borrow() -> None:
+            async with self.pool.session() as client:
+                await client.call_tool("echo", {"text": "x"})
+                await asyncio.sleep(0.01)
+
+        async def scenario() -> None:
+            await asyncio.gather(*(borrow() for _ in range(8)))
+            await self.pool.close()
+
+        asyncio.run(scenario())
+        assert len(self.created) == 2
+
+    def test_tool_errors_keep_session(self) -> None:
+        """Test that a tool-level error does not recycle the session."""
+
+        async def scenario() -> None:
+            try:
+                async with self.pool.session() as client:
+                    await client.call_tool("fail", {})
+            except ToolError:
+                pass
+            async with self.pool.session() as client:
+                await client.call_tool("echo", {"text": "ok"})
+            await self.pool.close()
+
+        asyncio.run(scenario())
+        assert len(self.created) == 1
+
+    def test_other_errors_recycle_session(self) -> None:
+        """Test that a session is replaced after an unexpected error."""
+        before = pool_recycles.value(reason="error")
+
+        async def drop_connection(_client: Client) -> None:
+            raise ConnectionError
+
+        async def scenario() -> None:
+            try:
+                async with self.pool.session() as client:
+                    await drop_connection(client)
+            except ConnectionError:
+                pass
+            async with self.pool.session() as client:
+                await client.call_tool("echo", {"text": "ok"})
+            await self.pool.close()
+
+        asyncio.run(scenario())
+        assert len(self.created) == 2
+        assert pool_recycles.value(reason="error") == before + 1
+
+    def test_caller_errors_keep_session(self) -> None:
+        """Test that an error raised by the caller's own code keeps the session."""
+
+        def lookup(_client: Client) -> None:
+            raise KeyError
+
+        async def scenario() -> None:
+            try:
+                async with self.pool.session() as client:
+                    lookup(client)
+            except KeyError:
+                pass
+            async with self.pool.session() as client:
+                await client.call_tool("echo", {"text": "ok"})
+            await self.pool.close()
+
+        asyncio.run(scenario())
+        assert len(self.created) == 1
+
+    def test_discard_wakes_waiting_borrower(self) -> None:
+        """Test that a borrower waiting on a full pool gets a replacement session."""
+        self.pool.size = 1
+        borrowed = asyncio.Event()
+
+        async def drop_connection(_client: Client) -> None:
+            await asyncio.sleep(0.05)
+            raise ConnectionError
+
+        async def broken() -> None:
+            try:
+                async with self.pool.session() as client:
+                    borrowed.set()
+                    await drop_connection(client)
+            except ConnectionError:
+                pass
+
+        async def waiting() -> str:
+            await borrowed.wait()
+            async with self.pool.session() as client:
+                result = await client.call_tool("echo", {"text": "ok"})
+                return result.data
+
+        async def scenario() -> str:
+            _, text = await asyncio.wait_for(
+                asyncio.gather(broken(), waiting()),
+                timeout=5,
+            )
+            await self.pool.close()
+            return text
+
+        assert asyncio.run(scenario()) == "ok"
+        assert len(self.created) == 2
+
+
+class TestStructuredToolOutput(unittest.TestCase):
+    """Tests for the structured Drive tool contract."""
+
+    def read_file(self, content: str, accept_encoding: str | None) -> object:
+        """Call gdrive_read_file in-process against a faked Drive client."""
+        file = FileContent(metadata={"id": "f"}, content=content, revision="1")
+
+        async def call() -> object:
+            async with Client(mcp) as client:
+                return await client.call_tool(
+                    "gdrive_read_file",
+                    {"file_id": "f", "user_id": 1, "accept_encoding": accept_encoding},
+                )
+
+        with patch("app.mcp.server.main.GoogleDriveClient") as drive_client:
+            drive_client.return_value.get_file.return_value = file
+            return asyncio.run(call())
+
+    def test_content_is_not_duplicated_as_text(self) -> None:
+        """Test that the payload travels once, as structured content."""
+        result = self.read_file("hello", accept_encoding=None)
+
+        assert "hello" not in result.content[0].text
+        assert tool_data(result)["content"] == "hello"
+
+    def test_large_content_is_compressed_on_request(self) -> None:
+        """Test that large content is gzipped in transit and decoded by the API."""
+        content = "lecture notes " * 10_000
+
+        result = self.read_file(content, accept_encoding="gzip")
+
+        assert result.structured_content["encoding"] == GZIP_BASE64
+        assert len(result.structured_content["content"]) < len(content) / 10
+        assert tool_data(result)["content"] == content
+
+    def test_small_content_is_sent_as_is(self) -> None:
+        """Test that compression is skipped below the size threshold."""
+        result = self.read_file("short", accept_encoding="gzip")
+
+        assert result.structured_content["encoding"] == "identity"
+
+    def test_json_text_fallback(self) -> None:
+        """Test decoding results from servers without structured output."""
+        payload = {"content": compress_text("old"), "encoding": GZIP_BASE64}
+        result = SimpleNamespace(
+            content=[SimpleNamespace(text=json.dumps(payload))],
+            structured_content=None,
+        )
+
+        assert tool_data(result)["content"] == "old"
+
+
+if __name__ == "__main__":
+    unittest.main()
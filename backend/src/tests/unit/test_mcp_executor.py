@@ -0,0 +1,99 @@
+"""Unit tests for the MCP tool executor."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from app.mcp.server.executor import ToolExecutor, tool_calls, tool_queued
+
+
+class TestToolExecutor(unittest.TestCase):
+    """Tests for running blocking tools off the event loop."""
+
+    def setUp(self) -> None:
+        """Set up an executor with a small per-user cap."""
+        self.executor = ToolExecutor(max_workers=8, per_user_limit=2)
+
+    def tearDown(self) -> None:
+        """Shut the worker pool down."""
+        self.executor.shutdown()
+
+    def test_run_returns_result_off_loop(self) -> None:
+        """Test that the tool body runs on a worker thread."""
+        main_thread = threading.get_ident()
+
+        async def scenario() -> int:
+            return await self.executor.run("test_tool", 1, threading.get_ident)
+
+        worker_thread = asyncio.run(scenario())
+
+        assert worker_thread != main_thread
+        assert tool_calls.value(tool="test_tool", outcome="ok") >= 1
+
+    def test_per_user_concurrency_cap(self) -> None:
+        """Test that one user never has more calls running than the cap."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def body() -> None:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        async def scenario() -> None:
+            await asyncio.gather(
+                *(self.executor.run("capped_tool", 7, body) for _ in range(6)),
+            )
+
+        asyncio.run(scenario())
+
+        assert peak == 2
+        assert self.executor.user_in_flight(7) == 0
+        assert tool_queued.value() == 0
+
+    def test_slow_user_does_not_block_others(self) -> None:
+        """Test that a different user is served while one user is saturated."""
+        release = threading.Event()
+
+        async def scenario() -> float:
+            blocked = [
+                asyncio.create_task(self.executor.run("slow", 1, release.wait, 5))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            start = time.perf_counter()
+            await self.executor.run("fast", 2, lambda: None)
+            elapsed = time.perf_counter() - start
+            release.set()
+            await asyncio.gather(*blocked)
+            return elapsed
+
+        assert asyncio.run(scenario()) < 1
+
+    def test_errors_are_propagated(self) -> None:
+        """Test that exceptions from the tool body reach the caller."""
+
+        def body() -> None:
+            msg = "boom"
+            raise ValueError(msg)
+
+        async def scenario() -> list:
+            return await asyncio.gather(
+                self.executor.run("failing_tool", 3, body),
+                return_exceptions=True,
+            )
+
+        (result,) = asyncio.run(scenario())
+
+        assert isinstance(result, ValueError)
+        assert tool_calls.value(tool="failing_tool", outcome="error") == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
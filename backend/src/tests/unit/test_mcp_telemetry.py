@@ -0,0 +1,149 @@
+"""Unit tests for MCP tool call telemetry."""
+
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from app.core.metrics import Counter
+from app.mcp.server.executor import ToolExecutor
+from app.mcp.server.quota import DriveQuota, drive_errors
+from app.mcp.server.telemetry import (
+    OTHER_USERS,
+    TraceLog,
+    _UserLabels,
+    drive_bytes,
+    record_download,
+    stage,
+    tool_errors,
+    tool_stages,
+    user_tool_calls,
+)
+
+
+class TestToolTelemetry(unittest.TestCase):
+    """Tests for traces recorded while tools run."""
+
+    def setUp(self) -> None:
+        """Log traces to a temporary JSON Lines file."""
+        self.executor = ToolExecutor(max_workers=2, per_user_limit=2)
+        self.quota = DriveQuota(
+            project_qps=1000,
+            user_qps=1000,
+            max_retries=2,
+            backoff_base=0,
+            backoff_max=0,
+            sleep=lambda _: None,
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp.name) / "traces.jsonl"
+        self.log_patcher = patch(
+            "app.mcp.server.telemetry.trace_log",
+            TraceLog(str(self.log_path)),
+        )
+        self.log_patcher.start()
+
+    def tearDown(self) -> None:
+        """Shut the pool down and drop the trace log."""
+        self.log_patcher.stop()
+        self.executor.shutdown()
+        self.tmp.cleanup()
+
+    def run_tool(self, tool: str, user_id: int, body: object) -> object:
+        """Run ``body`` as a tool call."""
+        return asyncio.run(self.executor.run(tool, user_id, body))
+
+    def traces(self) -> list[dict]:
+        """Read the logged traces."""
+        return [json.loads(line) for line in self.log_path.read_text().splitlines()]
+
+    def test_trace_breaks_down_drive_calls_and_stages(self) -> None:
+        """Test that a tool call's Drive requests, bytes and stages are logged."""
+
+        def body() -> str:
+            self.quota.execute(1, "files.get", lambda: {"id": "doc-1"})
+            exported = self.quota.execute(1, "files.export", lambda: b"x" * 100)
+            with stage("decode"):
+                return exported.decode()
+
+        self.run_tool("traced_tool", 41, body)
+
+        (trace,) = self.traces()
+        assert trace["tool"] == "traced_tool"
+        assert trace["user_id"] == 41
+        assert trace["outcome"] == "ok"
+        assert trace["drive_calls"] == {"files.get": 1, "files.export": 1}
+        assert trace["bytes_downloaded"] == 100
+        assert "decode" in trace["stages"]
+        assert tool_stages.count(tool="traced_tool", stage="decode") == 1
+        assert drive_bytes.value(method="files.export") >= 100
+        assert user_tool_calls.value(user="41") == 1
+
+    def test_error_results_are_classified(self) -> None:
+        """Test that a Drive failure surfaces as the tool's error class."""
+
+        def body() -> dict:
+            try:
+                self.quota.execute(2, "files.get", self.fail_with_404)
+            except Exception as e:  # noqa: BLE001
+                return {"error": str(e)}
+            return {}
+
+        self.run_tool("failing_tool", 2, body)
+
+        (trace,) = self.traces()
+        assert trace["outcome"] == "tool_error"
+        assert trace["error_class"] == "http_404"
+        assert trace["drive_errors"] == {"http_404": 1}
+        assert tool_errors.value(tool="failing_tool", error_class="http_404") == 1
+        assert drive_errors.value(method="files.get", error_class="http_404") >= 1
+
+    @staticmethod
+    def fail_with_404() -> None:
+        """Drive request that is not found."""
+        raise HttpError(httplib2.Response({"status": 404}), b"")
+
+    def test_downloads_outside_tools_are_still_counted(self) -> None:
+        """Test that bytes are counted even without a current trace."""
+        before = drive_bytes.value(method="files.get_media")
+
+        record_download("files.get_media", 10)
+
+        assert drive_bytes.value(method="files.get_media") == before + 10
+
+
+class TestUserLabels(unittest.TestCase):
+    """Tests for bounding per-user metric labels."""
+
+    def test_users_past_the_limit_share_a_label(self) -> None:
+        """Test that only the first users seen get their own label."""
+        labels = _UserLabels(max_users=2)
+
+        assert [labels(1), labels(2), labels(3), labels(1)] == [
+            "1",
+            "2",
+            OTHER_USERS,
+            "1",
+        ]
+
+
+class TestLabelEscaping(unittest.TestCase):
+    """Tests for rendering arbitrary label values."""
+
+    def test_special_characters_are_escaped(self) -> None:
+        """Test that quotes, backslashes and newlines keep the exposition valid."""
+        counter = Counter("test_escaping_total", "Escaping test")
+        counter.inc(tool='say "hi"\\\n')
+
+        assert counter.render().splitlines()[-1] == (
+            'test_escaping_total{tool="say \\"hi\\"\\\\\\n"} 1'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
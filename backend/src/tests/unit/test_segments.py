@@ -0,0 +1,89 @@
+"""Unit tests for the memory-mapped segment store."""
+
+import tempfile
+import unittest
+
+from app.core.chunking import content_hash
+from app.core.segments import SegmentStore
+
+
+class TestSegmentStore(unittest.TestCase):
+    """Tests for appending, reading and compacting segments."""
+
+    def setUp(self) -> None:
+        """Open a store in a fresh directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SegmentStore(self.tmp.name)
+
+    def tearDown(self) -> None:
+        """Remove the store's files."""
+        self.tmp.cleanup()
+
+    def put(self, *texts: str, store: SegmentStore | None = None) -> list[str]:
+        """Store ``texts`` and return their keys."""
+        keys = [content_hash(text) for text in texts]
+        (store or self.store).put_many(dict(zip(keys, texts, strict=True)))
+        return keys
+
+    def test_texts_round_trip(self) -> None:
+        """Test reading stored text back by key, including non-ASCII text."""
+        first, second = self.put("merge sort", "Dijkstra → shortest paths")
+
+        assert self.store.get(first) == "merge sort"
+        assert self.store.get(second) == "Dijkstra → shortest paths"
+        assert self.store.get(content_hash("never stored")) is None
+
+    def test_same_text_is_stored_once(self) -> None:
+        """Test that appending a known key does not grow the store."""
+        (key,) = self.put("binary search")
+        self.put("binary search")
+
+        assert self.store.usage({key}) == (13, 13)
+
+    def test_other_instances_see_appends(self) -> None:
+        """Test that a second reader (as in another worker) shares the files."""
+        reader = SegmentStore(self.tmp.name)
+        (key,) = self.put("heaps")
+        (later,) = self.put("tries", store=reader)
+
+        assert reader.get(key) == "heaps"
+        assert self.store.get(later) == "tries"
+        assert isinstance(reader.view(key), memoryview)
+
+    def test_compaction_drops_unreferenced_text(self) -> None:
+        """Test that compaction keeps live text and reclaims the rest."""
+        live, dead = self.put("live chunk", "old revision")
+        reader = SegmentStore(self.tmp.name)
+        assert reader.get(live) == "live chunk"
+
+        result = self.store.compact({live}, grace_seconds=0)
+
+        assert result == {"kept": 1, "dropped": 1, "reclaimed": 12}
+        assert self.store.get(live) == "live chunk"
+        assert self.store.get(dead) is None
+        # A reader mapped to the old generation switches on its next miss
+        (new,) = self.put("after compaction")
+        assert reader.get(new) == "after compaction"
+        assert reader.get(live) == "live chunk"
+
+    def test_reader_of_removed_generation_recovers(self) -> None:
+        """Test a reader whose index names a data file compaction deleted."""
+        (key,) = self.put("stack")
+        reader = SegmentStore(self.tmp.name)
+        reader.usage(set())  # index read, data file not mapped yet
+
+        self.store.compact({key}, grace_seconds=0)
+
+        assert reader.get(key) == "stack"
+
+    def test_recent_text_survives_compaction(self) -> None:
+        """Test that text within the grace period is kept though unreferenced."""
+        (pending,) = self.put("not committed yet")
+
+        self.store.compact(set(), grace_seconds=3600)
+
+        assert self.store.get(pending) == "not committed yet"
+
+
+if __name__ == "__main__":
+    unittest.main()
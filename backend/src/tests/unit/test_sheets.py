@@ -0,0 +1,77 @@
+"""Unit tests for spreadsheet digests."""
+
+import unittest
+
+from app.mcp.server.sheets import SheetTable, render_digest
+
+GRADEBOOK = "\n".join(
+    [
+        "Student,Score,Passed,Section",
+        *(
+            f"Student {i},{50 + i % 50},{'yes' if i % 50 >= 10 else 'no'},"
+            f"{'A' if i % 3 else 'B'}"
+            for i in range(200)
+        ),
+    ],
+)
+
+
+class TestSheetTable(unittest.TestCase):
+    """Tests for parsing and summarizing CSV exports."""
+
+    def setUp(self) -> None:
+        """Parse a 200-row gradebook."""
+        self.table = SheetTable(GRADEBOOK)
+
+    def test_column_types_and_statistics(self) -> None:
+        """Test per-column types, counts and numeric statistics."""
+        digest = self.table.digest(sample_rows=10)
+        columns = {c.name: c for c in digest.columns}
+
+        assert digest.rows == 200
+        assert columns["Score"].type == "number"
+        assert columns["Score"].min == 50
+        assert columns["Score"].max == 99
+        assert columns["Score"].mean == 74.5
+        assert columns["Passed"].type == "boolean"
+        assert columns["Section"].top_values == [("A", 133), ("B", 67)]
+        assert columns["Student"].unique == 200
+
+    def test_sampled_rows_span_the_sheet(self) -> None:
+        """Test that samples include the first rows and reach the end."""
+        digest = self.table.digest(sample_rows=10)
+
+        assert digest.sample_row_numbers[:5] == [1, 2, 3, 4, 5]
+        assert digest.sample_row_numbers[-1] == 200
+        assert len(digest.sample_rows) == len(digest.sample_row_numbers)
+
+    def test_render_is_much_smaller_than_csv(self) -> None:
+        """Test that the prompt digest is a fraction of the CSV."""
+        text = render_digest(self.table.digest(sample_rows=10), self.table.header)
+
+        assert "Score (number): 200 values, 0 missing, min 50, max 99" in text
+        assert len(text) < len(GRADEBOOK) / 4
+
+    def test_ragged_rows_and_formatted_numbers(self) -> None:
+        """Test padding of short rows and 1,234 / 85% style numbers."""
+        table = SheetTable('Amount,Rate,Note\n"1,200",85%\n300,90%,late\n')
+        digest = table.digest(sample_rows=4)
+        columns = {c.name: c for c in digest.columns}
+
+        assert table.rows(0, 10) == [["1,200", "85%", ""], ["300", "90%", "late"]]
+        assert columns["Amount"].max == 1200
+        assert columns["Rate"].mean == 87.5
+        assert columns["Note"].missing == 1
+
+    def test_long_cell_does_not_widen_the_grid(self) -> None:
+        """Test that one long cell costs its own size, not every cell's."""
+        rows = [f"{i},short" for i in range(2000)]
+        table = SheetTable("\n".join(["Id,Note", *rows, "2000," + "x" * 5000]))
+
+        assert table.rows(2000, 1) == [["2000", "x" * 5000]]
+        assert table.nbytes < 1024 * 1024
+        assert table.digest(sample_rows=4).columns[0].type == "number"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Unit tests for slide chunking and slide selection."""
+
+import unittest
+
+from app.core.retrieval import render_slide, select_slides
+from app.mcp.server.slides import extract_slides
+from app.schemas.mcp import SlideChunk
+
+
+def shape(text: str, placeholder: str | None = None) -> dict:
+    """Build a Slides API shape element holding ``text``."""
+    element = {"shape": {"text": {"textElements": [{"textRun": {"content": text}}]}}}
+    if placeholder:
+        element["shape"]["placeholder"] = {"type": placeholder}
+    return element
+
+
+def slide(object_id: str, *elements: dict, notes: str = "") -> dict:
+    """Build a Slides API slide with optional speaker notes."""
+    return {
+        "objectId": object_id,
+        "pageElements": list(elements),
+        "slideProperties": {
+            "notesPage": {
+                "notesProperties": {"speakerNotesObjectId": f"{object_id}-notes"},
+                "pageElements": [
+                    {"objectId": f"{object_id}-notes", **shape(notes)},
+                ],
+            },
+        },
+    }
+
+
+PRESENTATION = {
+    "slides": [
+        slide("s1", shape("Graphs\n", "CENTERED_TITLE"), shape("CS 310\n")),
+        slide(
+            "s2",
+            shape("Breadth-first search", "TITLE"),
+            {
+                "elementGroup": {
+                    "children": [shape("Uses a queue"), shape("Visits by layer")],
+                },
+            },
+            notes="Mention shortest paths in unweighted graphs",
+        ),
+        slide(
+            "s3",
+            shape("Complexity", "TITLE"),
+            {
+                "table": {
+                    "tableRows": [
+                        {
+                            "tableCells": [
+                                {"text": shape("BFS")["shape"]["text"]},
+                                {"text": shape("O(V + E)")["shape"]["text"]},
+                            ],
+                        },
+                    ],
+                },
+            },
+        ),
+    ],
+}
+
+
+class TestExtractSlides(unittest.TestCase):
+    """Tests for splitting a presentation into slide chunks."""
+
+    def test_titles_text_tables_and_notes(self) -> None:
+        """Test that every kind of slide content lands in its chunk."""
+        slides = extract_slides(PRESENTATION)
+
+        assert [s.id for s in slides] == ["s1", "s2", "s3"]
+        assert slides[0].title == "Graphs"
+        assert slides[0].text == "CS 310"
+        assert slides[1].text == "Uses a queue\nVisits by layer"
+        assert slides[1].notes == "Mention shortest paths in unweighted graphs"
+        assert slides[2].text == "BFS | O(V + E)"
+
+    def test_render_slide(self) -> None:
+        """Test the prompt text for a single slide."""
+        rendered = render_slide(extract_slides(PRESENTATION)[1])
+
+        assert rendered.startswith("Slide 2: Breadth-first search\nUses a queue")
+        assert rendered.endswith(
+            "Speaker notes: Mention shortest paths in unweighted graphs",
+        )
+
+
+class TestSelectSlides(unittest.TestCase):
+    """Tests for choosing the slides relevant to a chat message."""
+
+    def setUp(self) -> None:
+        """Build a small deck."""
+        self.slides = extract_slides(PRESENTATION)
+
+    def test_relevant_slides_in_deck_order(self) -> None:
+        """Test that matching slides are kept and returned in order."""
+        selected = select_slides(self.slides, "What is the complexity of BFS?", 5)
+
+        assert [s.id for s in selected] == ["s3"]
+
+    def test_notes_and_titles_count(self) -> None:
+        """Test that speaker notes match and title matches rank higher."""
+        selected = select_slides(
+            self.slides,
+            "why does breadth-first search find shortest paths in graphs",
+            1,
+        )
+
+        assert [s.id for s in selected] == ["s2"]
+
+    def test_no_match_falls_back_to_opening_slides(self) -> None:
+        """Test that an unrelated question still gets the deck's opening."""
+        selected = select_slides(self.slides, "hello there", 2)
+
+        assert [s.id for s in selected] == ["s1", "s2"]
+
+    def test_empty_deck(self) -> None:
+        """Test that an empty deck selects nothing."""
+        assert select_slides(list[SlideChunk](), "graphs", 3) == []
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
 """Unit tests for user repository operations."""
 
 import unittest
+from datetime import UTC, datetime
+from unittest.mock import patch
 
-from app.core.auth import get_password_hash, verify_password
+from sqlalchemy import event
+
+from app.core.auth import get_password_hash, verify_password, verify_token
 from app.repository.user import UserRepository
 from app.schemas.user import UserCreate
+from app.services.auth_token import AuthTokenService
+from app.services.user import UserService, principal_cache, token_versions
 from tests.base import BaseTestCase
 
 
@@ -111,5 +117,115 @@ class TestPasswordHandling(BaseTestCase):
         hashed_password = get_password_hash(self.test_user_data["password"])
         assert not verify_password("wrongpassword", hashed_password)
 
+
+class TestPrincipalCache(BaseTestCase):
+    """Tests for the cache of authenticated users."""
+
+    def setUp(self) -> None:
+        """Create a user and count the statements sent to the database."""
+        super().setUp()
+        self.user = self.create_registered_user()
+        self.email = self.test_user_data["email"]
+        self.queries: list[str] = []
+
+        def count(*args: object) -> None:
+            self.queries.append(str(args[2]))
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", count)
+
+    def test_repeated_lookup_skips_the_database(self) -> None:
+        """Test that a cached principal is attached without a query."""
+        first = UserService.get_principal(self.db_session, self.email)
+        self.db_session.expunge_all()
+        queries = len(self.queries)
+        hit_ratio = principal_cache.hit_ratio()
+
+        second = UserService.get_principal(self.db_session, self.email)
+
+        assert first is not None
+        assert second is not None
+        assert len(self.queries) == queries
+        assert second.id == self.user.id
+        assert second.first_name == "Test"
+        assert second in self.db_session
+        assert principal_cache.hit_ratio() > hit_ratio
+
+    def test_unknown_subject_is_not_cached(self) -> None:
+        """Test that a missing user is looked up every time."""
+        assert UserService.get_principal(self.db_session, "nobody@example.com") is None
+        assert UserService.get_principal(self.db_session, "nobody@example.com") is None
+        assert len(self.queries) == 2
+
+    def test_name_update_invalidates(self) -> None:
+        """Test that renaming a user drops the cached principal."""
+        UserService.get_principal(self.db_session, self.email)
+        UserService.update_user_name(self.db_session, self.user.id, "New", "Name")  # pyright: ignore[reportArgumentType]
+        self.db_session.expunge_all()
+
+        user = UserService.get_principal(self.db_session, self.email)
+
+        assert user is not None
+        assert user.first_name == "New"
+
+    def test_delete_invalidates(self) -> None:
+        """Test that a deleted user no longer authenticates."""
+        UserService.get_principal(self.db_session, self.email)
+        UserService.delete_user(self.db_session, self.user.id)  # pyright: ignore[reportArgumentType]
+
+        assert UserService.get_principal(self.db_session, self.email) is None
+
+    def test_token_change_invalidates(self) -> None:
+        """Test that storing new OAuth tokens drops the cached principal."""
+        UserService.get_principal(self.db_session, self.email)
+        AuthTokenService.create_auth_token(
+            self.db_session,
+            self.user.id,  # pyright: ignore[reportArgumentType]
+            {
+                "access_token": "access",
+                "refresh_token": "refresh",
+                "expiry": datetime.now(UTC).isoformat(),
+            },
+        )
+
+        assert principal_cache.get(self.email) is None
+
+
+class TestTokenVersion(BaseTestCase):
+    """Tests for access token claims and revocation."""
+
+    def setUp(self) -> None:
+        """Create a user."""
+        super().setUp()
+        self.user = self.create_registered_user()
+        self.user_id: int = self.user.id  # pyright: ignore[reportAttributeAccessIssue]
+
+    def test_token_carries_id_and_version(self) -> None:
+        """Test that issued tokens name the user by ID and version."""
+        claims = verify_token(UserService.create_token(self.user))
+
+        assert claims is not None
+        assert claims["sub"] == self.test_user_data["email"]
+        assert (claims["uid"], claims["ver"]) == (self.user_id, 0)
+
+    def test_version_is_cached(self) -> None:
+        """Test that repeated version checks read the cache."""
+        UserService.get_token_version(self.db_session, self.user_id)
+        with patch.object(UserRepository, "get_token_version") as lookup:
+            version = UserService.get_token_version(self.db_session, self.user_id)
+
+        assert version == 0
+        lookup.assert_not_called()
+
+    def test_revoke_bumps_version(self) -> None:
+        """Test that revoking moves the version on and drops the cached one."""
+        UserService.get_token_version(self.db_session, self.user_id)
+        UserService.revoke_tokens(self.db_session, self.user_id)
+
+        assert token_versions.get(self.user_id) is None
+        assert UserService.get_token_version(self.db_session, self.user_id) == 1
+        assert UserService.get_token_version(self.db_session, 9999) is None
+
+
 if __name__ == "__main__":
     unittest.main()